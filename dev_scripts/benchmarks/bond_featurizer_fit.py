@@ -0,0 +1,89 @@
+"""
+Benchmark fitting BagofBonds and BondFractions to many structures against
+the previous implementations of fit.
+
+Builds a set of random supercells of binary and ternary compounds and fits
+both featurizers from a generator, so the structures are read only once.
+The previous BagofBonds.fit counted the bag lengths of each structure by
+looping over all pairs of sites, and the previous BondFractions.fit built
+the list of bond types with linear membership tests.
+
+Usage:
+    python bond_featurizer_fit.py [n_structures]
+"""
+
+import itertools
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+from pymatgen.core.periodic_table import Specie
+
+from matminer.featurizers.structure.bonding import BagofBonds, BondFractions
+
+
+def loop_fit_bob(bob, structures):
+    unpadded_bobs = []
+    for s in structures:
+        bags = {}
+        for i, si in enumerate(s):
+            for j, sj in enumerate(s):
+                el0, el1 = si.specie, sj.specie
+                el0 = el0.element if isinstance(el0, Specie) else el0
+                el1 = el1.element if isinstance(el1, Specie) else el1
+                bond = (el0,) if i == j else tuple(sorted((el0, el1)))
+                bags[bond] = bags.get(bond, 0) + 1
+        unpadded_bobs.append(bags)
+    bonds = sorted(set(sum([list(bob.keys()) for bob in unpadded_bobs], [])))
+    bag_lens = {bond: max(b.get(bond, 0) for b in unpadded_bobs) for bond in bonds}
+    return sorted(bag_lens, key=lambda bond: bag_lens[bond])
+
+
+def loop_fit_bf(bf, structures):
+    bond_types = []
+    for s in structures:
+        els = s.composition.elements
+        het_bonds = [tuple(sorted([str(i) for i in j])) for j in itertools.combinations(els, 2)]
+        hom_bonds = [(str(el), str(el)) for el in els]
+        for bt in [k[0] + bf.token + k[1] for k in het_bonds + hom_bonds]:
+            if bt not in bond_types:
+                bond_types.append(bt)
+    return bf._sanitize_bonds(tuple(sorted(bond_types)))
+
+
+def make_structures(n_structures, rng):
+    elements = ["Li", "Na", "K", "Mg", "Ca", "Sr", "Ti", "Fe", "Ni", "Cu", "Zn", "Al", "O", "S", "F", "Cl"]
+    for _ in range(n_structures):
+        species = list(rng.choice(elements, size=rng.integers(2, 4), replace=False))
+        species = [species[i] for i in rng.integers(0, len(species), size=8)]
+        s = Structure(Lattice.cubic(4.0), species, rng.random((8, 3)))
+        s.make_supercell(rng.integers(1, 3, size=3))
+        yield s
+
+
+if __name__ == "__main__":
+    n_structures = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    warnings.simplefilter("ignore")
+
+    structures = list(make_structures(n_structures, np.random.default_rng(0)))
+    print("{} structures with {} sites on average".format(len(structures), np.mean([len(s) for s in structures])))
+
+    bob = BagofBonds()
+    bf = BondFractions()
+    for name, old, new in [
+        ("BagofBonds", lambda: loop_fit_bob(bob, structures), lambda: bob.fit(iter(structures)).ordered_bonds),
+        ("BondFractions", lambda: loop_fit_bf(bf, structures), lambda: bf.fit(iter(structures)).fitted_bonds_),
+    ]:
+        start = time.perf_counter()
+        old_result = old()
+        old_time = time.perf_counter() - start
+        start = time.perf_counter()
+        new_result = new()
+        new_time = time.perf_counter() - start
+        print(
+            "{:14s} previous fit: {:7.3f} s  new fit: {:7.3f} s  speedup: {:6.1f}x  same result: {}".format(
+                name, old_time, new_time, old_time / new_time, list(old_result) == list(new_result)
+            )
+        )
@@ -0,0 +1,68 @@
+"""
+Benchmark ChemEnvSiteFingerprint on all sites of a structure against the
+previous implementation, which set up the local geometry finder and computed
+the structure environments separately for every site.
+
+Featurizes a supercell of rutile with SiteStatsFingerprint, computing the
+structure environments of all sites at once, and of only the symmetrically
+inequivalent sites.
+
+Usage:
+    python chemenv_site_fingerprint.py [supercell_size]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+
+from matminer.featurizers.site import ChemEnvSiteFingerprint
+from matminer.featurizers.structure import SiteStatsFingerprint
+from matminer.utils.caching import get_nn_cache
+
+
+def per_site(cefp, s, idx):
+    cevals = []
+    cefp.lgf.setup_structure(structure=s)
+    se = cefp.lgf.compute_structure_environments(only_indices=[idx], maximum_distance_factor=cefp.max_dist_fac)
+    for ce in cefp.cetypes:
+        try:
+            tmp = se.get_csms(idx, ce)
+            tmp = tmp[0]["symmetry_measure"] if len(tmp) != 0 else cefp.max_csm
+            tmp = tmp if tmp < cefp.max_csm else cefp.max_csm
+            cevals.append(1 - tmp / cefp.max_csm)
+        except IndexError:
+            cevals.append(0)
+    return cevals
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    warnings.simplefilter("ignore")
+
+    s = Structure.from_spacegroup(
+        "P4_2/mnm", Lattice.tetragonal(4.594, 2.959), ["Ti", "O"], [[0, 0, 0], [0.305] * 2 + [0]]
+    )
+    s.make_supercell([size, size, size])
+    print("{} sites".format(len(s)))
+
+    cefp = ChemEnvSiteFingerprint.from_preset("simple")
+    start = time.perf_counter()
+    old = np.array([per_site(cefp, s, i) for i in range(len(s))])
+    old_time = time.perf_counter() - start
+
+    for use_symmetry in [False, True]:
+        get_nn_cache().cache_clear()
+        cefp.use_symmetry = use_symmetry
+        ssf = SiteStatsFingerprint(cefp, stats=None)
+        start = time.perf_counter()
+        new = np.array(ssf.featurize(s)).T
+        new_time = time.perf_counter() - start
+        print(
+            "use_symmetry={!s:5s} per site: {:7.3f} s  all sites: {:7.3f} s  speedup: {:6.1f}x  "
+            "max abs difference: {:.1e}".format(
+                use_symmetry, old_time, new_time, old_time / new_time, np.abs(old - new).max()
+            )
+        )
@@ -0,0 +1,71 @@
+"""
+Benchmark ChemicalSRO against the previous implementation, which identified
+structures by `str(structure)` in fit and for every site in featurize.
+
+Fits to and featurizes every site of a supercell of a ternary perovskite,
+one site at a time and all sites at once. The neighbor lists are computed
+before timing, so only the structure lookups and CSRO arithmetic differ.
+
+Usage:
+    python chemical_sro.py [supercell_size]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+
+from matminer.featurizers.site import ChemicalSRO
+from matminer.utils.caching import get_nearest_neighbors
+
+
+def str_key_featurize(csro, el_amt_dict, struct, idx):
+    features = [0.0] * len(csro.el_list_)
+    if str(struct) in el_amt_dict.keys():
+        el_amt = el_amt_dict[str(struct)]
+        nn_el_amt = dict.fromkeys(el_amt, 0)
+        nn_list = [n["site"] for n in get_nearest_neighbors(csro.nn, struct, idx)]
+        for nn in nn_list:
+            if str(nn.specie.symbol) in csro.el_list_:
+                nn_el_amt[str(nn.specie.symbol)] += 1 / len(nn_list)
+        for el in el_amt.keys():
+            if el in csro.el_list_:
+                features[csro.el_list_.index(el)] = nn_el_amt[el] - el_amt[el]
+    return features
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    warnings.simplefilter("ignore")
+
+    s = Structure(
+        Lattice.cubic(3.9),
+        ["Sr", "Ti", "O", "O", "O"],
+        [[0, 0, 0], [0.5, 0.5, 0.5], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]],
+    )
+    s.make_supercell([size] * 3)
+    rows = [[s, i] for i in range(len(s))]
+    print("{} sites".format(len(s)))
+
+    csro = ChemicalSRO.from_preset("MinimumDistanceNN")
+    csro.fit(rows)
+    el_amt_dict = {str(s): s.composition.fractional_composition.get_el_amt_dict()}
+    str_key_featurize(csro, el_amt_dict, s, 0)
+
+    start = time.perf_counter()
+    old = np.array([str_key_featurize(csro, el_amt_dict, s, i) for i in range(len(s))])
+    old_time = time.perf_counter() - start
+    for name, new in [
+        ("featurize", lambda: [csro.featurize(s, i) for i in range(len(s))]),
+        ("featurize_all_sites", lambda: csro.featurize_all_sites(s)),
+    ]:
+        start = time.perf_counter()
+        result = np.array(new())
+        new_time = time.perf_counter() - start
+        print(
+            "{:20s} str keys: {:7.3f} s  structure keys: {:7.4f} s  speedup: {:6.1f}x  max abs difference: {:.1e}".format(
+                name, old_time, new_time, old_time / new_time, np.abs(old - result).max()
+            )
+        )
@@ -0,0 +1,56 @@
+"""
+Benchmark the dense featurize_many of composition featurizers against
+featurizing one composition at a time.
+
+The per-entry versions of Meredig and BandCenter re-load their element data
+for every composition and are very slow, so keep the number of compositions
+small.
+
+Usage:
+    python composition_featurize_many.py [n_compositions]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core.composition import Composition
+
+from matminer.featurizers.base import BaseFeaturizer
+from matminer.featurizers.composition import BandCenter, ElementFraction, ElementProperty, Meredig, Stoichiometry
+
+if __name__ == "__main__":
+    n_comps = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    warnings.simplefilter("ignore")
+
+    rng = np.random.default_rng(0)
+    elements = ["H", "Li", "B", "C", "N", "O", "F", "Na", "Mg", "Al", "Si", "P", "S", "Cl", "K", "Ca", "Ti", "Fe"]
+    comps = []
+    for _ in range(n_comps):
+        n_el = rng.integers(1, 6)
+        els = rng.choice(elements, n_el, replace=False)
+        comps.append(Composition({e: int(a) for e, a in zip(els, rng.integers(1, 5, n_el))}))
+
+    featurizers = [
+        ElementProperty.from_preset("magpie"),
+        Meredig(),
+        Stoichiometry(),
+        ElementFraction(),
+        BandCenter(),
+    ]
+    for f in featurizers:
+        start = time.perf_counter()
+        slow = BaseFeaturizer.featurize_many(f, comps, pbar=False)
+        t_slow = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast = f.featurize_many(comps, pbar=False)
+        t_fast = time.perf_counter() - start
+
+        error = np.nanmax(np.abs(np.array(slow, dtype=float) - np.array(fast, dtype=float)))
+        print(
+            "{:16s} per-entry: {:7.3f} s  dense: {:7.3f} s  speedup: {:6.1f}x  max abs difference: {:.1e}".format(
+                f.__class__.__name__, t_slow, t_fast, t_slow / t_fast, error
+            )
+        )
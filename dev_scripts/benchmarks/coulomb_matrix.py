@@ -0,0 +1,109 @@
+"""
+Benchmark building Coulomb matrices, sine Coulomb matrices and bags of
+bonds for large cells against the previous pairwise Python loops.
+
+Builds a supercell of a ternary perovskite with about 200 atoms (randomly
+displaced so that no two distances are equal) and times CoulombMatrix,
+SineCoulombMatrix and BagofBonds.bag against reference implementations that
+fill the matrices one pair of sites at a time.
+
+Usage:
+    python coulomb_matrix.py [n_repeats]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+from pymatgen.core.periodic_table import Specie
+
+from matminer.featurizers.structure.bonding import BagofBonds
+from matminer.featurizers.structure.matrix import ANG_TO_BOHR, CoulombMatrix, SineCoulombMatrix
+
+
+def loop_coulomb_matrix(s):
+    z = [site.specie.Z for site in s]
+    m = np.zeros((len(s), len(s)))
+    for i in range(len(s)):
+        for j in range(len(s)):
+            if i == j:
+                m[i, j] = 0.5 * z[i] ** 2.4
+            else:
+                m[i, j] = z[i] * z[j] / (s.get_distance(i, j) * ANG_TO_BOHR)
+    return m
+
+
+def loop_sine_coulomb_matrix(s):
+    z = [site.specie.Z for site in s]
+    coords = s.frac_coords
+    m = np.zeros((len(s), len(s)))
+    for i in range(len(s)):
+        for j in range(len(s)):
+            if i == j:
+                m[i, i] = 0.5 * z[i] ** 2.4
+            elif i < j:
+                coord_vec = np.sin(np.pi * (coords[i] - coords[j])) ** 2
+                m[i, j] = z[i] * z[j] / (np.linalg.norm(coord_vec @ s.lattice.matrix) * ANG_TO_BOHR)
+            else:
+                m[i, j] = m[j, i]
+    return m
+
+
+def loop_bag(s, cm):
+    bags = {}
+    for i, si in enumerate(s):
+        for j, sj in enumerate(s):
+            el0, el1 = si.specie, sj.specie
+            el0 = el0.element if isinstance(el0, Specie) else el0
+            el1 = el1.element if isinstance(el1, Specie) else el1
+            bond = (el0,) if i == j else tuple(sorted((el0, el1)))
+            bags.setdefault(bond, []).append(cm[i, j])
+    return {bond: sorted(bags[bond]) for bond in bags}
+
+
+def timeit(func, n_repeats):
+    start = time.perf_counter()
+    for _ in range(n_repeats):
+        result = func()
+    return (time.perf_counter() - start) / n_repeats, result
+
+
+if __name__ == "__main__":
+    n_repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+
+    s = Structure(
+        Lattice.cubic(3.9),
+        ["Sr", "Ti", "O", "O", "O"],
+        [[0, 0, 0], [0.5, 0.5, 0.5], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]],
+    )
+    s.make_supercell([5, 4, 2])
+    for i in range(len(s)):
+        s.translate_sites([i], rng.normal(0, 0.02, 3), frac_coords=False)
+    print("{} sites".format(len(s)))
+
+    cm = CoulombMatrix(flatten=False)
+    scm = SineCoulombMatrix(flatten=False)
+    bob = BagofBonds(coulomb_matrix=scm)
+    sine_matrix = scm.featurize(s)[0]
+    for name, old, new, compare in [
+        ("CoulombMatrix", lambda: loop_coulomb_matrix(s), lambda: cm.featurize(s)[0], None),
+        ("SineCoulombMatrix", lambda: loop_sine_coulomb_matrix(s), lambda: scm.featurize(s)[0], None),
+        (
+            "BagofBonds.bag",
+            lambda: loop_bag(s, sine_matrix),
+            lambda: bob.bag(s),
+            lambda a, b: max(np.abs(np.subtract(a[k], b[k])).max() for k in a) if a.keys() == b.keys() else np.inf,
+        ),
+    ]:
+        old_time, old_result = timeit(old, n_repeats)
+        new_time, new_result = timeit(new, n_repeats)
+        diff = compare(old_result, new_result) if compare else np.abs(old_result - new_result).max()
+        print(
+            "{:18s} loop: {:7.3f} s  vectorized: {:7.4f} s  speedup: {:7.1f}x  max abs difference: {:.1e}".format(
+                name, old_time, new_time, old_time / new_time, diff
+            )
+        )
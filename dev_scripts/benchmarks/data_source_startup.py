@@ -0,0 +1,79 @@
+"""
+Benchmark the cost of creating featurizers that use elemental data sources,
+and of sending them to worker processes.
+
+Creates a set of composition featurizers several times, first with private
+data sources (each featurizer parses its own copy of the data files) and
+then with the shared data sources from `get_data_source`. Also reports the
+size of the pickled featurizers, which is what is sent to every worker of a
+multiprocessing pool when featurizing with n_jobs > 1.
+
+Usage:
+    python data_source_startup.py [n_repeats]
+"""
+
+import pickle
+import sys
+import time
+import warnings
+
+from matminer.featurizers.composition import (
+    CationProperty,
+    ElementProperty,
+    Meredig,
+    Miedema,
+    WenAlloys,
+    YangSolidSolution,
+)
+from matminer.utils.data import DemlData, MagpieData, get_data_source
+
+
+def make_shared():
+    return [
+        ElementProperty.from_preset("magpie"),
+        ElementProperty.from_preset("deml"),
+        CationProperty.from_preset("deml"),
+        Meredig(),
+        Miedema(),
+        YangSolidSolution(),
+        WenAlloys(),
+    ]
+
+
+def make_private():
+    featurizers = make_shared()
+    # Replace the shared data sources with copies owned by each featurizer
+    featurizers[0].data_source = MagpieData()
+    featurizers[1].data_source = DemlData()
+    featurizers[2].data_source = DemlData()
+    featurizers[3].data_source = MagpieData()
+    featurizers[5].elem_data = MagpieData()
+    featurizers[6].data_source_magpie = MagpieData()
+    return featurizers
+
+
+if __name__ == "__main__":
+    n_repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    warnings.simplefilter("ignore")
+
+    start = time.perf_counter()
+    get_data_source("magpie"), get_data_source("deml")
+    print("First load of the shared data sources: {:.3f} s".format(time.perf_counter() - start))
+
+    for name, make in [("private", make_private), ("shared", make_shared)]:
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            featurizers = make()
+        create_time = (time.perf_counter() - start) / n_repeats
+
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            pickled = pickle.dumps(featurizers)
+            pickle.loads(pickled)
+        pickle_time = (time.perf_counter() - start) / n_repeats
+
+        print(
+            "{:8s} create: {:7.3f} s  pickle round trip: {:7.3f} s  pickled size: {:9d} bytes".format(
+                name, create_time, pickle_time, len(pickled)
+            )
+        )
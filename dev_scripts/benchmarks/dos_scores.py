@@ -0,0 +1,77 @@
+"""
+Benchmark the band-edge orbital scores of the DOS featurizers against the
+previous implementation, which smeared the DOS of each orbital of each site
+separately and interpolated it at one sampled energy at a time.
+
+Builds the DOS of a supercell of Nb3Sn by copying the projected DOS of the
+test data to each image of each site, and computes the scores used by
+DOSFeaturizer and Hybridization.
+
+Usage:
+    python dos_scores.py [supercell_size]
+"""
+
+import json
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.electronic_structure.core import Spin
+from pymatgen.electronic_structure.dos import CompleteDos
+
+import matminer.featurizers.tests
+from matminer.featurizers.dos import get_cbm_vbm_scores
+
+
+def loop_scores(dos, decay_length, sampling_resolution, gaussian_smear):
+    cbm, vbm = dos.get_cbm_vbm(tol=0.01)
+    scores = []
+    for site in dos.structure.sites:
+        proj = dos.get_site_spd_dos(site)
+        for orb in proj:
+            energies = [e for e in proj[orb].energies]
+            smear_dos = proj[orb].get_smeared_densities(gaussian_smear)
+            dos_up = smear_dos[Spin.up]
+            dos_down = smear_dos[Spin.down] if Spin.down in smear_dos else smear_dos[Spin.up]
+            dos_total = [sum(id) for id in zip(dos_up, dos_down)]
+            vbm_score = 0
+            for e in np.linspace(vbm, vbm - (5.0 * decay_length), num=sampling_resolution):
+                vbm_score += np.interp(e, energies, dos_total) * np.exp(-(vbm - e) * decay_length)
+            cbm_score = 0
+            for e in np.linspace(cbm, cbm + (5.0 * decay_length), num=sampling_resolution):
+                cbm_score += np.interp(e, energies, dos_total) * np.exp(-(e - cbm) * decay_length)
+            scores.append((cbm_score, vbm_score))
+    scores = np.array(scores)
+    return scores / scores.sum(axis=0)
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    warnings.simplefilter("ignore")
+
+    test_dir = os.path.dirname(matminer.featurizers.tests.__file__)
+    with open(os.path.join(test_dir, "nb3sn_dos.json")) as fp:
+        dos = CompleteDos.from_dict(json.load(fp))
+
+    # Copy the projected DOS of each site to its images in the supercell
+    structure = dos.structure.copy()
+    structure.add_site_property("original_index", list(range(len(structure))))
+    structure.make_supercell([size] * 3)
+    pdos = {site: dos.pdos[dos.structure[site.properties["original_index"]]] for site in structure}
+    big_dos = CompleteDos(structure, dos, pdos)
+    print("{} sites, {} energies".format(len(structure), len(dos.energies)))
+
+    start = time.perf_counter()
+    old = loop_scores(big_dos, 0.1, 100, 0.05)
+    old_time = time.perf_counter() - start
+    start = time.perf_counter()
+    new = get_cbm_vbm_scores(big_dos, 0.1, 100, 0.05)
+    new_time = time.perf_counter() - start
+    new = np.array([(s["cbm_score"], s["vbm_score"]) for s in new])
+    print(
+        "get_cbm_vbm_scores loop: {:7.3f} s  vectorized: {:7.4f} s  speedup: {:6.1f}x  max abs difference: {:.1e}".format(
+            old_time, new_time, old_time / new_time, np.abs(old - new).max()
+        )
+    )
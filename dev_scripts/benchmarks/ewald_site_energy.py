@@ -0,0 +1,69 @@
+"""
+Benchmark EwaldSiteEnergy on all sites of a structure against the previous
+implementation, which reused the Ewald summation only if a site came from
+the very same structure object as the site before.
+
+Featurizes a dataframe of (structure, site index) rows of a supercell of
+rock salt in which each row holds its own copy of the structure, as after
+the rows are pickled to worker processes or loaded from a file, and then
+computes the total energy with EwaldEnergy.
+
+Usage:
+    python ewald_site_energy.py [supercell_size]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from pymatgen.analysis.ewald import EwaldSummation
+from pymatgen.core import Lattice, Structure
+
+from matminer.featurizers.site import EwaldSiteEnergy
+from matminer.featurizers.structure import EwaldEnergy
+from matminer.utils.caching import get_ewald_cache
+
+
+class LastStructureEwald:
+    def __init__(self, accuracy):
+        self.accuracy = accuracy
+        self.last_structure = None
+        self.last_ewald = None
+
+    def featurize(self, strc, idx):
+        if strc is not self.last_structure:
+            self.last_structure = strc
+            self.last_ewald = EwaldSummation(strc, acc_factor=self.accuracy)
+        return [self.last_ewald.get_site_energy(idx)]
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    warnings.simplefilter("ignore")
+
+    s = Structure.from_spacegroup("Fm-3m", Lattice.cubic(5.69), ["Na+", "Cl-"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+    s.make_supercell([size] * 3)
+    df = pd.DataFrame({"structure": [s.copy() for _ in range(len(s))], "site": range(len(s))})
+    print("{} sites".format(len(s)))
+
+    old_f = LastStructureEwald(4)
+    start = time.perf_counter()
+    old = np.array([old_f.featurize(strc, i) for strc, i in df.values])
+    old_total = EwaldSummation(s, acc_factor=4).total_energy
+    old_time = time.perf_counter() - start
+
+    get_ewald_cache().cache_clear()
+    f = EwaldSiteEnergy(accuracy=4)
+    f.set_n_jobs(1)
+    start = time.perf_counter()
+    new = f.featurize_dataframe(df, ["structure", "site"], pbar=False)[f.feature_labels()].values
+    new_total = EwaldEnergy(accuracy=4, per_atom=False).featurize(s)[0]
+    new_time = time.perf_counter() - start
+    print(
+        "site and total energies previous: {:7.3f} s  shared cache: {:7.3f} s  speedup: {:6.1f}x  "
+        "max abs difference: {:.1e}".format(
+            old_time, new_time, old_time / new_time, max(np.abs(old - new).max(), abs(old_total - new_total))
+        )
+    )
@@ -0,0 +1,45 @@
+"""
+Benchmark the per-call overhead of parallel featurization with and without a
+persistent FeaturizerPool.
+
+Featurizes many small batches of compositions with several featurizers, which
+is the case where starting a new process pool for every call dominates.
+
+Usage:
+    python featurizer_pool.py [n_jobs] [n_calls]
+"""
+
+import sys
+import time
+
+from pymatgen.core.composition import Composition
+
+from matminer.featurizers.base import FeaturizerPool
+from matminer.featurizers.composition import ElementProperty, Stoichiometry, ValenceOrbital
+
+
+def run(featurizers, batches):
+    start = time.perf_counter()
+    for batch in batches:
+        for f in featurizers:
+            f.featurize_many(batch, pbar=False)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    n_calls = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    featurizers = [ElementProperty.from_preset("magpie"), Stoichiometry(), ValenceOrbital()]
+    for f in featurizers:
+        f.set_n_jobs(n_jobs)
+    batches = [[Composition("Fe2O3"), Composition("NaCl"), Composition("SrTiO3"), Composition("Al")] * 8] * n_calls
+    n = len(featurizers) * n_calls
+
+    t_default = run(featurizers, batches)
+    print("New pool per call:  {:.4f} s/call".format(t_default / n))
+
+    with FeaturizerPool(n_jobs):
+        t_pool = run(featurizers, batches)
+    print("FeaturizerPool:     {:.4f} s/call (includes pool start-up)".format(t_pool / n))
+    print("Speedup: {:.1f}x".format(t_default / t_pool))
@@ -0,0 +1,70 @@
+"""
+Benchmark computing the Gaussian symmetry functions of every site of a
+structure at once against the previous implementation, which found the
+neighbors of each site separately and looped over the neighbors and the
+(eta, zeta, gamma) combinations of the angular functions.
+
+Uses a randomly displaced supercell of Ni3Al, as in a snapshot of a
+molecular dynamics simulation.
+
+Usage:
+    python gaussian_symm_func.py [n_cells]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+
+from matminer.featurizers.site.rdf import GaussianSymmFunc
+from matminer.utils.caching import get_nn_cache
+
+
+def per_site(gsf, s):
+    features = []
+    for site in s:
+        neighbors = s.get_neighbors(site, gsf.cutoff)
+        neigh_coords = np.array([n.coords for n in neighbors]) - site.coords
+        neigh_dists = np.array([n.nn_distance for n in neighbors])
+        row = [gsf.g2(eta, neigh_dists, gsf.cutoff) for eta in gsf.etas_g2]
+        row.extend(gsf.g4(gsf.etas_g4, gsf.zetas_g4, gsf.gammas_g4, neigh_dists, neigh_coords, gsf.cutoff))
+        features.append(row)
+    return np.array(features)
+
+
+if __name__ == "__main__":
+    n_cells = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    warnings.simplefilter("ignore")
+
+    s = Structure(
+        Lattice.cubic(3.57),
+        ["Al", "Ni", "Ni", "Ni"],
+        [[0, 0, 0], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]],
+    )
+    s.make_supercell([n_cells] * 3)
+    s.perturb(0.1)
+    print("{} sites".format(len(s)))
+
+    gsf = GaussianSymmFunc()
+    start = time.perf_counter()
+    old = per_site(gsf, s)
+    old_time = time.perf_counter() - start
+
+    for dtype in [np.float64, np.float32]:
+        get_nn_cache().cache_clear()
+        start = time.perf_counter()
+        new = gsf.featurize_all_sites(s, dtype=dtype)
+        new_time = time.perf_counter() - start
+        print(
+            "{:8s} per site: {:7.3f} s  all sites: {:7.3f} s  speedup: {:6.1f}x  output: {:7d} bytes  "
+            "max relative difference: {:.1e}".format(
+                np.dtype(dtype).name,
+                old_time,
+                new_time,
+                old_time / new_time,
+                new.nbytes,
+                np.max(np.abs(new - old) / np.maximum(np.abs(old), 1e-10)),
+            )
+        )
@@ -0,0 +1,82 @@
+"""
+Benchmark the generalized radial distribution function (GRDF) and angular
+Fourier series (AFS) site featurizers against the previous implementations,
+which evaluated each bin function separately and, for the AFS, built a list
+of all permutations of pairs of neighbors.
+
+Featurizes every site of a supercell of rock salt with Gaussian bins.
+
+Usage:
+    python grdf_afs.py [cutoff]
+"""
+
+import itertools
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+
+from matminer.featurizers.site.rdf import AngularFourierSeries, GeneralizedRadialDistributionFunction
+from matminer.utils.caching import get_nn_cache
+
+
+def loop_grdf(grdf, s, idx):
+    neighbors_lst = s.get_neighbors(s[idx], grdf.cutoff, include_index=True)
+    volumes = np.array([bin.volume(grdf.cutoff) for bin in grdf.bins])
+    if grdf.mode == "GRDF":
+        distance_collection = [[neighbor[1] for neighbor in neighbors_lst]]
+    else:
+        distance_collection = [
+            [neighbor[1] for neighbor in neighbors_lst if neighbor[2] == site_idx] for site_idx in range(len(s))
+        ]
+    features = []
+    for values in distance_collection:
+        features.extend(np.array([sum(bin(values)) for bin in grdf.bins]) / volumes)
+    return features
+
+
+def loop_afs(afs, s, idx):
+    neighbors_lst = s.get_neighbors(s[idx], afs.cutoff)
+    neighbor_collection = [(neighbor[0].coords - s[idx].coords, neighbor[1]) for neighbor in neighbors_lst]
+    features = np.zeros((len(afs.bins), len(afs.bins)))
+    for (v1, d1), (v2, d2) in itertools.permutations(neighbor_collection, 2):
+        cos = np.clip(np.dot(v1, v2) / np.linalg.norm(v1) / np.linalg.norm(v2), -1.0, 1.0)
+        g1 = np.array([bin(d1) for bin in afs.bins])
+        g2 = np.array([bin(d2) for bin in afs.bins])
+        features += np.outer(g1, g2) * cos
+    return features.ravel()
+
+
+def timeit(func):
+    get_nn_cache().cache_clear()
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, np.array(result, dtype=float)
+
+
+if __name__ == "__main__":
+    cutoff = float(sys.argv[1]) if len(sys.argv) > 1 else 6.0
+    warnings.simplefilter("ignore")
+
+    s = Structure.from_spacegroup("Fm-3m", Lattice.cubic(5.69), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+    s.make_supercell([2, 2, 2])
+    print("{} sites, cutoff {} A".format(len(s), cutoff))
+
+    grdf = GeneralizedRadialDistributionFunction.from_preset("gaussian", cutoff=cutoff)
+    pairwise = GeneralizedRadialDistributionFunction.from_preset("gaussian", cutoff=cutoff, mode="pairwise_GRDF")
+    afs = AngularFourierSeries.from_preset("gaussian", cutoff=cutoff)
+    sites = range(len(s))
+    for name, old, new in [
+        ("GRDF", lambda: [loop_grdf(grdf, s, i) for i in sites], lambda: grdf.featurize_all_sites(s)),
+        ("pairwise GRDF", lambda: [loop_grdf(pairwise, s, i) for i in sites], lambda: pairwise.featurize_all_sites(s)),
+        ("AFS", lambda: [loop_afs(afs, s, i) for i in sites[:4]], lambda: [afs.featurize(s, i) for i in sites[:4]]),
+    ]:
+        old_time, old_result = timeit(old)
+        new_time, new_result = timeit(new)
+        print(
+            "{:14s} loop: {:7.3f} s  vectorized: {:7.4f} s  speedup: {:6.1f}x  max abs difference: {:.1e}".format(
+                name, old_time, new_time, old_time / new_time, np.abs(old_result - new_result).max()
+            )
+        )
@@ -0,0 +1,72 @@
+"""
+Benchmark the execution modes of MultipleFeaturizer on structures.
+
+Runs several structure featurizers that share neighbor lists and symmetry
+analyses through the caches of `matminer.utils.caching`, iterating over
+featurizers (each child runs over all entries), over entries (one task per
+entry) and over shards of entries (one task per shard, with all children
+run on one entry after the other and the features written into one array).
+With more structures than fit in the caches, iterating over featurizers
+recomputes the shared intermediates for each child.
+
+Usage:
+    python multiple_featurizer_shards.py [n_jobs] [n_structures]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+
+from matminer.featurizers.base import MultipleFeaturizer
+from matminer.featurizers.structure import (
+    GlobalSymmetryFeatures,
+    RadialDistributionFunction,
+    SiteStatsFingerprint,
+)
+from matminer.utils.caching import get_nn_cache, get_symmetry_cache
+
+
+def make_structures(n_structures, rng):
+    for _ in range(n_structures):
+        s = Structure.from_spacegroup(
+            "Fm-3m", Lattice.cubic(rng.uniform(5.4, 6.0)), ["Na", "Cl"], [[0, 0, 0], [0.5] * 3]
+        )
+        s.perturb(0.05)
+        yield s
+
+
+if __name__ == "__main__":
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    n_structures = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    warnings.simplefilter("ignore")
+
+    structures = list(make_structures(n_structures, np.random.default_rng(0)))
+    featurizers = [
+        SiteStatsFingerprint.from_preset("CrystalNNFingerprint_ops"),
+        SiteStatsFingerprint.from_preset("CoordinationNumber_ward-prb-2017"),
+        GlobalSymmetryFeatures(),
+        RadialDistributionFunction(),
+    ]
+
+    reference = None
+    for mode in [False, True, "shards"]:
+        get_nn_cache().cache_clear()
+        get_symmetry_cache().cache_clear()
+        mf = MultipleFeaturizer(featurizers, iterate_over_entries=mode)
+        mf.set_n_jobs(n_jobs)
+        start = time.perf_counter()
+        features = mf.featurize_many(structures, pbar=False)
+        elapsed = time.perf_counter() - start
+        features = np.array(features, dtype=object)
+        if reference is None:
+            reference = features
+        print(
+            "iterate_over_entries={!s:7s} {:7.3f} s  same features: {}".format(
+                mode, elapsed, all(str(a) == str(b) for a, b in zip(reference.ravel(), features.ravel()))
+            )
+        )
+    print("Time per featurizer with shards:")
+    print(mf.timings_.to_string())
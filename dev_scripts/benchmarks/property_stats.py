@@ -0,0 +1,78 @@
+"""
+Benchmark computing property statistics one call at a time with
+PropertyStats.calc_stat against the vectorized PropertyStats.calc_stats.
+
+Computes the statistics of the magpie ElementProperty preset (22 properties,
+6 statistics, plus the std_dev and holder means) for a set of random
+compositions, first by looping over every (composition, property, statistic)
+and then with one call for all compositions. Also reports the time per
+composition of ElementProperty.featurize.
+
+Usage:
+    python property_stats.py [n_compositions]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core.composition import Composition
+
+from matminer.featurizers.composition import ElementProperty
+from matminer.featurizers.utils.stats import PropertyStats
+
+STATS = ["minimum", "maximum", "range", "mean", "avg_dev", "std_dev", "holder_mean::0", "holder_mean::2"]
+
+
+def make_compositions(n, rng):
+    elements = ["H", "Li", "B", "C", "N", "O", "F", "Na", "Mg", "Al", "Si", "P", "S", "Cl", "K", "Ca", "Ti", "Fe"]
+    comps = []
+    for _ in range(n):
+        n_el = rng.integers(1, 6)
+        els = rng.choice(elements, n_el, replace=False)
+        comps.append(Composition({e: int(a) for e, a in zip(els, rng.integers(1, 5, n_el))}))
+    return comps
+
+
+if __name__ == "__main__":
+    n_comps = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+
+    featurizer = ElementProperty.from_preset("magpie")
+    comps = make_compositions(n_comps, rng)
+
+    # Build the (n_entries, n_elements) value and weight matrices, one row per composition and property
+    max_el = max(len(c) for c in comps)
+    n_rows = len(comps) * len(featurizer.features)
+    data = np.zeros((n_rows, max_el))
+    weights = np.zeros((n_rows, max_el))
+    mask = np.zeros((n_rows, max_el), dtype=bool)
+    row = 0
+    for comp in comps:
+        elements, fractions = zip(*comp.element_composition.items())
+        for attr in featurizer.features:
+            n = len(elements)
+            data[row, :n] = [featurizer.data_source.get_elemental_property(e, attr) for e in elements]
+            weights[row, :n] = fractions
+            mask[row, :n] = True
+            row += 1
+
+    start = time.perf_counter()
+    loop = [[PropertyStats.calc_stat(d[m], stat, w[m]) for stat in STATS] for d, w, m in zip(data, weights, mask)]
+    t_loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = PropertyStats.calc_stats(data, STATS, weights, mask)
+    t_batch = time.perf_counter() - start
+
+    print("Rows: {}, statistics per row: {}".format(n_rows, len(STATS)))
+    print("calc_stat loop:  {:.4f} s".format(t_loop))
+    print("calc_stats:      {:.4f} s".format(t_batch))
+    print("Speedup: {:.1f}x, max abs difference: {:.2e}".format(t_loop / t_batch, np.nanmax(np.abs(loop - batch))))
+
+    start = time.perf_counter()
+    for comp in comps:
+        featurizer.featurize(comp)
+    print("ElementProperty.featurize: {:.2f} ms/composition".format((time.perf_counter() - start) / n_comps * 1e3))
@@ -0,0 +1,104 @@
+"""
+Benchmark the radial distribution function featurizers against the previous
+implementations, which looped over PeriodicNeighbor objects in Python.
+
+Builds a supercell of a ternary perovskite and computes the RDF, the PRDF
+and the sum over pairs of sites of the ReDF with the shared neighbor list of
+`matminer.utils.caching.get_neighbor_list`, clearing the neighbor list
+cache before each featurizer (cold) and reusing it (warm), and compares
+with reference implementations built on `Structure.get_all_neighbors`.
+
+Usage:
+    python rdf_neighbor_list.py [cutoff]
+"""
+
+import itertools
+import math
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+
+from matminer.featurizers.structure.rdf import PartialRadialDistributionFunction, RadialDistributionFunction
+from matminer.utils.caching import get_neighbor_list, get_nn_cache
+
+
+def loop_rdf(s, cutoff, bin_size):
+    neighbors_lst = s.get_all_neighbors(cutoff)
+    all_distances = np.concatenate([[n[1] for n in nlst] for nlst in neighbors_lst])
+    dist_hist, dist_bins = np.histogram(all_distances, bins=np.arange(0, cutoff + bin_size, bin_size))
+    shell_vol = 4.0 / 3.0 * math.pi * (np.power(dist_bins[1:], 3) - np.power(dist_bins[:-1], 3))
+    return dist_hist / shell_vol / (s.num_sites / s.volume)
+
+
+def loop_prdf(s, cutoff, bin_size):
+    composition = s.composition.element_composition.fractional_composition.to_reduced_dict
+    distances_by_type = {p: [] for p in itertools.product(composition, composition)}
+    for site, nlst in zip(s.sites, s.get_all_neighbors(cutoff)):
+        for neighbor in nlst:
+            distances_by_type[(site.specie.element.symbol, neighbor[0].specie.element.symbol)].append(neighbor[1])
+    dist_bins = np.arange(0, cutoff + bin_size, bin_size)
+    shell_volume = 4.0 / 3.0 * math.pi * (np.power(dist_bins[1:], 3) - np.power(dist_bins[:-1], 3))
+    output = []
+    for key, distances in distances_by_type.items():
+        dist_hist, _ = np.histogram(distances, bins=dist_bins)
+        output.append(dist_hist / shell_volume / (composition[key[0]] * s.num_sites))
+    return np.hstack(output)
+
+
+def loop_redf(s, cutoff, dr):
+    distribution = np.zeros(int(cutoff / dr) + 1)
+    for site in s.sites:
+        for nnsite, dist, *_ in s.get_neighbors(site, cutoff):
+            distribution[int(dist / dr)] += site.specie.oxi_state * nnsite.specie.oxi_state / (s.num_sites * dist)
+    return distribution
+
+
+def redf_sum(s, cutoff, dr):
+    # The part of ElectronicRadialDistributionFunction.featurize after finding the primitive cell
+    #  and assigning oxidation states, which are the same for both implementations
+    centers, neighbors, _, distances = get_neighbor_list(s, cutoff)
+    charges = np.array([float(site.specie.oxi_state) for site in s.sites])
+    weights = charges[centers] * charges[neighbors] / (s.num_sites * distances)
+    return np.bincount((distances / dr).astype(int), weights=weights, minlength=int(cutoff / dr) + 1)
+
+
+def timeit(func, clear):
+    if clear:
+        get_nn_cache().cache_clear()
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    cutoff = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+
+    s = Structure(
+        Lattice.cubic(3.9),
+        ["Sr2+", "Ti4+", "O2-", "O2-", "O2-"],
+        [[0, 0, 0], [0.5, 0.5, 0.5], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]],
+    )
+    s.make_supercell([3, 3, 2])
+    for i in range(len(s)):
+        s.translate_sites([i], rng.normal(0, 0.02, 3), frac_coords=False)
+    print("{} sites, cutoff {} A".format(len(s), cutoff))
+
+    prdf = PartialRadialDistributionFunction(cutoff=cutoff)
+    for name, old, new in [
+        ("RDF", lambda: loop_rdf(s, cutoff, 0.1), lambda: RadialDistributionFunction(cutoff=cutoff).featurize(s)),
+        ("PRDF", lambda: loop_prdf(s, cutoff, 0.1), lambda: np.hstack(list(prdf.compute_prdf(s)[1].values()))),
+        ("ReDF", lambda: loop_redf(s, cutoff, 0.05), lambda: redf_sum(s, cutoff, 0.05)),
+    ]:
+        old_time, old_result = timeit(old, True)
+        cold_time, new_result = timeit(new, True)
+        warm_time, _ = timeit(new, False)
+        print(
+            "{:5s} loop: {:7.3f} s  cold: {:7.3f} s  warm: {:7.4f} s  max abs difference: {:.1e}".format(
+                name, old_time, cold_time, warm_time, np.abs(old_result - new_result).max()
+            )
+        )
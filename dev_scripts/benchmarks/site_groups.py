@@ -0,0 +1,68 @@
+"""
+Benchmark featurizing a dataframe of (structure, site index) rows grouped by
+structure against featurizing each row as a separate entry.
+
+Featurizes every site of several perturbed supercells of a perovskite, with
+the rows shuffled and each row holding its own copy of its structure, as when
+loaded from a file. Without grouping, every row pickles its structure and
+is featurized on its own; with grouping, each structure is sent to one
+worker once and all of its sites are featurized with `featurize_all_sites`.
+
+Usage:
+    python site_groups.py [n_jobs] [n_structures]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from pymatgen.core import Lattice, Structure
+
+import matminer.featurizers.base
+from matminer.featurizers.site import ChemicalSRO, GeneralizedRadialDistributionFunction
+from matminer.utils.caching import get_nn_cache
+
+if __name__ == "__main__":
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    n_structures = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+
+    rows = []
+    for _ in range(n_structures):
+        s = Structure(
+            Lattice.cubic(rng.uniform(3.8, 4.0)),
+            ["Sr", "Ti", "O", "O", "O"],
+            [[0, 0, 0], [0.5, 0.5, 0.5], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]],
+        )
+        s.make_supercell([2, 2, 2])
+        s.perturb(0.05)
+        rows.extend((s.copy(), i) for i in range(len(s)))
+    df = pd.DataFrame(rows, columns=["structure", "site"]).sample(frac=1, random_state=0)
+    print("{} structures, {} sites".format(n_structures, len(df)))
+
+    group_sites = matminer.featurizers.base._group_sites
+    for f in [
+        ChemicalSRO.from_preset("MinimumDistanceNN"),
+        GeneralizedRadialDistributionFunction.from_preset("gaussian"),
+    ]:
+        f.set_n_jobs(n_jobs)
+        if hasattr(f, "fit"):
+            f.fit(df[["structure", "site"]].values)
+        times = []
+        results = []
+        for grouped in [False, True]:
+            matminer.featurizers.base._group_sites = group_sites if grouped else lambda *args, **kwargs: None
+            get_nn_cache().cache_clear()
+            start = time.perf_counter()
+            result = f.featurize_dataframe(df, ["structure", "site"], pbar=False)[f.feature_labels()]
+            times.append(time.perf_counter() - start)
+            results.append(result.values.astype(float))
+        print(
+            "{:40s} per row: {:7.3f} s  grouped: {:7.3f} s  speedup: {:6.1f}x  max abs difference: {:.1e}".format(
+                f.__class__.__name__, times[0], times[1], times[0] / times[1], np.abs(results[0] - results[1]).max()
+            )
+        )
+    matminer.featurizers.base._group_sites = group_sites
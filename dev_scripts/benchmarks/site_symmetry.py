@@ -0,0 +1,70 @@
+"""
+Benchmark featurizing only one site of each set of symmetrically-equivalent
+sites.
+
+Featurizes all sites of a supercell of a cubic perovskite with a CrystalNN
+fingerprint, both through SiteStatsFingerprint and as a dataframe of
+(structure, site index) rows, with and without symmetry.
+
+Usage:
+    python site_symmetry.py [supercell_size]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from pymatgen.core import Lattice, Structure
+
+from matminer.featurizers.site import CrystalNNFingerprint
+from matminer.featurizers.structure import SiteStatsFingerprint
+from matminer.utils.caching import FeatureCache, get_nn_cache
+
+
+def timeit(func):
+    get_nn_cache().cache_clear()
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, np.array(result, dtype=float)
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    warnings.simplefilter("ignore")
+
+    s = Structure(
+        Lattice.cubic(3.9),
+        ["Sr", "Ti", "O", "O", "O"],
+        [[0, 0, 0], [0.5, 0.5, 0.5], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]],
+    )
+    s.make_supercell([size] * 3)
+    print("{} sites".format(len(s)))
+
+    cnnf = CrystalNNFingerprint.from_preset("ops")
+    ssf = SiteStatsFingerprint(cnnf)
+    ssf_sym = SiteStatsFingerprint(cnnf, use_symmetry=True)
+    df = pd.DataFrame({"structure": [s] * len(s), "site": range(len(s))})
+
+    def featurize_rows(cache):
+        cnnf.set_n_jobs(1)
+        cnnf.set_feature_cache(cache)
+        return cnnf.featurize_dataframe(df, ["structure", "site"], pbar=False)[cnnf.feature_labels()].values
+
+    for name, old, new in [
+        ("SiteStatsFingerprint", lambda: ssf.featurize(s), lambda: ssf_sym.featurize(s)),
+        (
+            "dataframe rows",
+            lambda: featurize_rows(None),
+            lambda: featurize_rows(FeatureCache(use_symmetry=True)),
+        ),
+    ]:
+        old_time, old_result = timeit(old)
+        new_time, new_result = timeit(new)
+        print(
+            "{:20s} all sites: {:7.3f} s  inequivalent sites: {:7.3f} s  speedup: {:6.1f}x  "
+            "max abs difference: {:.1e}".format(
+                name, old_time, new_time, old_time / new_time, np.abs(old_result - new_result).max()
+            )
+        )
@@ -0,0 +1,57 @@
+"""
+Benchmark smearing XRD powder patterns with gaussian_kde over repeated peak
+samples against the vectorized XRDPowderPattern.broaden_peaks.
+
+The diffraction peaks of a set of rock-salt structures with random lattice
+parameters are computed once. They are then smeared one pattern at a time
+by repeating each peak as many times as its intensity and running
+gaussian_kde (the previous implementation of XRDPowderPattern), and all at
+once with broaden_peaks.
+
+Usage:
+    python xrd_broadening.py [n_structures]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+from scipy.stats import gaussian_kde
+
+from matminer.featurizers.structure.misc import XRDPowderPattern
+
+if __name__ == "__main__":
+    n_structures = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    warnings.simplefilter("ignore")
+    rng = np.random.default_rng(0)
+
+    featurizer = XRDPowderPattern()
+    structures = [
+        Structure(Lattice.cubic(a), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]]) for a in rng.uniform(3, 7, n_structures)
+    ]
+    start = time.perf_counter()
+    peaks = [featurizer.get_peaks(s) for s in structures]
+    print(
+        "Computing peaks: {:.3f} s ({:.1f} peaks per pattern)".format(
+            time.perf_counter() - start, np.mean([len(x) for x, _ in peaks])
+        )
+    )
+
+    grid = np.linspace(featurizer.two_theta_range[0], featurizer.two_theta_range[1], featurizer.pattern_length)
+    start = time.perf_counter()
+    kde_patterns = np.array(
+        [gaussian_kde(np.repeat(x, w.astype(int)), bw_method=featurizer.bw_method)(grid) for x, w in peaks]
+    )
+    kde_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    patterns, _ = featurizer.broaden_peaks(peaks)
+    batch_time = time.perf_counter() - start
+
+    print(
+        "gaussian_kde: {:.3f} s  broaden_peaks: {:.3f} s  speedup: {:.1f}x  max abs difference: {:.1e}".format(
+            kde_time, batch_time, kde_time / batch_time, np.abs(kde_patterns - patterns).max()
+        )
+    )
@@ -1,9 +1,19 @@
+import hashlib
+import os
+import pickle
+import shutil
 import sys
+import tempfile
+import time
 import traceback
 import warnings
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
 from functools import partial
+from itertools import chain, islice
 from multiprocessing import Pool, cpu_count
+from numbers import Integral
 from typing import Union
 
 import numpy as np
@@ -12,8 +22,647 @@ from six import reraise, string_types
 from sklearn.base import BaseEstimator, TransformerMixin, is_classifier
 from tqdm.auto import tqdm
 
+from pymatgen.core.structure import IStructure
+
+from matminer.utils.caching import get_params_token, get_structure_key
 from matminer.utils.utils import homogenize_multiindex
 
+# Persistent pool shared by all featurizers, set via `set_executor`
+_executor = None
+
+# Directory holding the pickled featurizers of the FeaturizerPool of this worker process
+_worker_state_dir = None
+
+# Featurizers already unpickled in this (worker) process, keyed by state token
+_worker_featurizers = OrderedDict()
+_worker_featurizers_maxsize = 16
+
+# Profile recording all featurization in this process, set via FeaturizationProfile
+_profile = None
+
+# Timings of the entry being featurized in this (worker) process, if profiling
+_entry_record = None
+
+
+def set_executor(executor):
+    """Set the persistent pool used by all featurizers.
+
+    Args:
+        executor (FeaturizerPool or None): Pool to use for parallel
+            featurization. None restores the default behavior of creating a
+            new `multiprocessing.Pool` for every call to `featurize_many`.
+    """
+    global _executor
+    _executor = executor
+
+
+def get_executor():
+    """Get the persistent pool used by all featurizers, if any.
+
+    Returns:
+        (FeaturizerPool or None)
+    """
+    return _executor
+
+
+def _init_worker(state_dir):
+    """Set up a worker process of a FeaturizerPool
+
+    Args:
+        state_dir (str): Directory the pool writes pickled featurizers to
+    """
+    global _worker_state_dir
+    _worker_state_dir = state_dir
+
+
+def _get_worker_featurizer(token):
+    """Get the featurizer described by a state token in a worker process.
+
+    Loads the featurizer from the state directory of the pool the first time
+    a token is seen, and reuses the copy held in this process for any
+    subsequent tasks.
+
+    Args:
+        token (str): Hash of the pickled featurizer
+    Returns:
+        (BaseFeaturizer)
+    """
+    featurizer = _worker_featurizers.get(token)
+    if featurizer is None:
+        with open(os.path.join(_worker_state_dir, token + ".pkl"), "rb") as fp:
+            featurizer = pickle.load(fp)
+        _worker_featurizers[token] = featurizer
+        if len(_worker_featurizers) > _worker_featurizers_maxsize:
+            _worker_featurizers.popitem(last=False)
+    else:
+        _worker_featurizers.move_to_end(token)
+    return featurizer
+
+
+def _pool_featurize_wrapper(token, x, return_errors=False, ignore_errors=False):
+    """Run `featurize_wrapper` of a featurizer shipped to a FeaturizerPool"""
+    featurizer = _get_worker_featurizer(token)
+    return featurizer.featurize_wrapper(x, return_errors=return_errors, ignore_errors=ignore_errors)
+
+
+def _pool_profiled_featurize_wrapper(token, x, return_errors=False, ignore_errors=False):
+    """Run `featurize_wrapper` of a featurizer shipped to a FeaturizerPool, timing the entry"""
+    featurizer = _get_worker_featurizer(token)
+    return _profiled_featurize_wrapper(featurizer, x, return_errors=return_errors, ignore_errors=ignore_errors)
+
+
+def _pool_featurize_shard(token, entries, return_errors=False, ignore_errors=False, profile=False):
+    """Run `_featurize_shard` of a MultipleFeaturizer shipped to a FeaturizerPool"""
+    featurizer = _get_worker_featurizer(token)
+    return featurizer._featurize_shard(
+        entries, return_errors=return_errors, ignore_errors=ignore_errors, profile=profile
+    )
+
+
+def _pool_featurize_site_group(token, group, return_errors=False, ignore_errors=False):
+    """Run `_featurize_site_group` of a featurizer shipped to a FeaturizerPool"""
+    featurizer = _get_worker_featurizer(token)
+    return featurizer._featurize_site_group(group, return_errors=return_errors, ignore_errors=ignore_errors)
+
+
+def _group_sites(entries, max_size=None):
+    """Group (structure, site index) entries by structure
+
+    Structures are identified by their contents (see `get_structure_key`), so
+    rows holding different copies of the same structure share a group.
+
+    Args:
+        entries (list-like): Entries to be featurized, each a tuple of arguments
+            to `featurize`
+        max_size (int): Maximum number of sites per group. Larger groups are
+            split, so that the sites of one structure can still be spread over
+            several workers.
+    Returns:
+        ([(Structure, [int], [int])]) structure, site indices and positions in
+            `entries` of each group, in order of first appearance. None if any
+            entry is not a (structure, site index) pair.
+    """
+    groups = OrderedDict()
+    keys = {}
+    for position, x in enumerate(entries):
+        if len(x) != 2 or not isinstance(x[0], IStructure) or not isinstance(x[1], Integral):
+            return None
+        key = keys.get(id(x[0]))
+        if key is None:
+            key = keys[id(x[0])] = get_structure_key(x[0])
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = (x[0], [], [])
+        group[1].append(int(x[1]))
+        group[2].append(position)
+
+    if max_size is None:
+        return list(groups.values())
+    return [
+        (structure, indices[start : start + max_size], positions[start : start + max_size])
+        for structure, indices, positions in groups.values()
+        for start in range(0, len(indices), max_size)
+    ]
+
+
+def _write_features(out, start, col, features):
+    """Write a block of features into a preallocated array
+
+    Args:
+        out (np.ndarray): Array holding the features of all entries
+        start (int): Row of `out` for the first entry in the block
+        col (int): Column of `out` for the first feature in the block
+        features (list): Features of each entry in the block
+    Returns:
+        (np.ndarray) `out`, converted to an object array if the block contains
+            non-numeric features (e.g., matrices, strings or error tracebacks).
+    """
+    if out.dtype != object:
+        try:
+            out[start : start + len(features), col : col + len(features[0])] = features
+            return out
+        except (TypeError, ValueError):
+            out = out.astype(object)
+    for i, row in enumerate(features, start):
+        for j, value in enumerate(row, col):
+            out[i, j] = value
+    return out
+
+
+class FeaturizerPool:
+    """
+    A long-lived process pool shared by all featurizers.
+
+    By default, each call to `featurize_many` (and thus `featurize_dataframe`)
+    starts a new `multiprocessing.Pool`, pickles the featurizer for each task
+    chunk, and shuts the pool down afterwards. For pipelines that call many
+    featurizers or featurize many small batches, this start-up cost can
+    dominate the runtime.
+
+    A FeaturizerPool keeps a single set of worker processes alive between
+    calls. Each featurizer is pickled once per call and identified by a hash
+    of its pickled state. A new state is written once to a temporary directory
+    shared with the workers, and tasks carry only its hash; each worker loads
+    a given state only once and reuses it for all later tasks, so a featurizer
+    is only shipped again after it changes (e.g., after being re-fit).
+
+    Use it as a context manager, which makes it the pool for all featurizers
+    while inside the block::
+
+        with FeaturizerPool(4):
+            df = ep.featurize_dataframe(df, "composition")
+            df = ofm.featurize_dataframe(df, "structure")
+
+    or register it explicitly with `set_executor(pool)` and call `close` when
+    finished. Featurizers with `n_jobs` set to 1 still run serially.
+
+    Args:
+        n_jobs (int): Number of worker processes. Defaults to the number of
+            CPUs.
+    """
+
+    def __init__(self, n_jobs=None):
+        self.n_jobs = n_jobs or cpu_count()
+        self._pool = None
+        self._previous = None
+        self._state_dir = None
+        self._tokens = set()
+
+    @property
+    def pool(self):
+        """The underlying `multiprocessing.Pool`, started on first use"""
+        if self._pool is None:
+            self._state_dir = tempfile.mkdtemp(prefix="matminer-pool-")
+            self._pool = Pool(self.n_jobs, initializer=_init_worker, initargs=(self._state_dir,))
+        return self._pool
+
+    def _register(self, featurizer):
+        """Make a featurizer available to the workers
+
+        Args:
+            featurizer (BaseFeaturizer): Featurizer to ship to the workers
+        Returns:
+            (str) hash of the pickled featurizer, which identifies it in tasks
+        """
+        state = pickle.dumps(featurizer)
+        token = hashlib.sha1(state).hexdigest()
+        if self._pool is None:
+            self.pool  # Start the workers, creating the state directory they read from
+        if token not in self._tokens:
+            path = os.path.join(self._state_dir, token + ".pkl")
+            with open(path + ".tmp", "wb") as fp:
+                fp.write(state)
+            os.replace(path + ".tmp", path)
+            self._tokens.add(token)
+        return token
+
+    def featurize_many(
+        self, featurizer, entries, return_errors=False, ignore_errors=False, chunksize=None, profile=False
+    ):
+        """Run `featurize_wrapper` of a featurizer over many entries.
+
+        Args:
+            featurizer (BaseFeaturizer): Featurizer to run
+            entries (iterable): Entries to featurize, each a tuple of arguments
+                to `featurize`
+            return_errors (bool): Passed to `featurize_wrapper`
+            ignore_errors (bool): Passed to `featurize_wrapper`
+            chunksize (int): Chunksize for `Pool.map`
+            profile (bool): Whether to time each entry in the workers
+        Returns:
+            (list) features for each entry, or (features, timings) pairs if
+                profile is True.
+        """
+        token = self._register(featurizer)
+        func = partial(
+            _pool_profiled_featurize_wrapper if profile else _pool_featurize_wrapper,
+            token,
+            return_errors=return_errors,
+            ignore_errors=ignore_errors,
+        )
+        return self.pool.map(func, entries, chunksize=chunksize)
+
+    def featurize_shards(self, featurizer, shards, return_errors=False, ignore_errors=False, profile=False):
+        """Run all child featurizers of a MultipleFeaturizer over shards of entries.
+
+        Args:
+            featurizer (MultipleFeaturizer): Featurizer to run
+            shards ([list]): Lists of entries, each sent to one worker as a
+                single task
+            return_errors (bool): Passed to `featurize_wrapper`
+            ignore_errors (bool): Passed to `featurize_wrapper`
+            profile (bool): Whether to time each entry in the workers
+        Returns:
+            (iterator) features, per-child timings and, if profile is True,
+                per-entry timings of each shard, in order
+        """
+        token = self._register(featurizer)
+        func = partial(
+            _pool_featurize_shard,
+            token,
+            return_errors=return_errors,
+            ignore_errors=ignore_errors,
+            profile=profile,
+        )
+        return self.pool.imap(func, shards)
+
+    def featurize_site_groups(self, featurizer, groups, return_errors=False, ignore_errors=False):
+        """Featurize groups of sites, each belonging to a single structure.
+
+        Args:
+            featurizer (BaseFeaturizer): Site featurizer to run
+            groups ([(Structure, [int])]): Structure and site indices of each
+                group, each sent to one worker as a single task
+            return_errors (bool): Passed to `featurize_wrapper`
+            ignore_errors (bool): Passed to `featurize_wrapper`
+        Returns:
+            (iterator) features of the sites in each group, in order
+        """
+        token = self._register(featurizer)
+        func = partial(
+            _pool_featurize_site_group,
+            token,
+            return_errors=return_errors,
+            ignore_errors=ignore_errors,
+        )
+        return self.pool.imap(func, groups)
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            shutil.rmtree(self._state_dir, ignore_errors=True)
+            self._state_dir = None
+            self._tokens.clear()
+
+    def __enter__(self):
+        self._previous = get_executor()
+        set_executor(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        set_executor(self._previous)
+        self._previous = None
+        self.close()
+
+    def __getstate__(self):
+        raise TypeError("FeaturizerPool objects cannot be pickled")
+
+
+def get_profile():
+    """Get the profile recording featurization in this process, if any.
+
+    Returns:
+        (FeaturizationProfile or None)
+    """
+    return _profile
+
+
+class _EntryRecord:
+    """Time spent in each section of the featurization of one entry, and errors caught in each"""
+
+    def __init__(self):
+        self.sections = []
+        self.seconds = {}
+        self.errors = {}
+
+
+def _describe_entry(x):
+    """Get the reduced formula of the first composition or structure among the inputs of an entry"""
+    for arg in x:
+        composition = getattr(arg, "composition", arg)
+        formula = getattr(composition, "reduced_formula", None)
+        if formula is not None:
+            return formula
+    return None
+
+
+@contextmanager
+def _profile_entry(x, records):
+    """Time the featurization of one entry
+
+    Args:
+        x (tuple): Inputs of the entry
+        records (list): List to append the formula of the entry, the seconds
+            spent on it, the seconds spent in each section and the errors
+            caught in each section to
+    """
+    global _entry_record
+    previous = _entry_record
+    record = _entry_record = _EntryRecord()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _entry_record = previous
+    records.append((_describe_entry(x), time.perf_counter() - start, record.seconds, record.errors))
+
+
+@contextmanager
+def profile_section(name):
+    """Time part of the featurization of an entry as a child of the running featurizer.
+
+    Used by featurizers built from other featurizers to report how long each
+    of them takes. Does nothing unless the entry is featurized inside a
+    `FeaturizationProfile`. Sections may be nested, and are named by the
+    names of all enclosing sections joined by "/".
+
+    Args:
+        name (str): Name of the section, usually the class name of a child
+            featurizer
+    """
+    record = _entry_record
+    if record is None:
+        yield
+        return
+    record.sections.append(name)
+    path = "/".join(record.sections)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record.seconds[path] = record.seconds.get(path, 0.0) + time.perf_counter() - start
+        record.sections.pop()
+
+
+def _record_error():
+    """Count an error caught in the current section of the entry being profiled, if any"""
+    record = _entry_record
+    if record is not None:
+        path = "/".join(record.sections)
+        record.errors[path] = record.errors.get(path, 0) + 1
+
+
+def _profiled_featurize_wrapper(featurizer, x, return_errors=False, ignore_errors=False):
+    """Run `featurize_wrapper` of a featurizer, timing the entry
+
+    Returns:
+        (list) features of the entry
+        (tuple) timings of the entry, see `_profile_entry`
+    """
+    records = []
+    with _profile_entry(x, records):
+        features = featurizer.featurize_wrapper(x, return_errors=return_errors, ignore_errors=ignore_errors)
+    return features, records[0]
+
+
+def _profile_rows(index):
+    """Get a context that labels the entries profiled within it by `index`"""
+    profile = get_profile()
+    return nullcontext() if profile is None else profile.rows(index)
+
+
+class FeaturizationProfile:
+    """
+    A record of where time goes during featurization.
+
+    While active, every call to `featurize_many` (and thus `featurize_dataframe`,
+    `featurize_iter` and `transform`) records the wall time spent on each entry,
+    the number of errors caught with `ignore_errors=True`, and the reduced
+    formula of the entry, if it has a composition. Featurizers built from other
+    featurizers, such as `MultipleFeaturizer` and `SiteStatsFingerprint`, also
+    record the time spent in each child (see `profile_section`). Entries
+    featurized in worker processes are timed by the worker and the timings are
+    returned along with the features, so parallel runs are profiled as well.
+
+    Use it as a context manager to find the inputs that dominate the runtime::
+
+        with FeaturizationProfile() as profile:
+            df = ssf.featurize_dataframe(df, "structure", ignore_errors=True)
+        print(profile.summary())
+        print(profile.slowest(10))
+
+    Timings are stored in long format, with one record per featurizer and entry,
+    and one more for each child of the featurizer, named "<featurizer>/<child>".
+    Entries are labeled by the row index of the dataframe in
+    `featurize_dataframe`, and by their position otherwise.
+
+    Attributes:
+        records ([dict]): Featurizer, row, formula, seconds and number of errors
+            of each entry
+    """
+
+    def __init__(self):
+        self.records = []
+        self._rows = []
+        self._previous = None
+
+    def add(self, featurizer, entry_records):
+        """Add the timings of the entries of one call to `featurize_many`
+
+        Args:
+            featurizer (BaseFeaturizer): Featurizer that was run
+            entry_records ([tuple]): Timings of each entry, see `_profile_entry`
+        """
+        name = featurizer.__class__.__name__
+        rows = self._rows[-1] if self._rows else None
+        if rows is None or len(rows) != len(entry_records):
+            rows = range(len(entry_records))
+        for row, (formula, seconds, section_seconds, errors) in zip(rows, entry_records):
+            self.records.append(
+                {"featurizer": name, "row": row, "formula": formula, "seconds": seconds, "errors": sum(errors.values())}
+            )
+            for path, child_seconds in section_seconds.items():
+                self.records.append(
+                    {
+                        "featurizer": name + "/" + path,
+                        "row": row,
+                        "formula": formula,
+                        "seconds": child_seconds,
+                        "errors": errors.get(path, 0),
+                    }
+                )
+
+    @contextmanager
+    def rows(self, index):
+        """Label the entries featurized within this context by `index`
+
+        Args:
+            index (list-like): Label of each entry, used if it has as many
+                labels as there are entries in a call to `featurize_many`
+        """
+        self._rows.append(index)
+        try:
+            yield
+        finally:
+            self._rows.pop()
+
+    def to_dataframe(self):
+        """Get the timings of all entries
+
+        Returns:
+            (pd.DataFrame) featurizer, row, formula, seconds and number of
+                errors of each entry
+        """
+        return pd.DataFrame(self.records, columns=["featurizer", "row", "formula", "seconds", "errors"])
+
+    def summary(self):
+        """Get the time spent in each featurizer and child featurizer
+
+        Returns:
+            (pd.DataFrame) number of entries, number of errors, and the total,
+                mean and maximum seconds per entry of each featurizer
+        """
+        grouped = self.to_dataframe().groupby("featurizer", sort=False)
+        return pd.DataFrame(
+            {
+                "entries": grouped.size(),
+                "errors": grouped["errors"].sum(),
+                "total seconds": grouped["seconds"].sum(),
+                "mean seconds": grouped["seconds"].mean(),
+                "max seconds": grouped["seconds"].max(),
+            }
+        )
+
+    def slowest(self, n=10, featurizer=None):
+        """Get the entries that took longest to featurize
+
+        Args:
+            n (int): Number of entries
+            featurizer (str): Name of the featurizer or child (e.g.,
+                "MultipleFeaturizer/SiteStatsFingerprint"). Defaults to all
+                top-level featurizers.
+        Returns:
+            (pd.DataFrame) timings of the slowest entries, slowest first
+        """
+        df = self.to_dataframe()
+        if featurizer is None:
+            df = df[~df["featurizer"].str.contains("/", regex=False)]
+        else:
+            df = df[df["featurizer"] == featurizer]
+        return df.nlargest(n, "seconds")
+
+    def to_json(self, path=None):
+        """Export the timings of all entries as a JSON list of records
+
+        Args:
+            path (str): File to write to. If None, the JSON is returned.
+        Returns:
+            (str) the JSON, if path is None
+        """
+        return self.to_dataframe().to_json(path, orient="records")
+
+    def __enter__(self):
+        global _profile
+        self._previous = _profile
+        _profile = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _profile
+        _profile = self._previous
+        self._previous = None
+
+
+class _FeaturizationCheckpoint:
+    """Storage of completed blocks of a chunked featurize_dataframe run
+
+    Each block of rows is stored as an `.npz` shard whose file name contains
+    the featurizer class, a hash of its settings and feature labels, and the
+    positions of the first and last row in the block. The row labels of the
+    block are stored alongside the features, and a shard is only reused if
+    they match the dataframe being featurized.
+
+    Args:
+        directory (str): Directory holding the shards. Created if needed.
+        featurizer (BaseFeaturizer): Featurizer being run
+        labels ([str]): Column labels of the features
+    """
+
+    def __init__(self, directory, featurizer, labels):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        token = get_params_token(featurizer) + repr(list(labels))
+        self.prefix = "{}_{}".format(featurizer.__class__.__name__, hashlib.sha1(token.encode()).hexdigest()[:16])
+
+    def _path(self, start, stop):
+        return os.path.join(self.directory, "{}_{:012d}-{:012d}.npz".format(self.prefix, start, stop))
+
+    def load(self, start, stop, index):
+        """Load a completed block
+
+        Args:
+            start (int): Position of the first row in the block
+            stop (int): Position after the last row in the block
+            index (pd.Index): Row labels of the block
+        Returns:
+            (np.ndarray) features of the block, or None if not yet computed
+        """
+        path = self._path(start, stop)
+        if not os.path.isfile(path):
+            return None
+        with np.load(path, allow_pickle=True) as shard:
+            if not np.array_equal(shard["index"], np.asarray(index)):
+                return None
+            return shard["features"]
+
+    def save(self, start, stop, index, features):
+        """Save a completed block
+
+        Args:
+            start (int): Position of the first row in the block
+            stop (int): Position after the last row in the block
+            index (pd.Index): Row labels of the block
+            features (list): Features of each row in the block
+        """
+        try:
+            features = np.array(features, dtype=np.float64)
+        except (TypeError, ValueError):
+            rows = features
+            features = np.empty((len(rows), len(rows[0])), dtype=object)
+            for i, row in enumerate(rows):
+                for j, value in enumerate(row):
+                    features[i, j] = value
+        path = self._path(start, stop)
+
+        # Write to a temporary file first so interrupted writes are not loaded
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as fp:
+            np.savez(fp, index=np.asarray(index), features=features)
+        os.replace(tmp_path, path)
+
 
 class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
     """
@@ -114,6 +763,17 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
     As a general rule of thumb, if the featurize function takes 0.1 seconds or
     less, a chunksize of around 30 will perform best.
 
+    Featurizers that are run repeatedly over overlapping data can look up
+    features computed earlier from a `FeatureCache` (see `set_feature_cache`),
+    which identifies inputs by their contents rather than by object identity.
+
+    When running many featurizers (or many small batches) in parallel, the cost
+    of starting a new pool of processes for every call can be avoided by
+    running them inside a `FeaturizerPool`, which keeps one set of worker
+    processes alive and shares it between all featurizers. To find out where
+    the time goes in such a run, featurize inside a `FeaturizationProfile`,
+    which records the time spent on each entry and each child featurizer.
+
     ## Documenting a BaseFeaturizer
 
     The class documentation for each featurizer must contain a description of
@@ -155,6 +815,19 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
     def chunksize(self):
         return self._chunksize if hasattr(self, "_chunksize") else None
 
+    def set_feature_cache(self, cache):
+        """Set the cache used to look up previously computed features.
+
+        Args:
+            cache (FeatureCache or None): Cache of features, which may be
+                shared between featurizers. None disables caching.
+        """
+        self._feature_cache = cache
+
+    @property
+    def feature_cache(self):
+        return self._feature_cache if hasattr(self, "_feature_cache") else None
+
     def precheck_dataframe(self, df, col_id, return_frac=True, inplace=False) -> Union[float, pd.DataFrame]:
         """
         Precheck an entire dataframe. Subclasses wanting to use precheck
@@ -281,6 +954,8 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
         inplace=False,
         multiindex=False,
         pbar=True,
+        chunk_size=None,
+        checkpoint_dir=None,
     ):
         """
         Compute features for all entries contained in input dataframe.
@@ -304,6 +979,22 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
                 inplace, multiindex featurization will overwrite the original
                 dataframe's column index.
             pbar (bool): Shows a progress bar if True.
+            chunk_size (int): If set, featurize the dataframe in blocks of
+                this many rows (see `featurize_iter`), writing each block
+                directly into a preallocated output array. This bounds the
+                memory used by intermediate results for very large
+                dataframes. Numeric features are stored as float64 in this
+                mode.
+            checkpoint_dir (str): If set, each completed block of rows is saved
+                to this directory, and blocks saved by a previous (e.g.,
+                interrupted) run with the same featurizer settings, chunk size
+                and row index are loaded instead of being recomputed. Implies
+                chunked featurization, with a default chunk_size of 1000.
+                Ignored, with a warning, if the settings of the featurizer
+                cannot be represented deterministically (see
+                `matminer.utils.caching.get_params_token`).
+                Only use checkpoint directories you trust, as shards holding
+                non-numeric features are unpickled when loaded.
 
         Returns:
             updated dataframe.
@@ -336,12 +1027,36 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
                     raise ValueError('"{}" exists in input dataframe'.format(col))
 
         # Compute the features
-        features = self.featurize_many(
-            df[col_id].values,
-            ignore_errors=ignore_errors,
-            return_errors=return_errors,
-            pbar=pbar,
-        )
+        if checkpoint_dir is not None and chunk_size is None:
+            chunk_size = 1000
+        if chunk_size is None:
+            with _profile_rows(df.index):
+                features = self.featurize_many(
+                    df[col_id].values,
+                    ignore_errors=ignore_errors,
+                    return_errors=return_errors,
+                    pbar=pbar,
+                )
+        else:
+            checkpoint = None
+            if checkpoint_dir is not None:
+                if get_params_token(self) is None:
+                    warnings.warn(
+                        "The settings of {} cannot be represented deterministically, so no"
+                        " checkpoint is kept.".format(self.__class__.__name__)
+                    )
+                else:
+                    checkpoint = _FeaturizationCheckpoint(checkpoint_dir, self, labels)
+            features = self._featurize_chunked(
+                df[col_id].values,
+                len(labels),
+                chunk_size,
+                ignore_errors=ignore_errors,
+                return_errors=return_errors,
+                pbar=pbar,
+                checkpoint=checkpoint,
+                index=df.index,
+            )
 
         # Make sure the dataframe can handle multiindices
         if multiindex:
@@ -349,6 +1064,8 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
 
         # Create dataframe with the new features
         res = pd.DataFrame(features, index=df.index, columns=labels)
+        if chunk_size is not None and features.dtype == object:
+            res = res.infer_objects()
 
         if inplace:
             # Update the existing dataframe
@@ -363,6 +1080,145 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
             new = pd.concat([df, res], axis=1)
             return new[df.columns.tolist() + res.columns.tolist()]
 
+    def _featurize_chunked(
+        self,
+        entries,
+        n_features,
+        chunk_size,
+        ignore_errors=False,
+        return_errors=False,
+        pbar=True,
+        checkpoint=None,
+        index=None,
+    ):
+        """Featurize entries block-by-block into a preallocated array
+
+        Features are written to a float64 array as each block is completed.
+        If a block contains non-numeric features (e.g., matrices, strings or
+        error tracebacks), the array is converted to an object array.
+
+        Args:
+            entries (np.ndarray): Entries to be featurized
+            n_features (int): Number of features per entry, including the
+                error column if return_errors is True
+            chunk_size (int): Number of entries per block
+            ignore_errors (bool): See `featurize_many`
+            return_errors (bool): See `featurize_many`
+            pbar (bool): Show a progress bar if True
+            checkpoint (_FeaturizationCheckpoint): Where to load completed
+                blocks from and save new blocks to, if any
+            index (pd.Index): Row labels of the entries, used to identify
+                blocks in the checkpoint
+        Returns:
+            (np.ndarray) features for each entry, shape (n_entries, n_features)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        n_entries = len(entries)
+        out = np.empty((n_entries, n_features), dtype=np.float64)
+        progress = tqdm(total=n_entries, desc=self.__class__.__name__) if pbar else None
+        with self._block_pool():
+            for start in range(0, n_entries, chunk_size):
+                stop = min(start + chunk_size, n_entries)
+                block = None
+                if checkpoint is not None:
+                    block = checkpoint.load(start, stop, index[start:stop])
+                if block is None:
+                    with _profile_rows(range(start, stop) if index is None else index[start:stop]):
+                        block = self.featurize_many(
+                            entries[start:stop],
+                            ignore_errors=ignore_errors,
+                            return_errors=return_errors,
+                            pbar=False,
+                        )
+                    if checkpoint is not None:
+                        checkpoint.save(start, stop, index[start:stop], block)
+
+                out = _write_features(out, start, 0, block)
+                if progress is not None:
+                    progress.update(stop - start)
+        if progress is not None:
+            progress.close()
+        return out
+
+    def _block_pool(self):
+        """Get a context that keeps worker processes alive between blocks
+
+        Returns:
+            A temporary `FeaturizerPool` if this featurizer runs in parallel
+            and no pool is active, otherwise a context that does nothing.
+        """
+        if self.n_jobs != 1 and get_executor() is None:
+            return FeaturizerPool(self.n_jobs)
+        return nullcontext()
+
+    def featurize_iter(self, entries, chunk_size=1000, ignore_errors=False, return_errors=False, pbar=True):
+        """Featurize entries in blocks, yielding the features of each block.
+
+        Unlike `featurize_many`, the features for all entries are never held
+        in memory at the same time and `entries` may be any iterable,
+        including a generator. Each block is featurized with `featurize_many`,
+        so parallel featurization is used if `n_jobs` is not 1. Unless a
+        `FeaturizerPool` is already active, a temporary one is kept alive while
+        iterating so that worker processes are not restarted for each block.
+
+        Args:
+            entries (iterable): Entries to be featurized. If `featurize` takes
+                multiple inputs, supply inputs as tuples.
+            chunk_size (int): Number of entries per block
+            ignore_errors (bool): See `featurize_many`
+            return_errors (bool): See `featurize_many`
+            pbar (bool): Show a progress bar for featurization if True.
+
+        Yields:
+            (list) features for each entry in the next block.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        # Normalize the entries to an iterator over argument tuples
+        total = len(entries) if hasattr(entries, "__len__") else None
+        if isinstance(entries, pd.DataFrame):
+            entries = iter(entries.values)
+        elif isinstance(entries, pd.Series):
+            entries = zip(entries)
+        else:
+            entries = iter(entries)
+            try:
+                first = next(entries)
+            except StopIteration:
+                return
+            if not isinstance(first, (tuple, list, np.ndarray)):
+                entries = zip(chain([first], entries))
+            else:
+                entries = chain([first], entries)
+
+        progress = tqdm(total=total, desc=self.__class__.__name__) if pbar else None
+        pool = self._block_pool()
+        pool.__enter__()
+        start = 0
+        try:
+            while True:
+                block = list(islice(entries, chunk_size))
+                if len(block) == 0:
+                    break
+                with _profile_rows(range(start, start + len(block))):
+                    features = self.featurize_many(
+                        block,
+                        ignore_errors=ignore_errors,
+                        return_errors=return_errors,
+                        pbar=False,
+                    )
+                start += len(block)
+                if progress is not None:
+                    progress.update(len(block))
+                yield features
+        finally:
+            pool.__exit__(None, None, None)
+            if progress is not None:
+                progress.close()
+
     def _generate_column_labels(self, multiindex, return_errors):
         """Create a list of column names for a dataframe
 
@@ -405,6 +1261,11 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
         Featurize_many supports entries as a list, tuple, numpy array,
         Pandas Series, or Pandas DataFrame.
 
+        Entries that are all (structure, site index) pairs are grouped by
+        structure when running in parallel or if the featurizer implements
+        `featurize_all_sites(structure, indices)`: each structure is sent to
+        one worker once, and all of its sites are featurized together.
+
         Args:
             entries (list-like object): A list of entries to be featurized.
             ignore_errors (bool): Returns NaN for entries where exceptions are
@@ -427,7 +1288,8 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
             raise Exception("'entries' must be a list-like object")
 
         # Special case: Empty list
-        if len(entries) == 0:
+        n_entries = len(entries)
+        if n_entries == 0:
             return []
 
         # If the featurize function only has a single arg, zip the inputs
@@ -436,16 +1298,32 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
         elif isinstance(entries, pd.Series) or not isinstance(entries[0], (tuple, list, np.ndarray)):
             entries = zip(entries)
 
+        # Featurize (structure, site index) pairs one structure at a time,
+        # unless profiling, which times each entry on its own
+        profile = get_profile()
+        if (
+            profile is None
+            and not isinstance(entries, zip)
+            and (self.n_jobs != 1 or hasattr(self, "featurize_all_sites"))
+        ):
+            n_workers = 1 if self.n_jobs == 1 else getattr(get_executor(), "n_jobs", self.n_jobs)
+            groups = _group_sites(entries, max_size=-(-n_entries // n_workers) if n_workers > 1 else None)
+            if groups is not None:
+                return self._featurize_site_groups(
+                    groups, n_entries, ignore_errors=ignore_errors, return_errors=return_errors, pbar=pbar
+                )
+
         # Add a progress bar
         if pbar:
-            # list() required, tqdm has issues with memory if generator given
-            entries = tqdm(list(entries), desc=self.__class__.__name__)
+            entries = tqdm(entries, total=n_entries, desc=self.__class__.__name__)
 
-        # Run the actual featurization
+        # Run the actual featurization, timing each entry if profiling
+        if profile is None:
+            wrapper = self.featurize_wrapper
+        else:
+            wrapper = partial(_profiled_featurize_wrapper, self)
         if self.n_jobs == 1:
-            return [
-                self.featurize_wrapper(x, ignore_errors=ignore_errors, return_errors=return_errors) for x in entries
-            ]
+            results = [wrapper(x, ignore_errors=ignore_errors, return_errors=return_errors) for x in entries]
         else:
             if sys.version_info[0] < 3:
                 warnings.warn(
@@ -462,13 +1340,121 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
                     return_errors=return_errors,
                     pbar=pbar,
                 )
-            with Pool(self.n_jobs) as p:
-                func = partial(
-                    self.featurize_wrapper,
+            executor = get_executor()
+            if executor is not None:
+                results = executor.featurize_many(
+                    self,
+                    entries,
                     return_errors=return_errors,
                     ignore_errors=ignore_errors,
+                    chunksize=self.chunksize,
+                    profile=profile is not None,
+                )
+            else:
+                with Pool(self.n_jobs) as p:
+                    func = partial(
+                        wrapper,
+                        return_errors=return_errors,
+                        ignore_errors=ignore_errors,
+                    )
+                    results = p.map(func, entries, chunksize=self.chunksize)
+
+        if profile is None:
+            return results
+        features, entry_records = zip(*results)
+        profile.add(self, entry_records)
+        return list(features)
+
+    def _featurize_site_groups(self, groups, n_entries, ignore_errors=False, return_errors=False, pbar=True):
+        """Featurize (structure, site index) entries grouped by structure.
+
+        Each group is a single task, so a structure is pickled once per group
+        rather than once per site, and all of its sites are featurized by the
+        same worker, which can reuse anything cached for the structure.
+
+        Args:
+            groups ([(Structure, [int], [int])]): Groups of entries, see
+                `_group_sites`
+            n_entries (int): Total number of entries in all groups
+            ignore_errors (bool): See `featurize_many`
+            return_errors (bool): See `featurize_many`
+            pbar (bool): Show a progress bar for featurization if True.
+        Returns:
+            (list) features for each entry, in the original order
+        """
+        tasks = [(structure, indices) for structure, indices, _ in groups]
+        executor = get_executor()
+        serial = self.n_jobs == 1
+        results = [None] * n_entries
+        progress = tqdm(total=n_entries, desc=self.__class__.__name__) if pbar else None
+        with nullcontext() if serial or executor is not None else Pool(self.n_jobs) as p:
+            if serial:
+                group_features = (
+                    self._featurize_site_group(t, return_errors=return_errors, ignore_errors=ignore_errors)
+                    for t in tasks
+                )
+            elif executor is not None:
+                group_features = executor.featurize_site_groups(
+                    self, tasks, return_errors=return_errors, ignore_errors=ignore_errors
                 )
-                return p.map(func, entries, chunksize=self.chunksize)
+            else:
+                func = partial(self._featurize_site_group, return_errors=return_errors, ignore_errors=ignore_errors)
+                group_features = p.imap(func, tasks)
+
+            # Scatter the features of each group back into the order of the entries
+            for (_, _, positions), features in zip(groups, group_features):
+                for position, f in zip(positions, features):
+                    results[position] = f
+                if progress is not None:
+                    progress.update(len(positions))
+        if progress is not None:
+            progress.close()
+        return results
+
+    def _featurize_site_group(self, group, return_errors=False, ignore_errors=False):
+        """Featurize several sites of one structure.
+
+        Uses `featurize_all_sites(structure, indices)` for all sites not found
+        in the feature cache if the featurizer implements it, and
+        `featurize_wrapper` for each site otherwise. If `featurize_all_sites`
+        fails, each site is featurized on its own so that the error is raised
+        (or recorded) for the sites that caused it.
+
+        Args:
+            group ((Structure, [int])): Structure and indices of its sites
+            return_errors (bool): See `featurize_wrapper`
+            ignore_errors (bool): See `featurize_wrapper`
+        Returns:
+            ([list]) features for each site
+        """
+        structure, indices = group
+        featurize_all_sites = getattr(self, "featurize_all_sites", None)
+        if featurize_all_sites is None:
+            return [
+                self.featurize_wrapper((structure, i), return_errors=return_errors, ignore_errors=ignore_errors)
+                for i in indices
+            ]
+
+        cache = self.feature_cache
+        keys = [None] * len(indices) if cache is None else [cache.make_key(self, (structure, i)) for i in indices]
+        features = [None if key is None else cache.get(key) for key in keys]
+        missing = [j for j, f in enumerate(features) if f is None]
+        if len(missing) > 0:
+            try:
+                site_features = featurize_all_sites(structure, [indices[j] for j in missing])
+            except Exception:
+                return [
+                    self.featurize_wrapper((structure, i), return_errors=return_errors, ignore_errors=ignore_errors)
+                    for i in indices
+                ]
+            for j, f in zip(missing, site_features):
+                features[j] = f.tolist() if isinstance(f, np.ndarray) else list(f)
+                if keys[j] is not None:
+                    cache.put(keys[j], features[j])
+
+        if return_errors:
+            return [list(f) + [float("nan")] for f in features]
+        return features
 
     def featurize_wrapper(self, x, return_errors=False, ignore_errors=False):
         """
@@ -488,15 +1474,25 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
         Returns:
             (list) one or more features.
         """
+        # Cache lookups are outside of the error handling, so that problems
+        # with the cache are not reported as failures to featurize the entry
+        cache = self.feature_cache
+        key = None if cache is None else cache.make_key(self, x)
+        features = None if key is None else cache.get(key)
+        cached = features is not None
         try:
+            if not cached:
+                features = self.featurize(*x)
+
             # Successful featurization returns nan for an error.
             if return_errors:
                 # Append operation must be agnostic to both ndarrays and lists
-                return list(self.featurize(*x)) + [float("nan")]
+                result = list(features) + [float("nan")]
             else:
-                return self.featurize(*x)
+                result = features
         except BaseException as e:
             if ignore_errors:
+                _record_error()
                 if return_errors:
                     features = [float("nan")] * len(self.feature_labels())
                     error = traceback.format_exception(*sys.exc_info())
@@ -513,6 +1509,10 @@ class BaseFeaturizer(BaseEstimator, TransformerMixin, ABC):
                 )
                 reraise(type(e), type(e)(msg), sys.exc_info()[2])
 
+        if key is not None and not cached:
+            cache.put(key, features)
+        return result
+
     @abstractmethod
     def featurize(self, *x):
         """
@@ -575,12 +1575,23 @@ class MultipleFeaturizer(BaseFeaturizer):
 
     Args:
         featurizers (list of BaseFeaturizer): A list of featurizers to run.
-        iterate_over_entries (bool): Whether to iterate over the entries or
-            featurizers. Iterating over entries will enable increased caching
+        iterate_over_entries (bool or str): Whether to iterate over the entries
+            or featurizers. Iterating over entries will enable increased caching
             but will only display a single progress bar for all featurizers.
             If set to False, iteration will be performed over featurizers,
             resulting in reduced caching but individual progress bars for each
-            featurizer.
+            featurizer. If set to "shards", the entries are split into
+            contiguous shards that are each sent to a worker once, and each
+            worker runs all featurizers on one entry after the other, so
+            intermediates cached per structure (e.g., neighbor lists and
+            symmetry) are computed once and shared by all featurizers. The
+            features are written into a single preallocated array, and the
+            time spent in each featurizer is stored in `timings_`.
+
+    Attributes:
+        timings_ (pd.Series): Seconds spent in each featurizer, summed over all
+            workers, during the last call to `featurize_many` with
+            `iterate_over_entries="shards"`. Indexed by featurizer class name.
     """
 
     def __init__(self, featurizers, iterate_over_entries=True):
@@ -599,7 +1610,15 @@ class MultipleFeaturizer(BaseFeaturizer):
         return self
 
     def featurize_many(self, entries, ignore_errors=False, return_errors=False, pbar=True):
-        if self.iterate_over_entries:
+        if self.iterate_over_entries == "shards":
+            features = self.featurize_shards(
+                entries,
+                ignore_errors=ignore_errors,
+                return_errors=return_errors,
+                pbar=pbar,
+            )
+            return features.tolist()
+        elif self.iterate_over_entries:
             return super(MultipleFeaturizer, self).featurize_many(
                 entries,
                 ignore_errors=ignore_errors,
@@ -616,15 +1635,140 @@ class MultipleFeaturizer(BaseFeaturizer):
                 )
                 for f in self.featurizers
             ]
-            return [sum(x, []) for x in zip(*features)]
+            return [list(chain.from_iterable(x)) for x in zip(*features)]
+
+    def featurize_shards(self, entries, ignore_errors=False, return_errors=False, pbar=True, shard_size=None):
+        """Featurize entries with all featurizers, one shard of entries at a time.
+
+        The entries are split into contiguous shards, and each shard is
+        featurized by all featurizers in a single task, so each entry is sent
+        to a worker process only once and the featurizers run one after the
+        other on the same entry. Features are written into one preallocated
+        float64 array, which is converted to an object array if any features
+        are not numeric. The seconds spent in each featurizer are stored in
+        `timings_`.
+
+        Args:
+            entries (list-like object): A list of entries to be featurized. See
+                `featurize_many`.
+            ignore_errors (bool): See `featurize_many`
+            return_errors (bool): See `featurize_many`
+            pbar (bool): Show a progress bar for featurization if True.
+            shard_size (int): Number of entries per shard. Defaults to
+                `chunksize` if set, otherwise the entries are split into four
+                shards per worker.
+
+        Returns:
+            (np.ndarray) features for each entry, shape (n_entries, n_features)
+        """
+        if return_errors and not ignore_errors:
+            raise ValueError("Please set ignore_errors to True to use" " return_errors.")
+        if not isinstance(entries, (tuple, list, np.ndarray, pd.Series, pd.DataFrame)):
+            raise Exception("'entries' must be a list-like object")
+
+        # Normalize the entries to a list of argument tuples
+        if isinstance(entries, pd.DataFrame):
+            entries = list(entries.values)
+        elif isinstance(entries, pd.Series) or (
+            len(entries) > 0 and not isinstance(entries[0], (tuple, list, np.ndarray))
+        ):
+            entries = list(zip(entries))
+        else:
+            entries = list(entries)
+        n_entries = len(entries)
+
+        names = [f.__class__.__name__ for f in self.featurizers]
+        timings = np.zeros(len(self.featurizers))
+        n_features = sum(len(f.feature_labels()) + int(return_errors) for f in self.featurizers)
+        out = np.empty((n_entries, n_features), dtype=np.float64)
+        progress = tqdm(total=n_entries, desc=self.__class__.__name__) if pbar else None
+        profile = get_profile()
+        entry_records = []
+
+        if self.n_jobs == 1:
+            out, timings, entry_records = self._featurize_shard(
+                entries,
+                return_errors=return_errors,
+                ignore_errors=ignore_errors,
+                profile=profile is not None,
+                out=out,
+                progress=progress,
+            )
+        elif n_entries > 0:
+            if shard_size is None:
+                shard_size = self.chunksize or -(-n_entries // (4 * self.n_jobs))
+            starts = range(0, n_entries, shard_size)
+            shards = [entries[start : start + shard_size] for start in starts]
+            executor = get_executor()
+            pool = FeaturizerPool(self.n_jobs) if executor is None else nullcontext(executor)
+            with pool as executor:
+                results = executor.featurize_shards(
+                    self,
+                    shards,
+                    return_errors=return_errors,
+                    ignore_errors=ignore_errors,
+                    profile=profile is not None,
+                )
+                for start, (block, block_timings, block_records) in zip(starts, results):
+                    out = _write_features(out, start, 0, block)
+                    timings += block_timings
+                    entry_records.extend(block_records)
+                    if progress is not None:
+                        progress.update(len(block))
+        if progress is not None:
+            progress.close()
+
+        self.timings_ = pd.Series(timings, index=names)
+        if profile is not None and n_entries > 0:
+            profile.add(self, entry_records)
+        return out
+
+    def _featurize_shard(
+        self, entries, return_errors=False, ignore_errors=False, profile=False, out=None, progress=None
+    ):
+        """Run all featurizers on each entry of a shard
+
+        Args:
+            entries ([tuple]): Entries to featurize
+            return_errors (bool): Passed to `featurize_wrapper`
+            ignore_errors (bool): Passed to `featurize_wrapper`
+            profile (bool): Whether to time each entry for a
+                `FeaturizationProfile`
+            out (np.ndarray): Array to write the features into. If None, a
+                new float64 array is created.
+            progress (tqdm): Progress bar to update after each entry, if any
+        Returns:
+            (np.ndarray) features for each entry, shape (n_entries, n_features)
+            (np.ndarray) seconds spent in each featurizer
+            ([tuple]) timings of each entry if profile is True, see
+                `_profile_entry`, otherwise an empty list
+        """
+        widths = [len(f.feature_labels()) + int(return_errors) for f in self.featurizers]
+        if out is None:
+            out = np.empty((len(entries), sum(widths)), dtype=np.float64)
+        timings = np.zeros(len(self.featurizers))
+        entry_records = []
+        for i, x in enumerate(entries):
+            col = 0
+            with _profile_entry(x, entry_records) if profile else nullcontext():
+                for j, (f, width) in enumerate(zip(self.featurizers, widths)):
+                    start = time.perf_counter()
+                    with profile_section(f.__class__.__name__):
+                        features = f.featurize_wrapper(x, return_errors=return_errors, ignore_errors=ignore_errors)
+                    timings[j] += time.perf_counter() - start
+                    out = _write_features(out, i, col, [features])
+                    col += width
+            if progress is not None:
+                progress.update(1)
+        return out, timings, entry_records
 
     def featurize_wrapper(self, x, return_errors=False, ignore_errors=False):
         if self.iterate_over_entries:
-            return [
-                feature
-                for f in self.featurizers
-                for feature in f.featurize_wrapper(x, return_errors=return_errors, ignore_errors=ignore_errors)
-            ]
+            features = []
+            for f in self.featurizers:
+                with profile_section(f.__class__.__name__):
+                    features.extend(f.featurize_wrapper(x, return_errors=return_errors, ignore_errors=ignore_errors))
+            return features
         else:
             return super(MultipleFeaturizer, self).featurize_wrapper(
                 x, return_errors=return_errors, ignore_errors=ignore_errors
@@ -644,6 +1788,11 @@ class MultipleFeaturizer(BaseFeaturizer):
         for featurizer in self.featurizers:
             featurizer.set_n_jobs(n_jobs)
 
+    def set_feature_cache(self, cache):
+        super(MultipleFeaturizer, self).set_feature_cache(cache)
+        for featurizer in self.featurizers:
+            featurizer.set_feature_cache(cache)
+
 
 class StackedFeaturizer(BaseFeaturizer):
     """
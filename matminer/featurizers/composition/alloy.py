@@ -14,16 +14,14 @@ from pymatgen.core.periodic_table import get_el_sp
 
 from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.utils.stats import PropertyStats
-from matminer.utils.data import (
-    MagpieData,
-    CohesiveEnergyData,
-    MixingEnthalpy,
-)
+from matminer.utils.data import get_data_source, register_data_source
 from matminer.featurizers.composition.packing import AtomicPackingEfficiency
 
 module_dir = os.path.dirname(os.path.abspath(__file__))
 data_dir = os.path.join(module_dir, "..", "..", "utils", "data_files")
 
+register_data_source("miedema", lambda: pd.read_csv(os.path.join(data_dir, "Miedema.csv"), index_col="element"))
+
 
 class Miedema(BaseFeaturizer):
     """
@@ -88,7 +86,7 @@ class Miedema(BaseFeaturizer):
 
         self.data_source = data_source
         if self.data_source == "Miedema":
-            self.df_dataset = pd.read_csv(os.path.join(data_dir, "Miedema.csv"), index_col="element")
+            self.df_dataset = get_data_source("miedema")
         else:
             raise NotImplementedError("data_source {} not implemented yet".format(data_source))
 
@@ -468,10 +466,10 @@ class YangSolidSolution(BaseFeaturizer):
     def __init__(self):
         # Load in the mixing enthalpy data
         #  Creates a lookup table of the liquid mixing enthalpies
-        self.dhf_mix = MixingEnthalpy()
+        self.dhf_mix = get_data_source("mixing_enthalpy")
 
         # Load in a table of elemental properties
-        self.elem_data = MagpieData()
+        self.elem_data = get_data_source("magpie")
 
     def precheck(self, c: Composition) -> bool:
         """
@@ -621,9 +619,9 @@ class WenAlloys(BaseFeaturizer):
     def __init__(self):
         # Use of Miedema to retrieve the shear modulus
         self.data_source_miedema = Miedema(data_source="Miedema")
-        self.data_source_magpie = MagpieData().all_elemental_props
-        self.data_source_cohesive_energy = CohesiveEnergyData()
-        self.data_source_enthalpy = MixingEnthalpy()
+        self.data_source_magpie = get_data_source("magpie")
+        self.data_source_cohesive_energy = get_data_source("cohesive_energy")
+        self.data_source_enthalpy = get_data_source("mixing_enthalpy")
         self.yss = YangSolidSolution()
 
     def precheck(self, comp):
@@ -652,30 +650,30 @@ class WenAlloys(BaseFeaturizer):
 
         s_unfilled = sum(
             [
-                2 - self.data_source_magpie["NsUnfilled"][e]
+                2 - self.data_source_magpie.all_elemental_props["NsUnfilled"][e]
                 for e in elements
-                if self.data_source_magpie["NsUnfilled"][e] != 0
+                if self.data_source_magpie.all_elemental_props["NsUnfilled"][e] != 0
             ]
         )
         p_unfilled = sum(
             [
-                6 - self.data_source_magpie["NpUnfilled"][e]
+                6 - self.data_source_magpie.all_elemental_props["NpUnfilled"][e]
                 for e in elements
-                if self.data_source_magpie["NpUnfilled"][e] != 0
+                if self.data_source_magpie.all_elemental_props["NpUnfilled"][e] != 0
             ]
         )
         d_unfilled = sum(
             [
-                10 - self.data_source_magpie["NdUnfilled"][e]
+                10 - self.data_source_magpie.all_elemental_props["NdUnfilled"][e]
                 for e in elements
-                if self.data_source_magpie["NdUnfilled"][e] != 0
+                if self.data_source_magpie.all_elemental_props["NdUnfilled"][e] != 0
             ]
         )
         f_unfilled = sum(
             [
-                14 - self.data_source_magpie["NfUnfilled"][e]
+                14 - self.data_source_magpie.all_elemental_props["NfUnfilled"][e]
                 for e in elements
-                if self.data_source_magpie["NfUnfilled"][e] != 0
+                if self.data_source_magpie.all_elemental_props["NfUnfilled"][e] != 0
             ]
         )
         interant_electrons = s_unfilled + p_unfilled + d_unfilled + f_unfilled
@@ -892,7 +890,7 @@ class WenAlloys(BaseFeaturizer):
         Returns:
             (dict) Dictionary of element-fraction weighted statistics for attribute.
         """
-        attribute = [self.data_source_magpie[attribute_name][e] for e in elements]
+        attribute = [self.data_source_magpie.all_elemental_props[attribute_name][e] for e in elements]
         return {
             "array": attribute,
             "mean": PropertyStats.mean(attribute, fractions),
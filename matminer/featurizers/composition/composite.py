@@ -2,17 +2,14 @@
 Composition featurizers for composite features containing more than 1 category of general-purpose data.
 """
 
+import numpy as np
+
 from matminer.featurizers.composition.element import ElementFraction
 from matminer.featurizers.composition.orbital import ValenceOrbital
 from matminer.featurizers.base import BaseFeaturizer
+from matminer.featurizers.utils.composition import featurize_many_dense, get_property_table
 from matminer.featurizers.utils.stats import PropertyStats
-from matminer.utils.data import (
-    DemlData,
-    MagpieData,
-    PymatgenData,
-    MatscholarElementData,
-    MEGNetElementData,
-)
+from matminer.utils.data import get_data_source
 
 
 class ElementProperty(BaseFeaturizer):
@@ -46,16 +43,14 @@ class ElementProperty(BaseFeaturizer):
     """
 
     def __init__(self, data_source, features, stats):
-        if data_source == "pymatgen":
-            self.data_source = PymatgenData()
-        elif data_source == "magpie":
-            self.data_source = MagpieData()
-        elif data_source == "deml":
-            self.data_source = DemlData()
-        elif data_source == "matscholar_el":
-            self.data_source = MatscholarElementData()
-        elif data_source == "megnet_el":
-            self.data_source = MEGNetElementData()
+        if isinstance(data_source, str) and data_source in (
+            "pymatgen",
+            "magpie",
+            "deml",
+            "matscholar_el",
+            "megnet_el",
+        ):
+            self.data_source = get_data_source(data_source)
         else:
             self.data_source = data_source
 
@@ -147,12 +142,12 @@ class ElementProperty(BaseFeaturizer):
         elif preset_name == "matscholar_el":
             data_source = "matscholar_el"
             stats = ["minimum", "maximum", "range", "mean", "std_dev"]
-            features = MatscholarElementData().prop_names
+            features = get_data_source("matscholar_el").prop_names
 
         elif preset_name == "megnet_el":
             data_source = "megnet_el"
             stats = ["minimum", "maximum", "range", "mean", "std_dev"]
-            features = MEGNetElementData().prop_names
+            features = get_data_source("megnet_el").prop_names
 
         else:
             raise ValueError("Invalid preset_name specified!")
@@ -170,18 +165,58 @@ class ElementProperty(BaseFeaturizer):
             all_attributes: Specified property statistics of features
         """
 
-        all_attributes = []
-
         # Get the element names and fractions
         elements, fractions = zip(*comp.element_composition.items())
 
-        for attr in self.features:
-            elem_data = [self.data_source.get_elemental_property(e, attr) for e in elements]
+        # Compute all statistics of all properties at once
+        elem_data = [[self.data_source.get_elemental_property(e, attr) for e in elements] for attr in self.features]
+        all_attributes = self.pstats.calc_stats(elem_data, self.stats, np.array([fractions] * len(self.features)))
 
-            for stat in self.stats:
-                all_attributes.append(self.pstats.calc_stat(elem_data, stat, fractions))
+        return all_attributes.flatten().tolist()
+
+    def featurize_many(self, entries, ignore_errors=False, return_errors=False, pbar=True):
+        """
+        Get elemental property attributes of many compositions at once.
+
+        The properties of all elements are first gathered into a table, and
+        the statistics of every composition are then computed with
+        vectorized array operations. Compositions for which some property
+        is not available in the table are featurized with `featurize`.
+
+        See `BaseFeaturizer.featurize_many` for the arguments.
+        """
+        return featurize_many_dense(self, entries, self._featurize_dense, ignore_errors, return_errors, pbar)
+
+    def _get_property_table(self):
+        """Get the table of the properties of each element, computing it if needed
+
+        Returns:
+            (ndarray, ndarray) Property values and missing values (see `get_property_table`)
+        """
+        key = (id(self.data_source), tuple(self.features))
+        if getattr(self, "_property_table", None) is None or self._property_table[0] != key:
+            self._property_table = (key,) + get_property_table(self.data_source, self.features)
+        return self._property_table[1:]
+
+    def _featurize_dense(self, arrays):
+        """Compute the attributes of many compositions
+
+        Args:
+            arrays (CompositionArrays): Encoded compositions
+        Returns:
+            (ndarray) attributes of each composition, and whether all element properties were available
+        """
+        table, missing = self._get_property_table()
+        success = ~(arrays.gather(missing) & arrays.mask[:, :, None]).any(axis=(1, 2))
+
+        # Compute the statistics of all properties of all compositions at once
+        n_comps, n_elements, n_props = len(arrays), arrays.z.shape[1], len(self.features)
+        values = arrays.gather(table).transpose(0, 2, 1).reshape(n_comps * n_props, n_elements)
+        weights = np.repeat(arrays.fractions, n_props, axis=0)
+        mask = np.repeat(arrays.mask, n_props, axis=0)
+        all_attributes = self.pstats.calc_stats(values, self.stats, weights, mask)
 
-        return all_attributes
+        return all_attributes.reshape(n_comps, n_props * len(self.stats)), success
 
     def feature_labels(self):
         labels = []
@@ -262,7 +297,7 @@ class Meredig(BaseFeaturizer):
     """
 
     def __init__(self):
-        self.data_source = MagpieData()
+        self.data_source = get_data_source("magpie")
 
         # The labels for statistics on element properties
         self._element_property_feature_labels = [
@@ -309,6 +344,58 @@ class Meredig(BaseFeaturizer):
 
         return element_fraction_features + element_property_features + valence_orbital_features
 
+    def featurize_many(self, entries, ignore_errors=False, return_errors=False, pbar=True):
+        """
+        Get the attributes of many compositions at once.
+
+        Uses a table of the properties of every element and vectorized array
+        operations over all compositions. Compositions for which some
+        property is not available are featurized with `featurize`.
+
+        See `BaseFeaturizer.featurize_many` for the arguments.
+        """
+        return featurize_many_dense(self, entries, self._featurize_dense, ignore_errors, return_errors, pbar)
+
+    def _featurize_dense(self, arrays):
+        """Compute the attributes of many compositions
+
+        Args:
+            arrays (CompositionArrays): Encoded compositions
+        Returns:
+            (ndarray) attributes of each composition, and whether all element properties were available
+        """
+        orbitals = ["s", "p", "d", "f"]
+        properties = [" ".join(f.split(" ")[1:]) for f in self._element_property_feature_labels]
+        properties += ["N%sValence" % orb for orb in orbitals] + ["NValence"]
+        if getattr(self, "_property_table", None) is None:
+            self._property_table = get_property_table(self.data_source, properties)
+        table, missing = self._property_table
+        success = ~(arrays.gather(missing) & arrays.mask[:, :, None]).any(axis=(1, 2))
+        values = arrays.gather(table)
+
+        # First 103 features are element fractions
+        element_fraction_features = arrays.sparse_fractions().toarray()
+
+        # Next 9 features are statistics on elemental properties
+        element_property_features = np.zeros((len(arrays), len(self._element_property_feature_labels)))
+        for i, feat in enumerate(self._element_property_feature_labels):
+            stat = feat.split(" ")[0]
+            element_property_features[:, i] = self.pstats.calc_stats(
+                values[:, :, i], [stat], arrays.fractions, arrays.mask
+            )[:, 0]
+
+        # Final 8 features are the average number and fraction of valence electrons in each orbital
+        n_stats = len(self._element_property_feature_labels)
+        avg = self.pstats.calc_stats(
+            values[:, :, n_stats:].transpose(0, 2, 1).reshape(-1, arrays.z.shape[1]),
+            ["mean"],
+            np.repeat(arrays.fractions, len(orbitals) + 1, axis=0),
+            np.repeat(arrays.mask, len(orbitals) + 1, axis=0),
+        ).reshape(len(arrays), len(orbitals) + 1)
+        frac = avg[:, :-1] / avg[:, -1:]
+
+        return np.hstack([element_fraction_features, element_property_features, avg[:, :-1], frac]), success
+
     def feature_labels(self):
         # Since we have more features than just element fractions, append 'fraction' to element symbols for clarity
         element_fraction_features = [e + " fraction" for e in ElementFraction().feature_labels()]
@@ -2,13 +2,12 @@
 Composition featurizers for elemental data and stoichiometry.
 """
 
+import numpy as np
 from pymatgen.core import Element
 
 from matminer.featurizers.base import BaseFeaturizer
-from matminer.utils.data import (
-    DemlData,
-    MagpieData,
-)
+from matminer.featurizers.utils.composition import featurize_many_dense, get_property_table
+from matminer.utils.data import get_data_source
 
 
 class ElementFraction(BaseFeaturizer):
@@ -38,6 +37,27 @@ class ElementFraction(BaseFeaturizer):
             vector[atomic_number_i] = obj[1]
         return vector
 
+    def featurize_many(self, entries, ignore_errors=False, return_errors=False, pbar=True):
+        """
+        Compute the element fractions of many compositions at once.
+
+        All compositions are encoded into a sparse matrix of element
+        fractions in a single pass.
+
+        See `BaseFeaturizer.featurize_many` for the arguments.
+        """
+        return featurize_many_dense(self, entries, self._featurize_dense, ignore_errors, return_errors, pbar)
+
+    def _featurize_dense(self, arrays):
+        """Compute the element fractions of many compositions
+
+        Args:
+            arrays (CompositionArrays): Encoded compositions
+        Returns:
+            (ndarray) fractions of each composition, and whether each was computed
+        """
+        return arrays.sparse_fractions().toarray(), np.ones(len(arrays), dtype=bool)
+
     def feature_labels(self):
         labels = []
         for i in range(1, 104):
@@ -177,6 +197,52 @@ class Stoichiometry(BaseFeaturizer):
 
         return stoich_attr
 
+    def featurize_many(self, entries, ignore_errors=False, return_errors=False, pbar=True):
+        """
+        Get the stoichiometric attributes of many compositions at once.
+
+        The p-norms of all compositions are computed with vectorized array
+        operations on their element fractions.
+
+        See `BaseFeaturizer.featurize_many` for the arguments.
+        """
+        return featurize_many_dense(self, entries, self._featurize_dense, ignore_errors, return_errors, pbar)
+
+    def _featurize_dense(self, arrays):
+        """Compute the stoichiometric attributes of many compositions
+
+        Args:
+            arrays (CompositionArrays): Encoded compositions
+        Returns:
+            (ndarray) attributes of each composition, and whether each was computed
+        """
+        success = np.ones(len(arrays), dtype=bool)
+        n_labels = len(self.feature_labels()) if self.p_list is not None else 1
+        if self.p_list is not None and any(p < 0 for p in self.p_list):
+            # Let `featurize` raise the error
+            return np.full((len(arrays), n_labels), np.nan), np.zeros(len(arrays), dtype=bool)
+
+        columns = []
+        if self.p_list is None or self.num_atoms:
+            # Compute the number of atoms per formula unit
+            n_atoms_per_unit = np.full(len(arrays), np.nan)
+            for i, (comp, valid) in enumerate(zip(arrays.compositions, arrays.valid)):
+                if valid:
+                    try:
+                        n_atoms_per_unit[i] = comp.num_atoms / comp.get_integer_formula_and_factor()[1]
+                    except Exception:
+                        success[i] = False
+            columns.append(n_atoms_per_unit)
+
+        if self.p_list is not None:
+            for p in self.p_list:
+                if p == 0:
+                    columns.append(arrays.n_elements())
+                else:
+                    columns.append(np.power(np.where(arrays.mask, arrays.fractions ** p, 0).sum(axis=1), 1.0 / p))
+
+        return np.array(columns, dtype=float).T.reshape(len(arrays), n_labels), success
+
     def feature_labels(self):
         labels = []
         if self.num_atoms:
@@ -225,11 +291,47 @@ class BandCenter(BaseFeaturizer):
         gmean = 1.0
         sumamt = sum(comp.get_el_amt_dict().values())
         for el, amt in comp.get_el_amt_dict().items():
-            first_ioniz = DemlData().get_elemental_property(Element(el), "first_ioniz") / 1000
-            elec_aff = MagpieData().get_elemental_property(Element(el), "ElectronAffinity")
+            first_ioniz = get_data_source("deml").get_elemental_property(Element(el), "first_ioniz") / 1000
+            elec_aff = get_data_source("magpie").get_elemental_property(Element(el), "ElectronAffinity")
             gmean *= (0.5 * (first_ioniz + elec_aff) / 96.48) ** (amt / sumamt)
         return [gmean]
 
+    def featurize_many(self, entries, ignore_errors=False, return_errors=False, pbar=True):
+        """
+        Estimate the band centers of many compositions at once.
+
+        The electronegativity of each element is tabulated once, and the
+        geometric means for all compositions are computed with vectorized
+        array operations. Compositions containing elements without data are
+        featurized with `featurize`.
+
+        See `BaseFeaturizer.featurize_many` for the arguments.
+        """
+        return featurize_many_dense(self, entries, self._featurize_dense, ignore_errors, return_errors, pbar)
+
+    def _featurize_dense(self, arrays):
+        """Estimate the band centers of many compositions
+
+        Args:
+            arrays (CompositionArrays): Encoded compositions
+        Returns:
+            (ndarray) band center of each composition, and whether it was computed
+        """
+        if getattr(self, "_property_table", None) is None:
+            first_ioniz, missing_ioniz = get_property_table(get_data_source("deml"), ["first_ioniz"])
+            elec_aff, missing_aff = get_property_table(get_data_source("magpie"), ["ElectronAffinity"])
+            self._property_table = (
+                0.5 * (first_ioniz[:, 0] / 1000 + elec_aff[:, 0]) / 96.48,
+                np.logical_or(missing_ioniz[:, 0], missing_aff[:, 0]),
+            )
+        table, missing = self._property_table
+
+        # Negative values give complex results, which are left to `featurize`
+        values = arrays.gather(table)
+        success = ~np.logical_and(np.logical_or(arrays.gather(missing), values < 0), arrays.mask).any(axis=1)
+        gmean = np.prod(np.power(np.where(arrays.mask, values, 1.0), arrays.fractions), axis=1)
+        return gmean[:, None], success
+
     def feature_labels(self):
         return ["band center"]
 
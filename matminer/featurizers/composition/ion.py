@@ -9,10 +9,7 @@ from pymatgen.core.composition import Composition
 from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.utils.stats import PropertyStats
 from matminer.featurizers.utils.oxidation import has_oxidation_states
-from matminer.utils.data import (
-    DemlData,
-    PymatgenData,
-)
+from matminer.utils.data import get_data_source
 from matminer.featurizers.composition.composite import ElementProperty
 
 
@@ -57,6 +54,13 @@ class CationProperty(ElementProperty):
     def feature_labels(self):
         return [f + " of cations" for f in super().feature_labels()]
 
+    def featurize_many(self, entries, ignore_errors=False, return_errors=False, pbar=True):
+        # Cation properties depend on the oxidation state, so they cannot use
+        # the element property tables of ElementProperty.featurize_many
+        return BaseFeaturizer.featurize_many(
+            self, entries, ignore_errors=ignore_errors, return_errors=return_errors, pbar=pbar
+        )
+
     def featurize(self, comp):
         # Check if oxidation states are present
         if not has_oxidation_states(comp):
@@ -145,17 +149,17 @@ class IonProperty(BaseFeaturizer):
     Ionic property attributes. Similar to ElementProperty.
     """
 
-    def __init__(self, data_source=PymatgenData(), fast=False):
+    def __init__(self, data_source=None, fast=False):
         """
 
         Args:
              data_source - (OxidationStateMixin) - A AbstractData class that supports
-                the `get_oxidation_state` method.
+                the `get_oxidation_state` method. Defaults to PymatgenData.
             fast - (boolean) whether to assume elements exist in a single oxidation state,
                 which can dramatically accelerate the calculation of whether an ionic compound
                 is possible, but will miss heterovalent compounds like Fe3O4.
         """
-        self.data_source = data_source
+        self.data_source = data_source or get_data_source("pymatgen")
         self.fast = fast
 
     def featurize(self, comp):
@@ -243,7 +247,7 @@ class ElectronAffinity(BaseFeaturizer):
     """
 
     def __init__(self):
-        self.data_source = DemlData()
+        self.data_source = get_data_source("deml")
 
     def featurize(self, comp):
         """
@@ -10,9 +10,7 @@ from pymatgen.core.molecular_orbitals import MolecularOrbitals
 
 from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.utils.stats import PropertyStats
-from matminer.utils.data import (
-    MagpieData,
-)
+from matminer.utils.data import get_data_source
 
 
 class AtomicOrbitals(BaseFeaturizer):
@@ -108,7 +106,7 @@ class ValenceOrbital(BaseFeaturizer):
     """
 
     def __init__(self, orbitals=("s", "p", "d", "f"), props=("avg", "frac")):
-        self.data_source = MagpieData()
+        self.data_source = get_data_source("magpie")
         self.orbitals = orbitals
         self.props = props
 
@@ -11,9 +11,7 @@ from sklearn.neighbors import NearestNeighbors
 
 from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.utils.stats import PropertyStats
-from matminer.utils.data import (
-    MagpieData,
-)
+from matminer.utils.data import get_data_source
 from matminer.featurizers.composition.element import ElementFraction
 
 
@@ -76,7 +74,7 @@ class AtomicPackingEfficiency(BaseFeaturizer):
         self._n_elems = len(self._el_frac.featurize(Composition("H")))
 
         # Tool for looking up radii
-        self._data_source = MagpieData()
+        self._data_source = get_data_source("magpie")
 
         # Lookup table of ideal radius ratios
         self.ideal_ratio = dict(
@@ -1,8 +1,12 @@
 import math
 import unittest
 
+import numpy as np
+from pymatgen.core import Composition
+
 from matminer.featurizers.composition.composite import Meredig, ElementProperty
 from matminer.featurizers.composition.tests.base import CompositionFeaturesTest
+from matminer.utils.caching import FeatureCache
 
 
 class CompositeFeaturesTest(CompositionFeaturesTest):
@@ -76,6 +80,30 @@ class CompositeFeaturesTest(CompositionFeaturesTest):
         self.assertAlmostEqual(df_val["frac s valence electrons"].iloc[0], 0.294117647)
         self.assertAlmostEqual(df_val["mean Number"].iloc[0], 15.2)
 
+    def test_featurize_many(self):
+        comps = [Composition("Fe2O3"), Composition("Al"), Composition("LiFePO4"), Composition("CsCl")]
+        for f in [ElementProperty.from_preset("magpie"), ElementProperty.from_preset("deml"), Meredig()]:
+            features = f.featurize_many(comps, pbar=False)
+            for comp, feats in zip(comps, features):
+                np.testing.assert_allclose(f.featurize(comp), feats, rtol=1e-10)
+
+        # Entries that cannot be featurized are handled like in featurize
+        ep = ElementProperty.from_preset("magpie")
+        features = ep.featurize_many([Composition("NaCl"), "NaCl"], ignore_errors=True, return_errors=True, pbar=False)
+        self.assertEqual(len(ep.feature_labels()) + 1, len(features[1]))
+        self.assertTrue(all(np.isnan(features[1][:-1])))
+        self.assertIn("AttributeError", features[1][-1])
+        self.assertTrue(np.isnan(features[0][-1]))
+        with self.assertRaises(AttributeError):
+            ep.featurize_many([Composition("NaCl"), "NaCl"], pbar=False)
+
+        # Compositions are looked up in the feature cache, if one is set
+        cache = FeatureCache()
+        ep.set_feature_cache(cache)
+        ep.featurize_many(comps + comps[:2], pbar=False)
+        self.assertEqual(2, cache.cache_info()["hits"])
+        self.assertEqual(4, cache.cache_info()["misses"])
+
     def test_fere_corr(self):
         df_fere_corr = ElementProperty(
             features=["FERE correction"],
@@ -38,6 +38,23 @@ class ElementFeaturesTest(CompositionFeaturesTest):
         self.assertAlmostEqual(df_band_center["band center"][0], 5.870418816395603)
         self.assertAlmostEqual(BandCenter().featurize(Composition("Ag33O500V200"))[0], 6.033480099340539)
 
+    def test_featurize_many(self):
+        comps = [Composition("Fe2O3"), Composition("Fe0.5O0.5"), Composition("Ag33O500V200"), Composition("Al")]
+        for f in [
+            Stoichiometry(),
+            Stoichiometry(p_list=None),
+            Stoichiometry(num_atoms=True),
+            ElementFraction(),
+            BandCenter(),
+        ]:
+            features = f.featurize_many(comps, pbar=False)
+            for comp, feats in zip(comps, features):
+                self.assertArrayAlmostEqual(f.featurize(comp), feats)
+
+        # Errors are raised by featurize
+        with self.assertRaises(ValueError):
+            Stoichiometry(p_list=[-1]).featurize_many(comps, pbar=False)
+
 
 if __name__ == "__main__":
     unittest.main()
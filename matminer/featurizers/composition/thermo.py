@@ -5,9 +5,7 @@ Composition featurizers for thermodynamic properties.
 from pymatgen.ext.matproj import MPRester
 
 from matminer.featurizers.base import BaseFeaturizer
-from matminer.utils.data import (
-    CohesiveEnergyData,
-)
+from matminer.utils.data import get_data_source
 
 
 class CohesiveEnergy(BaseFeaturizer):
@@ -53,7 +51,7 @@ class CohesiveEnergy(BaseFeaturizer):
         # Subtract elemental cohesive energies from formation energy
         cohesive_energy = -formation_energy_per_atom * comp.num_atoms
         for el in el_amt_dict:
-            cohesive_energy += el_amt_dict[el] * CohesiveEnergyData().get_elemental_property(el)
+            cohesive_energy += el_amt_dict[el] * get_data_source("cohesive_energy").get_elemental_property(el)
 
         cohesive_energy_per_atom = cohesive_energy / comp.num_atoms
 
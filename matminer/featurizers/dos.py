@@ -4,6 +4,7 @@ from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.composition import BandCenter
 from pymatgen.electronic_structure.core import Spin
 from pymatgen.electronic_structure.dos import CompleteDos, FermiDos
+from scipy.ndimage import gaussian_filter1d
 
 
 class SiteDOS(BaseFeaturizer):
@@ -513,39 +514,21 @@ def get_cbm_vbm_scores(dos, decay_length, sampling_resolution, gaussian_smear):
             .. character: (str) is the orbital character s, p, d, or f
             .. location: [(float)] fractional coordinates of the orbital
     """
-    cbm, vbm = dos.get_cbm_vbm(tol=0.01)
-    structure = dos.structure
-    sites = structure.sites
+    orbitals, cbm_scores, vbm_scores = _get_orbital_scores(
+        dos, dos.structure.sites, decay_length, sampling_resolution, gaussian_smear
+    )
 
     orbital_scores = []
-    for i in range(0, len(sites)):
-        site = sites[i]
-        proj = dos.get_site_spd_dos(site)
-        for orb in proj:
-            # calculate contribution
-            energies = [e for e in proj[orb].energies]
-            smear_dos = proj[orb].get_smeared_densities(gaussian_smear)
-            dos_up = smear_dos[Spin.up]
-            dos_down = smear_dos[Spin.down] if Spin.down in smear_dos else smear_dos[Spin.up]
-            dos_total = [sum(id) for id in zip(dos_up, dos_down)]
-            vbm_score = 0
-            vbm_space = np.linspace(vbm, vbm - (5.0 * decay_length), num=sampling_resolution)
-            for e in vbm_space:
-                vbm_score += np.interp(e, energies, dos_total) * np.exp(-(vbm - e) * decay_length)
-            cbm_score = 0
-            cbm_space = np.linspace(cbm, cbm + (5.0 * decay_length), num=sampling_resolution)
-            for e in cbm_space:
-                cbm_score += np.interp(e, energies, dos_total) * np.exp(-(e - cbm) * decay_length)
-
-            # add orbital scores to list
-            orbital_score = {
-                "cbm_score": cbm_score,
-                "vbm_score": vbm_score,
-                "specie": str(site.specie),
-                "character": str(orb),
-                "location": list(site.frac_coords),
-            }
-            orbital_scores.append(orbital_score)
+    for (site, orb), cbm_score, vbm_score in zip(orbitals, cbm_scores.tolist(), vbm_scores.tolist()):
+        # add orbital scores to list
+        orbital_score = {
+            "cbm_score": cbm_score,
+            "vbm_score": vbm_score,
+            "specie": str(site.specie),
+            "character": str(orb),
+            "location": list(site.frac_coords),
+        }
+        orbital_scores.append(orbital_score)
 
     # normalize by total contribution
     total_cbm = sum([orbital_scores[i]["cbm_score"] for i in range(0, len(orbital_scores))])
@@ -587,33 +570,12 @@ def get_site_dos_scores(dos, idx, decay_length, sampling_resolution, gaussian_sm
                 {cbm: {s: (float), ..., f: (float), total: (float)},
                  vbm: {s: (float), ..., f: (float), total: (float)}}
     """
-    cbm, vbm = dos.get_cbm_vbm(tol=0.01)
-    structure = dos.structure
-    site = structure.sites[idx]
-
     # calculate s/p/d/f dos for cbm and vbm
+    orbitals, cbm_scores, vbm_scores = _get_orbital_scores(
+        dos, [dos.structure.sites[idx]], decay_length, sampling_resolution, gaussian_smear
+    )
     orbital_scores = {}
-    proj = dos.get_site_spd_dos(site)
-    for orb in proj:
-
-        # smear dos for spin up and down
-        smear_dos = proj[orb].get_smeared_densities(gaussian_smear)
-        dos_up = smear_dos[Spin.up]
-        dos_down = smear_dos[Spin.down] if Spin.down in smear_dos else smear_dos[Spin.up]
-        dos_total = [sum(id) for id in zip(dos_up, dos_down)]
-
-        # determine energy range to sample
-        energies = [e for e in proj[orb].energies]
-        vbm_space = np.linspace(vbm, vbm - (5.0 * decay_length), num=sampling_resolution)
-        cbm_space = np.linspace(cbm, cbm + (5.0 * decay_length), num=sampling_resolution)
-
-        # accumulate dos score over energy range
-        vbm_score = 0
-        for e in vbm_space:
-            vbm_score += np.interp(e, energies, dos_total) * np.exp(-(vbm - e) * decay_length)
-        cbm_score = 0
-        for e in cbm_space:
-            cbm_score += np.interp(e, energies, dos_total) * np.exp(-(e - cbm) * decay_length)
+    for (_, orb), cbm_score, vbm_score in zip(orbitals, cbm_scores.tolist(), vbm_scores.tolist()):
         orbital_scores[str(orb)] = {"cbm": cbm_score, "vbm": vbm_score}
 
     # ensure that f-orbitals are represented as zero contribution if none
@@ -634,3 +596,94 @@ def get_site_dos_scores(dos, idx, decay_length, sampling_resolution, gaussian_sm
             reordered_scores[edge][orb] /= total_score
         reordered_scores[edge]["total"] = total_score
     return reordered_scores
+
+
+def _get_orbital_scores(dos, sites, decay_length, sampling_resolution, gaussian_smear):
+    """
+    Computes the contributions of the s/p/d/f orbitals of some sites to the
+    DOS near the conduction band minimum (CBM) and the valence band maximum
+    (VBM), before normalization. See get_cbm_vbm_scores for the method.
+
+    The smeared projected DOS of all orbitals are stacked in one array. As
+    the DOS is linearly interpolated at the sampled energies, the sampling
+    near each band edge is a weighted sum over the energies of the DOS, so
+    the scores of all orbitals are computed with one matrix product.
+
+    Args:
+        dos (CompleteDos): The density of states, with its structure
+        sites ([PeriodicSite]): Sites of the structure to score
+        decay_length (float in eV): see get_cbm_vbm_scores
+        sampling_resolution (int): see get_cbm_vbm_scores
+        gaussian_smear (float in eV): see get_cbm_vbm_scores
+
+    Returns:
+        orbitals ([(PeriodicSite, OrbitalType)]): site and orbital character
+            of each projection of the DOS
+        cbm_scores (np.ndarray): contribution of each projection to the CBM
+        vbm_scores (np.ndarray): contribution of each projection to the VBM
+    """
+    cbm, vbm = dos.get_cbm_vbm(tol=0.01)
+    energies = np.asarray(dos.energies, dtype=float)
+
+    # find the projected dos of the sites by identity first: looking a site
+    # up in dos.pdos compares it with every site of the same species
+    pdos_by_id = {id(site): pdos for site, pdos in dos.pdos.items()}
+
+    # stack the total (spin up + spin down) dos of each orbital character of
+    # each site, as in CompleteDos.get_site_spd_dos. without spin
+    # polarization, the spin up dos is counted twice
+    orbitals, densities = [], []
+    for site in sites:
+        site_pdos = pdos_by_id.get(id(site))
+        if site_pdos is None:
+            site_pdos = dos.pdos[site]
+        spd_dos = {}
+        for orb, pdos in site_pdos.items():
+            dos_up = pdos[Spin.up]
+            dos_total = np.add(dos_up, pdos[Spin.down] if Spin.down in pdos else dos_up)
+            orbital_type = getattr(orb, "orbital_type", orb)
+            spd_dos[orbital_type] = spd_dos[orbital_type] + dos_total if orbital_type in spd_dos else dos_total
+        for orb, dos_total in spd_dos.items():
+            orbitals.append((site, orb))
+            densities.append(dos_total)
+    if len(orbitals) == 0:
+        return orbitals, np.zeros(0), np.zeros(0)
+
+    # smear all orbitals at once, as in Dos.get_smeared_densities. the
+    # smearing is linear, so the spins can be summed first
+    avg_diff = np.sum(np.diff(energies)) / (len(energies) - 1)
+    dos_total = gaussian_filter1d(np.array(densities, dtype=float), gaussian_smear / avg_diff, axis=1)
+
+    # accumulate dos score over energy range
+    vbm_weights = _get_sampling_weights(energies, vbm, -1.0, decay_length, sampling_resolution)
+    cbm_weights = _get_sampling_weights(energies, cbm, 1.0, decay_length, sampling_resolution)
+    return orbitals, dos_total @ cbm_weights, dos_total @ vbm_weights
+
+
+def _get_sampling_weights(energies, edge, direction, decay_length, sampling_resolution):
+    """
+    Gets the weights of the energies of a DOS for sampling it near a band
+    edge, such that weights @ densities is the sum of
+    np.interp(e, energies, densities) * exp(-abs(e - edge) * decay_length)
+    over the sampled energies e.
+
+    Args:
+        energies (np.ndarray): energies of the DOS, in increasing order
+        edge (float): energy of the band edge
+        direction (float): 1.0 to sample above the edge, -1.0 below it
+        decay_length (float in eV): see get_cbm_vbm_scores
+        sampling_resolution (int): see get_cbm_vbm_scores
+
+    Returns:
+        (np.ndarray): weight of each energy of the DOS
+    """
+    space = np.linspace(edge, edge + direction * (5.0 * decay_length), num=sampling_resolution)
+    decay = np.exp(-(space - edge) * direction * decay_length)
+
+    # interpolate linearly between the two nearest energies, using the end
+    # values outside of the energy range as np.interp does
+    lower = np.clip(np.searchsorted(energies, space, side="right") - 1, 0, len(energies) - 2)
+    frac = np.clip((space - energies[lower]) / (energies[lower + 1] - energies[lower]), 0.0, 1.0)
+    return np.bincount(lower, weights=decay * (1.0 - frac), minlength=len(energies)) + np.bincount(
+        lower + 1, weights=decay * frac, minlength=len(energies)
+    )
@@ -2,7 +2,10 @@
 Site featurizers based on local chemical information, rather than geometry alone.
 """
 
+import warnings
+
 import numpy as np
+import pandas as pd
 from sklearn.utils.validation import check_is_fitted
 from pymatgen.core import Structure
 from pymatgen.core.periodic_table import Element
@@ -11,12 +14,16 @@ from pymatgen.analysis.local_env import (
     VoronoiNN,
 )
 import pymatgen.analysis.local_env
-from pymatgen.analysis.ewald import EwaldSummation
 
 
 from matminer.featurizers.base import BaseFeaturizer
-from matminer.utils.caching import get_nearest_neighbors
-from matminer.utils.data import MagpieData
+from matminer.utils.caching import (
+    get_all_nearest_neighbors,
+    get_ewald_site_energies,
+    get_nearest_neighbors,
+    get_structure_key,
+)
+from matminer.utils.data import get_data_source
 
 
 class ChemicalSRO(BaseFeaturizer):
@@ -89,8 +96,9 @@ class ChemicalSRO(BaseFeaturizer):
         those explicitly included (or excluded) in __init__. Only elements
         in the self.el_list_ will be featurized.
         Besides, compositions of the passed structures will also be "stored"
-        in a dict of self.el_amt_dict_, avoiding repeated calculation of
-        composition when featurizing multiple sites in the same structure.
+        in a dict of self.el_amt_dict_, keyed by `get_structure_key`, avoiding
+        repeated calculation of composition when featurizing multiple sites
+        in the same structure.
         Args:
             X (array-like): containing Pymatgen structures and sites, supports
                             multiple choices:
@@ -103,14 +111,17 @@ class ChemicalSRO(BaseFeaturizer):
         Returns:
             self
         """
-        structs = np.atleast_2d(X)[:, 0]
+        if isinstance(X, pd.DataFrame):
+            X = X.values
+        structs = [x[0] for x in X]
         if not all([isinstance(struct, Structure) for struct in structs]):
             raise TypeError("This fit requires an array-like input of Pymatgen " "Structures and sites!")
 
         self.el_amt_dict_ = {}
         el_set_ = set()
         for s in structs:
-            if str(s) not in self.el_amt_dict_.keys():
+            key = get_structure_key(s)
+            if key not in self.el_amt_dict_:
                 el_amt_ = s.composition.fractional_composition.get_el_amt_dict()
                 els_ = (
                     set(el_amt_.keys())
@@ -119,7 +130,7 @@ class ChemicalSRO(BaseFeaturizer):
                 )
                 els_ = els_ if self.excludes is None else els_ - set(self.excludes)
                 if els_:
-                    self.el_amt_dict_[str(s)] = el_amt_
+                    self.el_amt_dict_[key] = el_amt_
                 el_set_ = el_set_ | els_
         self.el_list_ = sorted(list(el_set_), key=lambda el: Element(el).mendeleev_no) if self.sort else list(el_set_)
         return self
@@ -134,19 +145,42 @@ class ChemicalSRO(BaseFeaturizer):
             (list of floats): Chemical SRO features for each element.
         """
 
+        return self.featurize_all_sites(struct, [idx])[0].tolist()
+
+    def featurize_all_sites(self, struct, indices=None):
+        """
+        Get CSRO features of many sites in a structure at once.
+
+        The composition of the structure is looked up once, and the
+        neighbors of all sites are taken from a single cached neighbor list.
+
+        Args:
+            struct (Structure): Pymatgen Structure object.
+            indices ([int]): Indices of the sites to featurize. If None,
+                all sites are featurized.
+        Returns:
+            (ndarray) Chemical SRO features, shape (n_sites, n_elements)
+        """
         check_is_fitted(self, ["el_amt_dict_", "el_list_"])
 
-        csro = [0.0] * len(self.el_list_)
-        if str(struct) in self.el_amt_dict_.keys():
-            el_amt = self.el_amt_dict_[str(struct)]
-            nn_el_amt = dict.fromkeys(el_amt, 0)
-            nn_list = self.nn.get_nn(struct, idx)
+        if indices is None:
+            indices = range(len(struct))
+        csro = np.zeros((len(indices), len(self.el_list_)))
+        el_amt = self.el_amt_dict_.get(get_structure_key(struct))
+        if el_amt is None:
+            return csro
+
+        columns = {el: i for i, el in enumerate(self.el_list_)}
+        all_nns = get_all_nearest_neighbors(self.nn, struct)
+        for i, idx in enumerate(indices):
+            nn_list = all_nns[idx]
             for nn in nn_list:
-                if str(nn.specie.symbol) in self.el_list_:
-                    nn_el_amt[str(nn.specie.symbol)] += 1 / len(nn_list)
-            for el in el_amt.keys():
-                if el in self.el_list_:
-                    csro[self.el_list_.index(el)] = nn_el_amt[el] - el_amt[el]
+                j = columns.get(str(nn["site"].specie.symbol))
+                if j is not None:
+                    csro[i, j] += 1 / len(nn_list)
+        for el, amt in el_amt.items():
+            if el in columns:
+                csro[:, columns[el]] -= amt
         return csro
 
     def feature_labels(self):
@@ -221,24 +255,23 @@ class EwaldSiteEnergy(BaseFeaturizer):
 
     User notes:
         - This class uses that `charges that are already-defined for the structure`.
-        - Ewald summations can be expensive. If you evaluating every site in many
-          large structures, run all of the sites for each structure at the same time.
-          We cache the Ewald result for the structure that was run last, so looping
-          over sites and then structures is faster than structures than sites.
+        - Ewald summations can be expensive. The Ewald result of each structure is
+          cached by the contents of the structure (see
+          `matminer.utils.caching.get_ewald_summation`) and shared with
+          `EwaldEnergy`, so all sites of a structure use one summation even if the
+          structure is a different object for each site. Use `featurize_all_sites`
+          to get the energies of many sites of a structure at once.
     Features:
         ewald_site_energy - Energy for the site computed from Coulombic interactions"""
 
-    def __init__(self, accuracy=None):
+    def __init__(self, accuracy=4):
         """
         Args:
-            accuracy (int): Accuracy of Ewald summation, number of decimal places
+            accuracy (int): Accuracy of Ewald summation, number of decimal places.
+                The default matches `EwaldEnergy`, so both share one summation
         """
         self.accuracy = accuracy
 
-        # Variables used then caching the Ewald result
-        self.__last_structure = None
-        self.__last_ewald = None
-
     def featurize(self, strc, idx):
         """
         Args:
@@ -248,15 +281,25 @@ class EwaldSiteEnergy(BaseFeaturizer):
             ([float]) - Electrostatic energy of the site
         """
 
-        # Check if the new input is the last
-        #  Note: We use 'is' rather than structure comparisons for speed
-        if strc is self.__last_structure:
-            ewald = self.__last_ewald
-        else:
-            self.__last_structure = strc
-            ewald = EwaldSummation(strc, acc_factor=self.accuracy)
-            self.__last_ewald = ewald
-        return [ewald.get_site_energy(idx)]
+        return [float(self.featurize_all_sites(strc, [idx])[0, 0])]
+
+    def featurize_all_sites(self, strc, indices=None):
+        """
+        Compute the electrostatic energies of many sites in a structure at once.
+
+        Args:
+            strc (Structure): Pymatgen Structure object.
+            indices ([int]): Indices of the sites to featurize. If None,
+                all sites are featurized.
+        Returns:
+            (ndarray) Electrostatic energy of each site, shape (n_sites, 1)
+        """
+        if abs(strc.charge) > 1e-8:
+            warnings.warn("Per atom energies for charged structures not supported in EwaldSummation")
+        site_energies = get_ewald_site_energies(strc, self.accuracy)
+        if indices is None:
+            indices = range(len(strc))
+        return site_energies[list(indices)].reshape(-1, 1)
 
     def feature_labels(self):
         return ["ewald_site_energy"]
@@ -309,7 +352,7 @@ class LocalPropertyDifference(BaseFeaturizer):
 
     def __init__(
         self,
-        data_source=MagpieData(),
+        data_source=None,
         weight="area",
         properties=("Electronegativity",),
         signed=False,
@@ -318,14 +361,14 @@ class LocalPropertyDifference(BaseFeaturizer):
 
         Args:
             data_source (AbstractData) - Class from which to retrieve
-                elemental properties
+                elemental properties. Defaults to MagpieData
             weight (str) - What aspect of each voronoi facet to use to
                 weigh each neighbor (see VoronoiNN)
             properties ([str]) - List of properties to use (default=['Electronegativity'])
             signed (bool) - whether to return absolute difference or signed difference of
                             properties(default=False (absolute difference))
         """
-        self.data_source = data_source
+        self.data_source = data_source or get_data_source("magpie")
         self.properties = properties
         self.weight = weight
         self.signed = signed
@@ -341,7 +384,7 @@ class LocalPropertyDifference(BaseFeaturizer):
 
         if preset == "ward-prb-2017":
             return LocalPropertyDifference(
-                data_source=MagpieData(),
+                data_source=get_data_source("magpie"),
                 properties=[
                     "Number",
                     "MendeleevNumber",
@@ -447,7 +490,7 @@ class SiteElementalProperty(BaseFeaturizer):
             data_source (AbstractData): Tool used to look up elemental properties
             properties ([string]): List of properties to use for features
         """
-        self.data_source = data_source or MagpieData()
+        self.data_source = data_source or get_data_source("magpie")
         self.properties = properties
         self._preset_citations = []
 
@@ -482,7 +525,7 @@ class SiteElementalProperty(BaseFeaturizer):
 
         if preset == "seko-prb-2017":
             output = SiteElementalProperty(
-                data_source=MagpieData(),
+                data_source=get_data_source("magpie"),
                 properties=[
                     "Number",
                     "AtomicWeight",
@@ -1,6 +1,7 @@
 """
 Site featurizers requiring external libraries for core functionality.
 """
+import numpy as np
 from monty.dev import requires
 from pymatgen.io.ase import AseAtomsAdaptor
 from sklearn.exceptions import NotFittedError
@@ -167,6 +168,29 @@ class SOAP(BaseFeaturizer):
         s_ase = self.adaptor.get_atoms(struct)
         return self.soap.create(s_ase, positions=[idx], n_jobs=self.n_jobs).tolist()[0]
 
+    def featurize_all_sites(self, struct, indices=None):
+        """
+        Compute the SOAP features of many sites in a structure with a single
+        call to DScribe.
+
+        Args:
+            struct (Structure): Pymatgen Structure object.
+            indices ([int]): Indices of the sites to featurize. If None,
+                all sites are featurized.
+        Returns:
+            (ndarray) SOAP features of each site, shape (n_sites, n_features)
+        """
+        self._check_fitted()
+        if indices is None:
+            indices = range(len(struct))
+        indices = list(indices)
+        if len(indices) == 0:
+            return np.zeros((0, self.length))
+        s_ase = self.adaptor.get_atoms(struct)
+        return np.array(self.soap.create(s_ase, positions=indices, n_jobs=self.n_jobs)).reshape(
+            len(indices), self.length
+        )
+
     def feature_labels(self):
         self._check_fitted()
         return [f"SOAP_{i}" for i in range(self.length)]
@@ -16,7 +16,12 @@ import pymatgen.analysis.local_env
 
 from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.utils.stats import PropertyStats
-from matminer.utils.caching import get_nearest_neighbors
+from matminer.utils.caching import (
+    get_all_neighbors,
+    get_nearest_neighbors,
+    get_nn_data,
+    get_structure_environments,
+)
 from pymatgen.analysis.chemenv.coordination_environments.coordination_geometry_finder import (
     LocalGeometryFinder,
 )
@@ -74,26 +79,68 @@ class AGNIFingerprints(BaseFeaturizer):
         # Get all neighbors of this site
         my_site = struct[idx]
         neighbors = struct.get_neighbors(my_site, self.cutoff)
-        sites = [n[0] for n in neighbors]
         dists = np.array([n[1] for n in neighbors])
 
         # If one of the features is direction-dependent, compute the :math:`(r_i - r_j) / r_{ij}`
+        disps = None
         if any([x in self.directions for x in ["x", "y", "z"]]):
-            disps = np.array([my_site.coords - s.coords for s in sites]) / dists[:, np.newaxis]
+            disps = np.array([my_site.coords - n[0].coords for n in neighbors]).reshape(-1, 3)
 
-        # Compute the cutoff function
-        cutoff_func = 0.5 * (np.cos(np.pi * dists / self.cutoff) + 1)
+        return self._compute_fingerprints(dists, disps, np.zeros(len(dists), dtype=int), 1)[0]
+
+    def featurize_all_sites(self, struct, indices=None):
+        """
+        Compute the fingerprints of many sites in a structure at once.
+
+        The neighbors of every site are found with a single neighbor search,
+        and the fingerprints of all sites are computed together.
+
+        Args:
+            struct (Structure): Pymatgen Structure object.
+            indices ([int]): Indices of the sites to featurize. If None,
+                all sites are featurized.
+        Returns:
+            (ndarray) Fingerprints, shape (n_sites, n_features)
+        """
+        if indices is None:
+            indices = range(len(struct))
+        all_neighbors = get_all_neighbors(struct, self.cutoff)
+        neighbors = [all_neighbors[i] for i in indices]
+
+        dists = np.array([n.nn_distance for nn in neighbors for n in nn])
+        owners = np.repeat(np.arange(len(neighbors)), [len(nn) for nn in neighbors])
+        disps = None
+        if any([x in self.directions for x in ["x", "y", "z"]]):
+            disps = np.array([struct[i].coords - n.coords for i, nn in zip(indices, neighbors) for n in nn]).reshape(
+                -1, 3
+            )
+        return self._compute_fingerprints(dists, disps, owners, len(neighbors))
+
+    def _compute_fingerprints(self, dists, disps, owners, n_sites):
+        """Compute the fingerprints given the neighbors of one or more sites
+
+        Args:
+            dists (ndarray): Distance to each neighbor
+            disps (ndarray): Displacement from each neighbor to its central
+                site, shape (n_neighbors, 3). Only needed for the
+                direction-resolved fingerprints
+            owners (ndarray): Index of the central site of each neighbor
+            n_sites (int): Number of central sites
+        Returns:
+            (ndarray) Fingerprints, shape (n_sites, n_features)
+        """
+        dists = np.asarray(dists, dtype=float)
+        etas = np.asarray(self.etas, dtype=float)
 
         # Compute "e^(r/eta) * cutoff_func" for each eta
-        windowed = np.zeros((len(dists), len(self.etas)))
-        for i, eta in enumerate(self.etas):
-            windowed[:, i] = np.multiply(np.exp(-1 * np.power(np.true_divide(dists, eta), 2)), cutoff_func)
+        cutoff_func = 0.5 * (np.cos(np.pi * dists / self.cutoff) + 1)
+        windowed = np.exp(-1 * np.power(dists[:, np.newaxis] / etas[np.newaxis, :], 2)) * cutoff_func[:, np.newaxis]
 
-        # Compute the fingerprints
+        # Compute the fingerprints, summing the contributions of the neighbors of each site
         output = []
         for d in self.directions:
             if d is None:
-                output.append(np.sum(windowed, axis=0))
+                contrib = windowed
             else:
                 if d == "x":
                     proj = [1.0, 0.0, 0.0]
@@ -103,7 +150,10 @@ class AGNIFingerprints(BaseFeaturizer):
                     proj = [0.0, 0.0, 1.0]
                 else:
                     raise Exception("Unrecognized direction")
-                output.append(np.sum(windowed * np.dot(disps, proj)[:, np.newaxis], axis=0))
+                contrib = windowed * (np.dot(disps, proj) / dists)[:, np.newaxis]
+            fingerprint = np.zeros((n_sites, len(etas)))
+            np.add.at(fingerprint, owners, contrib)
+            output.append(fingerprint)
 
         # Return the results
         return np.hstack(output)
@@ -217,6 +267,8 @@ class OPSiteFingerprint(BaseFeaturizer):
         neighbors = []
         r = 6
 
+        # The neighbors of a single site are listed in a different order than in
+        #  the neighbor list of all sites, and the order parameters depend on it
         while len(neighbors) < 12:
             r += 1.0
             neighbors = struct.get_neighbors(s, r)
@@ -453,7 +505,7 @@ class CrystalNNFingerprint(BaseFeaturizer):
             list of weighted order parameters of target site.
         """
 
-        nndata = self.cnn.get_nn_data(struct, idx)
+        nndata = get_nn_data(self.cnn, struct, idx)
         max_cn = sorted(self.op_types)[-1]
 
         cn_fingerprint = []
@@ -516,6 +568,27 @@ class CrystalNNFingerprint(BaseFeaturizer):
 
         return cn_fingerprint + chem_fingerprint
 
+    def featurize_all_sites(self, struct, indices=None):
+        """
+        Get the crystal fingerprints of many sites in a structure.
+
+        CrystalNN determines the neighbors of each site separately, so the
+        sites are fingerprinted one at a time. The neighbor data of all sites
+        are stored together in the neighbor cache and reused by later calls.
+
+        Args:
+            struct (Structure): Pymatgen Structure object.
+            indices ([int]): Indices of the sites to featurize. If None,
+                all sites are featurized.
+        Returns:
+            (ndarray) Fingerprints, shape (n_sites, n_features)
+        """
+        if indices is None:
+            indices = range(len(struct))
+        return np.array([self.featurize(struct, i) for i in indices], dtype=float).reshape(
+            len(indices), len(self.feature_labels())
+        )
+
     def feature_labels(self):
         labels = []
         max_cn = sorted(self.op_types)[-1]
@@ -718,6 +791,9 @@ class ChemEnvSiteFingerprint(BaseFeaturizer):
             to avoid negative values (i.e., all features are
             constrained to be between 0 and 1).
         max_dist_fac (float): maximum distance factor (default: 1.41).
+        use_symmetry (bool): whether to compute the environment of only one
+            site of each set of symmetrically-equivalent sites, and use it
+            for all sites in the set.
     """
 
     @staticmethod
@@ -820,12 +896,13 @@ class ChemEnvSiteFingerprint(BaseFeaturizer):
         else:
             raise RuntimeError("unknown neighbor-finding strategy preset.")
 
-    def __init__(self, cetypes, strategy, geom_finder, max_csm=8, max_dist_fac=1.41):
+    def __init__(self, cetypes, strategy, geom_finder, max_csm=8, max_dist_fac=1.41, use_symmetry=False):
         self.cetypes = tuple(cetypes)
         self.strat = strategy
         self.lgf = geom_finder
         self.max_csm = max_csm
         self.max_dist_fac = max_dist_fac
+        self.use_symmetry = use_symmetry
 
     def featurize(self, struct, idx):
         """
@@ -838,18 +915,38 @@ class ChemEnvSiteFingerprint(BaseFeaturizer):
             (numpy array): resemblance fraction of target site to ideal
                            local environments.
         """
-        cevals = []
-        self.lgf.setup_structure(structure=struct)
-        se = self.lgf.compute_structure_environments(only_indices=[idx], maximum_distance_factor=self.max_dist_fac)
-        for ce in self.cetypes:
-            try:
-                tmp = se.get_csms(idx, ce)
+        return self.featurize_all_sites(struct, [idx])[0]
+
+    def featurize_all_sites(self, struct, indices=None):
+        """
+        Get the ChemEnv fingerprints of many sites in a structure.
+
+        The structure environments of all sites are computed together, and
+        are stored in the neighbor cache so that later calls for other sites
+        of the same structure do not set up the local geometry finder again.
+
+        Args:
+            struct (Structure): Pymatgen Structure object.
+            indices ([int]): Indices of the sites to featurize. If None,
+                all sites are featurized.
+        Returns:
+            (ndarray) Fingerprints, shape (n_sites, n_features)
+        """
+        if indices is None:
+            indices = range(len(struct))
+        environments = get_structure_environments(
+            self.lgf, struct, indices, maximum_distance_factor=self.max_dist_fac, use_symmetry=self.use_symmetry
+        )
+        cevals = np.zeros((len(environments), len(self.cetypes)))
+        for i, (se, isite) in enumerate(environments):
+            for j, ce in enumerate(self.cetypes):
+                try:
+                    tmp = se.get_csms(isite, ce)
+                except IndexError:
+                    continue
                 tmp = tmp[0]["symmetry_measure"] if len(tmp) != 0 else self.max_csm
-                tmp = tmp if tmp < self.max_csm else self.max_csm
-                cevals.append(1 - tmp / self.max_csm)
-            except IndexError:
-                cevals.append(0)
-        return np.array(cevals)
+                cevals[i, j] = 1 - min(tmp, self.max_csm) / self.max_csm
+        return cevals
 
     def feature_labels(self):
         return list(self.cetypes)
@@ -16,7 +16,7 @@ import pymatgen.analysis.local_env
 
 from matminer.featurizers.utils.stats import PropertyStats
 from matminer.utils.caching import get_nearest_neighbors
-from matminer.utils.data import MagpieData
+from matminer.utils.data import get_data_source
 
 
 class IntersticeDistribution(BaseFeaturizer):
@@ -85,9 +85,9 @@ class IntersticeDistribution(BaseFeaturizer):
         nn_coords = np.array([nn["site"].coords for nn in n_w])
 
         # Get center atom's radius and its nearest neighbors' radii
-        center_r = MagpieData().get_elemental_properties([struct[idx].specie], self.radius_type)[0] / 100
+        center_r = get_data_source("magpie").get_elemental_properties([struct[idx].specie], self.radius_type)[0] / 100
         nn_els = [nn["site"].specie for nn in n_w]
-        nn_rs = np.array(MagpieData().get_elemental_properties(nn_els, self.radius_type)) / 100
+        nn_rs = np.array(get_data_source("magpie").get_elemental_properties(nn_els, self.radius_type)) / 100
 
         # Get indices of atoms forming the simplices of convex hull
         convex_hull_simplices = ConvexHull(nn_coords).simplices
@@ -296,9 +296,9 @@ class CoordinationNumber(BaseFeaturizer):
             [float] - Coordination number
         """
         if self.use_weights is None or self.use_weights == "none":
-            return [self.nn.get_cn(struct, idx, use_weights=False)]
+            return [self._get_cn(struct, idx, use_weights=False)]
         elif self.use_weights == "sum":
-            return [self.nn.get_cn(struct, idx, use_weights=True)]
+            return [self._get_cn(struct, idx, use_weights=True)]
         elif self.use_weights == "effective":
             # TODO: Should this weighting code go in pymatgen? I'm not sure if it even necessary to distinguish it from the 'sum' method -lw
             nns = get_nearest_neighbors(self.nn, struct, idx)
@@ -307,6 +307,28 @@ class CoordinationNumber(BaseFeaturizer):
         else:
             raise ValueError("Weighting method not recognized: " + str(self.use_weights))
 
+    def _get_cn(self, struct, idx, use_weights):
+        """Get the coordination number of a site from the shared neighbor list if possible
+
+        Args:
+            struct (Structure): Pymatgen Structure object.
+            idx (int): index of target site in structure struct.
+            use_weights (bool): Whether to sum the weights of the neighbors
+        Returns:
+            (float) coordination number, as computed by `self.nn.get_cn`
+        """
+        # get_cn resolves disordered sites first, see its `on_disorder` option
+        if struct.is_ordered:
+            try:
+                nns = get_nearest_neighbors(self.nn, struct, idx)
+            except (ValueError, RuntimeError):
+                # get_all_nn_info lacks the retries of get_nn_info for some
+                #  methods, e.g. the larger cutoffs of VoronoiNN
+                pass
+            else:
+                return sum(n["weight"] for n in nns) if use_weights else len(nns)
+        return self.nn.get_cn(struct, idx, use_weights=use_weights)
+
     def feature_labels(self):
         # TODO: Should names contain weighting scheme? -lw
         return ["CN_{}".format(self.nn.__class__.__name__)]
@@ -6,7 +6,11 @@ import numpy as np
 
 from matminer.featurizers.base import BaseFeaturizer
 from pymatgen.core import Structure
-from matminer.featurizers.utils.grdf import Gaussian, Histogram
+from matminer.featurizers.utils.grdf import Gaussian, Histogram, evaluate_functions
+from matminer.utils.caching import get_all_neighbors, get_neighbor_list
+
+# Maximum number of triplets of atoms for which GaussianSymmFunc computes the angular functions at once
+_MAX_TRIPLETS = 200000
 
 
 class GaussianSymmFunc(BaseFeaturizer):
@@ -136,33 +140,115 @@ class GaussianSymmFunc(BaseFeaturizer):
         Returns:
             (list of floats): Gaussian symmetry function features.
         """
-        gaussian_funcs = []
+        return self.featurize_all_sites(struct, [idx])[0].tolist()
+
+    def featurize_all_sites(self, struct, indices=None, dtype=float):
+        """
+        Get Gaussian symmetry function features of many sites in a structure.
 
-        # Get the neighbors within the cutoff
-        neighbors = struct.get_neighbors(struct[idx], self.cutoff)
+        The neighbors of all sites are found with a single neighbor search,
+        and the symmetry functions of all sites are computed together: the
+        triplets of a site and two of its neighbors are enumerated as arrays,
+        and all combinations of eta, zeta and gamma are evaluated at once.
+
+        Args:
+            struct (Structure): Pymatgen Structure object.
+            indices ([int]): Indices of the sites to featurize. If None,
+                all sites are featurized.
+            dtype (dtype): Data type of the output. The features are always
+                computed in double precision, use np.float32 to halve the
+                memory used by the output.
+        Returns:
+            (ndarray): Gaussian symmetry function features, shape (n_sites, n_features).
+        """
+        if indices is None:
+            indices = range(len(struct))
+        sites, inverse = np.unique(np.arange(len(struct))[list(indices)], return_inverse=True)
+
+        # Get the pairs of a featurized site and a neighbor, sorted by site,
+        #  and number the featurized sites from 0
+        centers, neighbors, images, distances = get_neighbor_list(struct, self.cutoff)
+        position = np.full(len(struct), -1)
+        position[sites] = np.arange(len(sites))
+        keep = np.flatnonzero(position[centers] >= 0)
+        keep = keep[np.argsort(position[centers[keep]], kind="stable")]
+        centers, distances = position[centers[keep]], distances[keep]
 
         # Get coordinates of the neighbors, relative to the central atom
-        neigh_coords = np.subtract([neigh[0].coords for neigh in neighbors], struct[idx].coords)
+        neigh_coords = struct.lattice.get_cartesian_coords(struct.frac_coords[neighbors[keep]] + images[keep])
+        neigh_coords -= struct.cart_coords[sites][centers]
 
-        # Get the distances for later use
-        neigh_dists = np.array([neigh[1] for neigh in neighbors])
+        features = np.zeros((len(sites), len(self.feature_labels())))
 
         # Compute all G2
-        for eta_g2 in self.etas_g2:
-            gaussian_funcs.append(self.g2(eta_g2, neigh_dists, self.cutoff))
-
-        # Compute all G4s
-        gaussian_funcs.extend(
-            GaussianSymmFunc.g4(
-                self.etas_g4,
-                self.zetas_g4,
-                self.gammas_g4,
-                neigh_dists,
-                neigh_coords,
-                self.cutoff,
+        etas_g2 = np.array(self.etas_g2, dtype=float)[:, None]
+        ridges = np.exp(-etas_g2 * (distances ** 2.0) / (self.cutoff ** 2.0)) * self.cosine_cutoff(distances, self.cutoff)
+        for i, ridge in enumerate(ridges):
+            features[:, i] = np.bincount(centers, weights=ridge, minlength=len(sites))
+
+        # Compute all G4s, for blocks of sites to limit the number of triplets held in memory
+        n_neighbors = np.bincount(centers, minlength=len(sites))
+        n_triplets = n_neighbors * (n_neighbors - 1) // 2
+        first_pair = np.cumsum(n_neighbors) - n_neighbors
+        start = 0
+        while start < len(sites):
+            stop = start + max(np.searchsorted(np.cumsum(n_triplets[start:]), _MAX_TRIPLETS, side="right"), 1)
+            pairs = slice(first_pair[start], first_pair[stop - 1] + n_neighbors[stop - 1])
+            features[start:stop, len(self.etas_g2) :] = self._g4_all_sites(
+                centers[pairs] - start, distances[pairs], neigh_coords[pairs], stop - start
             )
+            start = stop
+
+        return features[inverse].astype(dtype, copy=False)
+
+    def _g4_all_sites(self, centers, neigh_dist, neigh_coords, n_sites):
+        """
+        Compute the Gaussian angular symmetry functions of many sites.
+
+        Gives the same result as `g4` for each site, with all triplets of a site
+        and two of its neighbors (j < k) handled as arrays.
+
+        Args:
+            centers (ndarray): Central site of each neighbor, in increasing order
+                from 0 to n_sites - 1
+            neigh_dist (ndarray): Distance from the central site to each neighbor
+            neigh_coords (ndarray): Coordinates of each neighbor, with respect
+                to its central site
+            n_sites (int): Number of central sites
+        Returns:
+            (ndarray) G4 for all combinations of eta, zeta, gamma of each site,
+                shape (n_sites, n_combinations)
+        """
+        # Pair each neighbor j with the neighbors k that follow it around the same central site
+        n_neighbors = np.bincount(centers, minlength=n_sites)
+        first = (np.cumsum(n_neighbors) - n_neighbors)[centers]
+        n_following = (first + n_neighbors[centers]) - np.arange(len(centers)) - 1
+        j = np.repeat(np.arange(len(centers)), n_following)
+        k = j + 1 + np.arange(len(j)) - np.repeat(np.cumsum(n_following) - n_following, n_following)
+
+        # Compute the distances and cosine of each triplet
+        r_ij, r_ik = neigh_dist[j], neigh_dist[k]
+        r_jk = np.linalg.norm(neigh_coords[k] - neigh_coords[j], 2, axis=1)
+        cos_theta = np.einsum("ij,ij->i", neigh_coords[k], neigh_coords[j]) / r_ij / r_ik
+
+        # Compute the cutoff function (independent of eta/zeta/gamma)
+        cutoff_fun = (
+            self.cosine_cutoff(r_ij, self.cutoff)
+            * self.cosine_cutoff(r_ik, self.cutoff)
+            * self.cosine_cutoff(r_jk, self.cutoff)
         )
-        return gaussian_funcs
+
+        # Compute the g4 for each combination of eta/zeta/gamma, with axes (eta, zeta, gamma, triplet)
+        etas = np.array(self.etas_g4, dtype=float)[:, None, None, None]
+        zetas = np.array(self.zetas_g4, dtype=float)[None, :, None, None]
+        gammas = np.array(self.gammas_g4, dtype=float)[None, None, :, None]
+        eta_term = np.exp(-etas * (r_ij ** 2.0 + r_ik ** 2.0 + r_jk ** 2.0) / (self.cutoff ** 2.0)) * cutoff_fun
+        terms = (1.0 + gammas * cos_theta) ** zetas * eta_term * 2.0 ** (1.0 - zetas)
+
+        output = np.zeros((n_sites, terms.shape[0] * terms.shape[1] * terms.shape[2]))
+        for ind, term in enumerate(terms.reshape(output.shape[1], -1)):
+            output[:, ind] = np.bincount(centers[j], weights=term, minlength=n_sites)
+        return output
 
     def feature_labels(self):
         return ["G2_{}".format(eta_g2) for eta_g2 in self.etas_g2] + [
@@ -280,37 +366,78 @@ class GeneralizedRadialDistributionFunction(BaseFeaturizer):
         if not struct.is_ordered:
             raise ValueError("Disordered structure support not built yet")
 
-        # Get list of neighbors by site
-        # Indexing is [site#][neighbor#][pymatgen Site, distance, site index]
-        sites = struct._sites
-        central_site = sites[idx]
-        neighbors_lst = struct.get_neighbors(central_site, self.cutoff, include_index=True)
-        sites = range(0, len(sites))
+        # Get the pairs of sites within the cutoff of the central site
+        idx = range(len(struct))[idx]
+        centers, neighbors, _, distances = get_neighbor_list(struct, self.cutoff)
+        is_central = centers == idx
+
+        return self._featurize_pairs(
+            np.zeros(is_central.sum(), dtype=int), neighbors[is_central], distances[is_central], 1, len(struct)
+        )[0].tolist()
+
+    def featurize_all_sites(self, struct, indices=None):
+        """
+        Get the GRDF of many sites in a structure.
 
-        # Generate lists of pairwise distances according to run mode
+        The neighbors of all sites are found with a single neighbor search,
+        and the GRDFs of all sites are computed together.
+
+        Args:
+            struct (Structure): Pymatgen Structure object.
+            indices ([int]): Indices of the sites to featurize. If None,
+                all sites are featurized.
+        Returns:
+            (ndarray) GRDF of each site, shape (n_sites, n_features)
+        """
+        if not struct.is_ordered:
+            raise ValueError("Disordered structure support not built yet")
+
+        if indices is None:
+            indices = range(len(struct))
+        sites, inverse = np.unique(np.arange(len(struct))[list(indices)], return_inverse=True)
+
+        # Keep the pairs of sites whose central site is featurized, and number the central sites from 0
+        centers, neighbors, _, distances = get_neighbor_list(struct, self.cutoff)
+        position = np.full(len(struct), -1)
+        position[sites] = np.arange(len(sites))
+        keep = position[centers] >= 0
+
+        features = self._featurize_pairs(
+            position[centers[keep]], neighbors[keep], distances[keep], len(sites), len(struct)
+        )
+        return features[inverse].reshape(len(inverse), -1)
+
+    def _featurize_pairs(self, centers, neighbors, distances, n_centers, n_sites):
+        """
+        Compute the GRDF of many sites given the pairs of sites within the cutoff.
+
+        Args:
+            centers (ndarray): Central site of each pair, from 0 to n_centers - 1
+            neighbors (ndarray): Index of the neighbor of each pair in the structure
+            distances (ndarray): Distance between the sites of each pair
+            n_centers (int): Number of central sites
+            n_sites (int): Number of sites in the structure
+        Returns:
+            (ndarray) GRDF of each central site, shape (n_centers, n_features).
+                See `featurize` for the order of the features
+        """
+        # Group the pairs according to run mode
         if self.mode == "GRDF":
-            # Make a single distance collection
-            distance_collection = [[neighbor[1] for neighbor in neighbors_lst]]
+            # Make a single group per central site
+            groups, n_groups = centers, n_centers
         else:
-            # Make pairwise distance collections for pairwise GRDF
-            distance_collection = [
-                [neighbor[1] for neighbor in neighbors_lst if neighbor[2] == site_idx] for site_idx in sites
-            ]
-
-        # compute bin counts for each list of pairwise distances
-        bin_counts = []
-        for values in distance_collection:
-            bin_counts.append([sum(bin(values)) for bin in self.bins])
+            # Make a group per pair of central site and site for pairwise GRDF
+            groups, n_groups = centers * n_sites + neighbors, n_centers * n_sites
 
-        # Compute "volume" of each bin to normalize GRDFs
-        volumes = [bin.volume(self.cutoff) for bin in self.bins]
+        # compute the bin counts of each group of pairwise distances
+        values = evaluate_functions(self.bins, distances)
+        bin_counts = np.zeros((n_groups, len(self.bins)))
+        for i, bin_values in enumerate(values):
+            bin_counts[:, i] = np.bincount(groups, weights=bin_values, minlength=n_groups)
 
         # normalize the bin counts by the bin volume to compute features
-        features = []
-        for values in bin_counts:
-            features.extend(np.array(values) / np.array(volumes))
-
-        return features
+        volumes = np.array([bin.volume(self.cutoff) for bin in self.bins])
+        return (bin_counts / volumes).reshape(n_centers, -1)
 
     def feature_labels(self):
         if self.mode == "GRDF":
@@ -415,48 +542,28 @@ class AngularFourierSeries(BaseFeaturizer):
             raise ValueError("Disordered structure support not built yet")
 
         # Generate list of neighbor position vectors (relative to central
-        # atom) and distances from each central site as tuples
-        sites = struct._sites
-        central_site = sites[idx]
-        neighbors_lst = struct.get_neighbors(central_site, self.cutoff)
-        neighbor_collection = [(neighbor[0].coords - central_site.coords, neighbor[1]) for neighbor in neighbors_lst]
-
-        # Generate exhaustive permutations of neighbor pairs around each
-        # central site (order matters). Does not allow repeat elements (i.e.
-        # there are two distinct sites in every permutation)
-        neighbor_tuples = itertools.permutations(neighbor_collection, 2)
-
-        # Generate cos(theta) between neighbor pairs for each central site.
-        # Also, retain data on neighbor distances for each pair
-        # process with matrix algebra, we really need the speed here
-        data = np.array(list(neighbor_tuples))
-        v1, v2 = np.vstack(data[:, 0, 0]), np.vstack(data[:, 1, 0])
-        distances = data[:, :, 1]
-        neighbor_pairs = np.concatenate(
-            [
-                np.clip(
-                    np.einsum("ij,ij->i", v1, v2) / np.linalg.norm(v1, axis=1) / np.linalg.norm(v2, axis=1),
-                    -1.0,
-                    1.0,
-                ).reshape(-1, 1),
-                distances,
-            ],
-            axis=1,
+        # atom) and distances from the central site
+        idx = range(len(struct))[idx]
+        centers, neighbors, images, distances = get_neighbor_list(struct, self.cutoff)
+        is_central = centers == idx
+        neighbor_coords = struct.lattice.get_cartesian_coords(
+            struct.frac_coords[neighbors[is_central]] + images[is_central]
         )
+        vectors = neighbor_coords - struct.cart_coords[idx]
+        distances = distances[is_central]
 
-        # Generate distance functional matrix (g_n, g_n')
-        bin_combos = list(itertools.product(self.bins, repeat=2))
+        # Generate cos(theta) between all pairs of distinct neighbors (order
+        # matters), as a matrix rather than a list of neighbor pairs
+        unit_vectors = vectors / np.linalg.norm(vectors, axis=1)[:, None]
+        cos_angles = np.clip(unit_vectors @ unit_vectors.T, -1.0, 1.0)
+        np.fill_diagonal(cos_angles, 0)
 
-        # Compute AFS values for each element of the bin matrix
-        # need to cast arrays as floats to use np.exp
-        cos_angles, dist1, dist2 = (
-            neighbor_pairs[:, 0].astype(float),
-            neighbor_pairs[:, 1].astype(float),
-            neighbor_pairs[:, 2].astype(float),
-        )
-        features = [sum(combo[0](dist1) * combo[1](dist2) * cos_angles) for combo in bin_combos]
+        # Compute AFS values for each element of the bin matrix (g_n, g_n'),
+        # which is the sum over pairs of neighbors of g_n(r_1) * g_n'(r_2) * cos(theta)
+        bin_values = evaluate_functions(self.bins, distances)
+        features = bin_values @ cos_angles @ bin_values.T
 
-        return features
+        return features.ravel().tolist()
 
     def feature_labels(self):
         bin_combos = list(itertools.product(self.bins, repeat=2))
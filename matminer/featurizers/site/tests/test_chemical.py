@@ -10,6 +10,8 @@ from matminer.featurizers.site.chemical import (
     SiteElementalProperty,
 )
 from matminer.featurizers.site.tests.base import SiteFeaturizerTest
+from matminer.featurizers.structure.misc import EwaldEnergy
+from matminer.utils.caching import get_ewald_cache
 
 
 class ChemicalSiteTests(SiteFeaturizerTest):
@@ -74,6 +76,21 @@ class ChemicalSiteTests(SiteFeaturizerTest):
         self.assertAlmostEqual(vnn_csros[0][0], 0.071428571428571286)
         self.assertAlmostEqual(vnn_csros[0][1], -0.071428571428571286)
 
+    def test_chemicalSRO_all_sites(self):
+        s = self.cscl.copy()
+        s.make_supercell([2, 1, 1])
+        vnn = ChemicalSRO.from_preset("VoronoiNN")
+        vnn.fit([[s, 0], [s.copy(), 1]])
+        self.assertEqual(1, len(vnn.el_amt_dict_))
+        csros = vnn.featurize_all_sites(s)
+        self.assertEqual((4, 2), csros.shape)
+        for i in range(len(s)):
+            self.assertArrayAlmostEqual(csros[i], vnn.featurize(s, i))
+        self.assertArrayAlmostEqual([0.071428571428571286, -0.071428571428571286], csros[0])
+
+        # Structures not seen in fit have no CSRO
+        self.assertArrayAlmostEqual([0, 0], vnn.featurize(self.cscl, 0))
+
     def test_ewald_site(self):
         ewald = EwaldSiteEnergy(accuracy=4)
 
@@ -93,6 +110,21 @@ class ChemicalSiteTests(SiteFeaturizerTest):
         #  This is to test the caching feature
         self.assertArrayAlmostEqual(ewald.featurize(self.sc, 0), [0])
 
+        # All sites at once, from one summation shared by copies of the structure and EwaldEnergy
+        get_ewald_cache().cache_clear()
+        energies = ewald.featurize_all_sites(self.cscl)
+        self.assertEqual((2, 1), energies.shape)
+        self.assertArrayAlmostEqual(energies[1], ewald.featurize(self.cscl.copy(), 1))
+        self.assertAlmostEqual(EwaldEnergy(accuracy=4, per_atom=False).featurize(self.cscl)[0], energies.sum(), 6)
+        self.assertEqual(1, get_ewald_cache().cache_info().misses)
+
+        # The default accuracies share a summation, and None uses the pymatgen default
+        self.assertAlmostEqual(EwaldSiteEnergy().featurize(self.cscl, 0)[0], energies[0, 0])
+        self.assertAlmostEqual(EwaldEnergy().featurize(self.cscl)[0] * 2, energies.sum(), 6)
+        self.assertEqual(1, get_ewald_cache().cache_info().misses)
+        self.assertAlmostEqual(EwaldSiteEnergy(accuracy=None).featurize(self.cscl, 0)[0], energies[0, 0], 3)
+        self.assertEqual(2, get_ewald_cache().cache_info().misses)
+
     def test_local_prop_diff(self):
         f = LocalPropertyDifference()
 
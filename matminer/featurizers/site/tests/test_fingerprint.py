@@ -2,6 +2,7 @@ import unittest
 
 import numpy as np
 import pandas as pd
+from pymatgen.core import Lattice, Structure
 from pymatgen.util.testing import PymatgenTest
 
 from matminer.featurizers.site.fingerprint import (
@@ -12,6 +13,7 @@ from matminer.featurizers.site.fingerprint import (
     ChemEnvSiteFingerprint,
 )
 from matminer.featurizers.site.tests.base import SiteFeaturizerTest
+from matminer.utils.caching import get_nn_cache
 
 
 class FingerprintTests(SiteFeaturizerTest):
@@ -86,6 +88,24 @@ class FingerprintTests(SiteFeaturizerTest):
             site1[8],
         )
 
+    def test_featurize_all_sites(self):
+        agni = AGNIFingerprints(directions=[None, "x", "y", "z"], cutoff=4)
+        for struct in [self.sc, self.cscl, self.ni3al]:
+            features = agni.featurize_all_sites(struct)
+            self.assertEqual((len(struct), len(agni.feature_labels())), features.shape)
+            for i in range(len(struct)):
+                self.assertArrayAlmostEqual(agni.featurize(struct, i), features[i])
+
+        # Only a subset of the sites
+        features = agni.featurize_all_sites(self.ni3al, [3, 1])
+        self.assertArrayAlmostEqual(agni.featurize(self.ni3al, 3), features[0])
+        self.assertArrayAlmostEqual(agni.featurize(self.ni3al, 1), features[1])
+
+        cnnfp = CrystalNNFingerprint.from_preset("cn")
+        features = cnnfp.featurize_all_sites(self.cscl)
+        self.assertEqual((2, len(cnnfp.feature_labels())), features.shape)
+        self.assertArrayAlmostEqual(cnnfp.featurize(self.cscl, 1), features[1])
+
     def test_dataframe(self):
         data = pd.DataFrame({"strc": [self.cscl, self.cscl, self.sc], "site": [0, 1, 0]})
 
@@ -153,6 +173,18 @@ class FingerprintTests(SiteFeaturizerTest):
             places=7,
         )
 
+        # Rutile has many neighbors at tied distances, for which the order parameters
+        #  depend on the order given by Structure.get_neighbors
+        rutile = Structure.from_spacegroup(
+            "P4_2/mnm", Lattice.tetragonal(4.59, 2.96), ["Ti", "O"], [[0, 0, 0], [0.305, 0.305, 0]]
+        )
+        opsf = OPSiteFingerprint()
+        ops = opsf.featurize(rutile, 0)
+        self.assertArrayAlmostEqual(ops[17:24], [0.2035, 0.9515, 0.4945, 0.0005, 0.0005, 0.2125, 0.8285])
+        ops = opsf.featurize(rutile, 2)
+        self.assertArrayAlmostEqual(ops[6:14], [0.5855, 0.2775, 0.3695, 0.2935, 0.1635, 0.4405, 0.2935, 0.2195])
+        self.assertArrayAlmostEqual(ops[33:], [0.6085, 0.1325, 0.1335, 0.1875])
+
         # The following test aims at ensuring the copying of the OP dictionaries work.
         opsfp = OPSiteFingerprint()
         cnnfp = CrystalNNFingerprint.from_preset("ops")
@@ -296,6 +328,19 @@ class FingerprintTests(SiteFeaturizerTest):
         self.assertAlmostEqual(cevals[l.index("C:8")], 0.9953721, places=7)
         self.assertAlmostEqual(cevals[l.index("O:6")], 0, places=7)
 
+        # The environments of all sites are computed once and reused
+        s = self.cscl.copy()
+        s.make_supercell([1, 1, 2])
+        get_nn_cache().cache_clear()
+        all_sites = cefp.featurize_all_sites(s)
+        self.assertEqual((4, 66), all_sites.shape)
+        self.assertArrayAlmostEqual(all_sites[0], cevals)
+        self.assertArrayAlmostEqual(all_sites[2], cefp.featurize(s, 2))
+        self.assertEqual(1, get_nn_cache().cache_info().misses)
+        cefp.use_symmetry = True
+        get_nn_cache().cache_clear()
+        self.assertArrayAlmostEqual(all_sites, cefp.featurize_all_sites(s))
+
     def test_voronoifingerprint(self):
         df_sc = pd.DataFrame({"struct": [self.sc], "site": [0]})
         vorofp = VoronoiFingerprint(use_symm_weights=True)
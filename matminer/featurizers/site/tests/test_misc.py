@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 from pymatgen.core import Structure, Lattice
 from pymatgen.analysis.local_env import VoronoiNN, JmolNN, CrystalNN
@@ -122,6 +123,10 @@ class MiscSiteTests(SiteFeaturizerTest):
         self.assertAlmostEqual(cnj.featurize(self.cscl, 0)[0], 8)
         self.assertAlmostEqual(cnj.featurize(self.cscl, 1)[0], 8)
         self.assertEqual(len(cnj.citations()), 1)
+        disordered = self.cscl.copy()
+        disordered.replace(0, {"Cs": 0.6, "K": 0.4})
+        self.assertAlmostEqual(cnj.featurize(disordered, 0)[0], jmnn.get_cn(disordered, 0))
+        self.assertAlmostEqual(cnj.featurize(disordered, 1)[0], 8)
         cnmd = CoordinationNumber.from_preset("MinimumDistanceNN")
         self.assertEqual(cnmd.feature_labels()[0], "CN_MinimumDistanceNN")
         self.assertAlmostEqual(cnmd.featurize(self.sc, 0)[0], 6)
@@ -143,6 +148,13 @@ class MiscSiteTests(SiteFeaturizerTest):
         self.assertEqual(len(cnmvire.implementors()), 2)
         self.assertEqual(cnmvire.implementors()[0], "Nils E. R. Zimmermann")
 
+        # Distorted cells where VoronoiNN needs a larger cutoff for some sites
+        nacl = Structure.from_spacegroup("Fm-3m", Lattice.cubic(5.69), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+        rng = np.random.default_rng(3)
+        nacl = Structure(nacl.lattice, nacl.species, nacl.frac_coords + rng.normal(0, 0.01, (len(nacl), 3)))
+        self.assertAlmostEqual(CoordinationNumber(VoronoiNN()).featurize(nacl, 0)[0], 16)
+        self.assertAlmostEqual(CoordinationNumber(VoronoiNN(), use_weights="sum").featurize(nacl, 0)[0], 5.7229738)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -26,6 +27,35 @@ class RDFTests(SiteFeaturizerTest):
         self.assertAlmostEqual(gsfs["G4_0.005_4.0_1.0"][0], 1.1810690738596332)
         self.assertAlmostEqual(gsfs["G4_0.005_4.0_-1.0"][0], 0.033850556557100071)
 
+    def test_featurize_all_sites(self):
+        gsf = GaussianSymmFunc()
+        features = gsf.featurize_all_sites(self.cscl)
+        self.assertEqual((2, 8), features.shape)
+        for i in range(2):
+            self.assertArrayAlmostEqual(gsf.featurize(self.cscl, i), features[i])
+
+        # Compare with the symmetry functions of each site, computing the G4s in several blocks of sites
+        s = self.ni3al.copy()
+        s.make_supercell([2, 1, 1])
+        s.perturb(0.1)
+        gsf = GaussianSymmFunc(cutoff=5)
+        with patch("matminer.featurizers.site.rdf._MAX_TRIPLETS", 500):
+            features = gsf.featurize_all_sites(s, [3, 0, 3], dtype=np.float32)
+        self.assertEqual(np.float32, features.dtype)
+        for i, idx in enumerate([3, 0, 3]):
+            neighbors = s.get_neighbors(s[idx], 5)
+            neigh_coords = np.array([n.coords for n in neighbors]) - s[idx].coords
+            neigh_dists = np.array([n.nn_distance for n in neighbors])
+            expected = [gsf.g2(eta, neigh_dists, 5) for eta in gsf.etas_g2]
+            expected.extend(gsf.g4(gsf.etas_g4, gsf.zetas_g4, gsf.gammas_g4, neigh_dists, neigh_coords, 5))
+            np.testing.assert_allclose(features[i], expected, rtol=1e-6)
+
+        for mode in ["GRDF", "pairwise_GRDF"]:
+            grdf = GeneralizedRadialDistributionFunction.from_preset("gaussian", cutoff=5, mode=mode)
+            features = grdf.featurize_all_sites(self.ni3al, [0, 2])
+            self.assertArrayAlmostEqual(grdf.featurize(self.ni3al, 0), features[0])
+            self.assertArrayAlmostEqual(grdf.featurize(self.ni3al, 2), features[1])
+
     def test_grdf(self):
         f1 = Gaussian(1, 0)
         f2 = Gaussian(1, 1)
@@ -3,7 +3,7 @@ Structure featurizers based on bonding.
 """
 import itertools
 import warnings
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from functools import lru_cache
 
 import numpy as np
@@ -14,14 +14,12 @@ from pymatgen.analysis import bond_valence
 from pymatgen.analysis.local_env import ValenceIonicRadiusEvaluator
 from pymatgen.analysis.local_env import VoronoiNN
 from pymatgen.core.periodic_table import Specie, Element
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
-from pymatgen.symmetry.structure import SymmetrizedStructure
 import pymatgen.analysis.local_env as pmg_le
 
 from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.utils.stats import PropertyStats
-from matminer.utils.caching import get_all_nearest_neighbors
-from matminer.utils.data import IUCrBondValenceData
+from matminer.utils.caching import get_all_nearest_neighbors, get_symmetrized_structure
+from matminer.utils.data import get_data_source
 from matminer.featurizers.structure.matrix import SineCoulombMatrix
 
 
@@ -147,22 +145,25 @@ class BondFractions(BaseFeaturizer):
         Args:
             X (Series/list): An iterable of pymatgen Structure
                 objects which will be used to determine the allowed bond
-                types.
+                types. May be a generator, which is read only once.
             y : unused (added for consistency with overridden method signature)
 
         Returns:
             self
 
         """
-        if not hasattr(X, "__getitem__"):
+        if not hasattr(X, "__iter__") or isinstance(X, Structure):
             raise ValueError("X must be an iterable of pymatgen Structures")
 
         X = X.values if isinstance(X, pd.Series) else X
 
-        if not all([isinstance(x, Structure) for x in X]):
-            raise ValueError("Each structure must be a pymatgen Structure " "object.")
+        def check_structures(structures):
+            for s in structures:
+                if not isinstance(s, Structure):
+                    raise ValueError("Each structure must be a pymatgen Structure " "object.")
+                yield s
 
-        sanitized = self._sanitize_bonds(self.enumerate_all_bonds(X))
+        sanitized = self._sanitize_bonds(self.enumerate_all_bonds(check_structures(X)))
 
         if self.allowed_bonds is None:
             self.fitted_bonds_ = sanitized
@@ -188,7 +189,7 @@ class BondFractions(BaseFeaturizer):
             A list of bond types in 'Li-O' form, where the order of the
             elements in each bond type is alphabetic.
         """
-        els = s.composition.elements
+        els = s.types_of_species
         het_bonds = list(itertools.combinations(els, 2))
         het_bonds = [tuple(sorted([str(i) for i in j])) for j in het_bonds]
         hom_bonds = [(str(el), str(el)) for el in els]
@@ -207,12 +208,9 @@ class BondFractions(BaseFeaturizer):
             A tuple of unique, possible bond types for an entire list of
             structures. This tuple is used to form the unified feature labels.
         """
-        bond_types = []
+        bond_types = set()
         for s in structures:
-            bts = self.enumerate_bonds(s)
-            for bt in bts:
-                if bt not in bond_types:
-                    bond_types.append(bt)
+            bond_types.update(self.enumerate_bonds(s))
         return tuple(sorted(bond_types))
 
     def featurize(self, s):
@@ -527,23 +525,19 @@ class BagofBonds(BaseFeaturizer):
         Args:
             X (Series/list): An iterable of pymatgen Structure
                 objects which will be used to determine the allowed bond
-                types and bag lengths.
+                types and bag lengths. May be a generator, which is read
+                only once.
             y : unused (added for consistency with overridden method signature)
 
         Returns:
             self
         """
-        unpadded_bobs = [self.bag(s, return_baglens=True) for s in X]
-        bonds = [list(bob.keys()) for bob in unpadded_bobs]
-        bonds = np.unique(sum(bonds, []))
-        baglens = [0] * len(bonds)
-
-        for i, bond in enumerate(bonds):
-            for bob in unpadded_bobs:
-                if bond in bob:
-                    baglen = bob[bond]
-                    baglens[i] = max((baglens[i], baglen))
-        self.bag_lens = dict(zip(bonds, baglens))
+        # Keep the longest length of each bag, so X can be a generator that is only read once
+        bag_lens = {}
+        for s in X:
+            for bond, baglen in self.bag(s, return_baglens=True).items():
+                bag_lens[bond] = max(bag_lens.get(bond, 0), baglen)
+        self.bag_lens = {bond: bag_lens[bond] for bond in sorted(bag_lens)}
         # Sort the bags by bag length, with the shortest coming first.
         self.ordered_bonds = [b[0] for b in sorted(self.bag_lens.items(), key=lambda bl: bl[1])]
         return self
@@ -567,43 +561,44 @@ class BagofBonds(BaseFeaturizer):
                 Site objects representing bonds or sites, and the values are the
                 Coulomb matrix values for that bag.
         """
-        sites = s.sites
-        nsites = len(sites)
-        bonds = np.zeros((nsites, nsites), dtype=object)
-        for i, si in enumerate(sites):
-            for j, sj in enumerate(sites):
-                el0, el1 = si.specie, sj.specie
-                if isinstance(el0, Specie):
-                    el0 = el0.element
-                if isinstance(el1, Specie):
-                    el1 = el1.element
-                if i == j:
-                    bonds[i, j] = (el0,)
-                else:
-                    bonds[i, j] = tuple(sorted((el0, el1)))
+        elements = [site.specie.element if isinstance(site.specie, Specie) else site.specie for site in s.sites]
 
         if return_baglens:
-            bags = {b: 0 for b in np.unique(bonds)}
-        else:
-            cm = self.coulomb_matrix.featurize(s)[0]
-            bags = {b: [] for b in np.unique(bonds)}
-
-        for i in range(nsites):
-            for j in range(nsites):
-                bond = bonds[i, j]
-                if return_baglens:
-                    # Only return length of bag
-                    bags[bond] = bags[bond] + 1
+            # The length of each bag follows from the number of sites of each element
+            counts = Counter(elements)
+            bags = {(el,): n for el, n in counts.items()}
+            for el_a, el_b in itertools.combinations_with_replacement(sorted(counts), 2):
+                if el_a == el_b:
+                    if counts[el_a] > 1:
+                        bags[(el_a, el_b)] = counts[el_a] * (counts[el_a] - 1)
                 else:
-                    # Calculate bond "strength"
-                    cmval = cm[i, j]
-                    bags[bond].append(cmval)
-
-        if return_baglens:
-            return bags
-        else:
-            # We must sort the magnitude of bonds in each bag
-            return {bond: sorted(bags[bond]) for bond in bags}
+                    bags[(el_a, el_b)] = 2 * counts[el_a] * counts[el_b]
+            return {bond: bags[bond] for bond in sorted(bags)}
+
+        # Label each pair of sites with the code of its bond type, and each site with the code of its element
+        unique_elements = sorted(set(elements))
+        n_elements = len(unique_elements)
+        el_codes = np.array([unique_elements.index(el) for el in elements], dtype=int)
+        codes = np.minimum.outer(el_codes, el_codes) * n_elements + np.maximum.outer(el_codes, el_codes)
+        np.fill_diagonal(codes, n_elements ** 2 + el_codes)
+        codes = codes.ravel()
+
+        def code_to_bond(code):
+            if code >= n_elements ** 2:
+                return (unique_elements[code - n_elements ** 2],)
+            return (unique_elements[code // n_elements], unique_elements[code % n_elements])
+
+        # Sort the Coulomb matrix values by bond type, then by magnitude
+        cm = np.asarray(self.coulomb_matrix.featurize(s)[0]).ravel()
+        order = np.lexsort((cm, codes))
+        sorted_codes, sorted_vals = codes[order], cm[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        bags = {
+            code_to_bond(sorted_codes[start]): vals.tolist()
+            for start, vals in zip(starts, np.split(sorted_vals, starts[1:]))
+        }
+
+        return {bond: bags[bond] for bond in sorted(bags)}
 
     def featurize(self, s):
         """
@@ -624,7 +619,7 @@ class BagofBonds(BaseFeaturizer):
         padded_bob = {bag: [0.0] * int(length) for bag, length in self.bag_lens.items()}
 
         for bond in unpadded_bob:
-            if bond not in list(self.bag_lens.keys()):
+            if bond not in self.bag_lens:
                 raise ValueError("{} is not in the fitted " "bonds/sites!".format(bond))
             baglen_s = len(unpadded_bob[bond])
             baglen_fit = self.bag_lens[bond]
@@ -717,7 +712,7 @@ class GlobalInstabilityIndex(BaseFeaturizer):
 
     def __init__(self, r_cut=4.0, disordered_pymatgen=False):
 
-        bv = IUCrBondValenceData()
+        bv = get_data_source("iucr_bond_valence")
         self.bv_values = bv.params
         self.r_cut = r_cut
         self.disordered_pymatgen = disordered_pymatgen
@@ -804,12 +799,7 @@ class GlobalInstabilityIndex(BaseFeaturizer):
 
     def get_equiv_sites(self, s, site):
         """Find identical sites from analyzing space group symmetry."""
-        sga = SpacegroupAnalyzer(s, symprec=0.01)
-        sg = sga.get_space_group_operations
-        sym_data = sga.get_symmetry_dataset()
-        equiv_atoms = sym_data["equivalent_atoms"]
-        wyckoffs = sym_data["wyckoffs"]
-        sym_struct = SymmetrizedStructure(s, sg, equiv_atoms, wyckoffs)
+        sym_struct = get_symmetrized_structure(s, symprec=0.01)
         equivs = sym_struct.find_equivalent_sites(site)
         return equivs
 
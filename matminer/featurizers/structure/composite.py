@@ -12,6 +12,7 @@ from pymatgen.core import Structure, Lattice
 
 from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.structure.order import DensityFeatures
+from matminer.utils.caching import get_neighbor_list
 
 
 class JarvisCFID(BaseFeaturizer):
@@ -469,18 +470,25 @@ class JarvisCFID(BaseFeaturizer):
             (float) max-cutoff in Angstroms to ensure all the element
                 combinations are included
         """
-        neighbors_lst = structure.get_all_neighbors(cutoff)
+        centers, neighbors, _, distances = get_neighbor_list(structure, cutoff)
         comb = self._element_combinations(structure=structure)
+
+        # Label each pair of sites with the types of its species
+        species = [str(site.specie) for site in structure]
+        names = sorted(set(species))
+        site_types = np.array([names.index(sp) for sp in species], dtype=int)
+        pair_types = site_types[centers] * len(names) + site_types[neighbors]
+
         info = {}
         for c in comb:
-            for i, ii in enumerate(neighbors_lst):
-                for j in ii:
-                    comb1 = str(structure[i].specie) + str("-") + str(j[0].specie)
-                    comb2 = str(j[0].specie) + str("-") + str(structure[i].specie)
-                    if comb1 == c or comb2 == c:
-                        info.setdefault(c, []).append(j[1])
-        for i in info.items():
-            i[1].sort()
+            matches = [
+                i * len(names) + j
+                for i, j in itertools.product(range(len(names)), repeat=2)
+                if names[i] + "-" + names[j] == c or names[j] + "-" + names[i] == c
+            ]
+            dists = np.sort(distances[np.isin(pair_types, matches)])
+            if len(dists) > 0:
+                info[c] = dists.tolist()
         cut_off = {}
         for i, j in info.items():
             cut_off[i] = self._flatten(arr=j, tol=0.1)
@@ -515,15 +523,13 @@ class JarvisCFID(BaseFeaturizer):
                dist (np.array): The distribution
                scaled_dist (np.array): The scaled distribution
         """
-        neighbors_lst = structure.get_all_neighbors(cutoff)
-        mapper = map(lambda x: [itemgetter(1)(e) for e in x], neighbors_lst)
-        all_distances = np.concatenate(tuple(mapper))
+        all_distances = get_neighbor_list(structure, cutoff)[3]
         binrng = np.arange(0, cutoff + intvl, intvl)
         # equivalent to bond-order
         dist_hist, dist_bins = np.histogram(all_distances, bins=binrng, density=False)
         shell_vol = 4.0 / 3.0 * math.pi * (np.power(dist_bins[1:], 3) - np.power(dist_bins[:-1], 3))
         number_density = structure.num_sites / structure.volume
-        rdf = dist_hist / shell_vol / number_density / len(neighbors_lst)
+        rdf = dist_hist / shell_vol / number_density / len(structure)
         bins = dist_bins[:-1]
         dist = [round(i, 4) for i in rdf]
         scaled_dist = dist_hist / float(len(structure))
@@ -8,10 +8,10 @@ import scipy.constants as const
 from sklearn.exceptions import NotFittedError
 from pymatgen.core import Structure
 from pymatgen.core.periodic_table import Element
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 import pymatgen.analysis.local_env as pmg_le
 
 from matminer.featurizers.base import BaseFeaturizer
+from matminer.utils.caching import get_symmetrized_structure
 
 ANG_TO_BOHR = const.value("Angstrom star") / const.value("Bohr radius")
 
@@ -53,16 +53,16 @@ class CoulombMatrix(BaseFeaturizer):
         Fit the Coulomb Matrix to a list of structures.
 
         Args:
-            X ([Structure]): A list of pymatgen structures.
+            X ([Structure]): A list of pymatgen structures, or a generator
+                of structures which is read only once.
             y : unused (added for consistency with overridden method signature)
 
         Returns:
             self
         """
         if self.flatten:
-            n_sites = [structure.num_sites for structure in X]
             # CM makes sites x sites matrix; max eigvals for n x n matrix is n
-            self._max_eigs = max(n_sites)
+            self._max_eigs = max(structure.num_sites for structure in X)
         return self
 
     def featurize(self, s):
@@ -76,24 +76,19 @@ class CoulombMatrix(BaseFeaturizer):
             m: (Nsites x Nsites matrix) Coulomb matrix.
         """
         self._check_fitted()
-        m = np.zeros((s.num_sites, s.num_sites))
         atomic_numbers = []
         for site in s.sites:
             if isinstance(site.specie, Element):
                 atomic_numbers.append(site.specie.Z)
             else:
                 atomic_numbers.append(site.specie.element.Z)
-        for i in range(s.num_sites):
-            for j in range(s.num_sites):
-                if i == j:
-                    if self.diag_elems:
-                        m[i, j] = 0.5 * atomic_numbers[i] ** 2.4
-                    else:
-                        m[i, j] = 0
-                else:
-                    d = s.get_distance(i, j) * ANG_TO_BOHR
-                    m[i, j] = atomic_numbers[i] * atomic_numbers[j] / d
-        cm = np.array(m)
+        atomic_numbers = np.array(atomic_numbers, dtype=float)
+
+        # Distances between all pairs of sites (nearest images for periodic structures)
+        d = np.array(s.distance_matrix) * ANG_TO_BOHR
+        np.fill_diagonal(d, 1)
+        cm = np.outer(atomic_numbers, atomic_numbers) / d
+        np.fill_diagonal(cm, 0.5 * atomic_numbers ** 2.4 if self.diag_elems else 0)
 
         if self.flatten:
             eigs, _ = np.linalg.eig(cm)
@@ -163,15 +158,15 @@ class SineCoulombMatrix(BaseFeaturizer):
         Fit the Sine Coulomb Matrix to a list of structures.
 
         Args:
-            X ([Structure]): A list of pymatgen structures.
+            X ([Structure]): A list of pymatgen structures, or a generator
+                of structures which is read only once.
             y : unused (added for consistency with overridden method signature)
 
         Returns:
             self
         """
         if self.flatten:
-            nsites = [structure.num_sites for structure in X]
-            self._max_eigs = max(nsites)
+            self._max_eigs = max(structure.num_sites for structure in X)
         return self
 
     def featurize(self, s):
@@ -185,22 +180,17 @@ class SineCoulombMatrix(BaseFeaturizer):
         self._check_fitted()
         sites = s.sites
         atomic_numbers = np.array([site.specie.Z for site in sites])
-        sin_mat = np.zeros((len(sites), len(sites)))
         coords = np.array([site.frac_coords for site in sites])
         lattice = s.lattice.matrix
 
-        for i in range(len(sin_mat)):
-            for j in range(len(sin_mat)):
-                if i == j:
-                    if self.diag_elems:
-                        sin_mat[i][i] = 0.5 * atomic_numbers[i] ** 2.4
-                elif i < j:
-                    vec = coords[i] - coords[j]
-                    coord_vec = np.sin(np.pi * vec) ** 2
-                    trig_dist = np.linalg.norm((np.matrix(coord_vec) * lattice).A1) * ANG_TO_BOHR
-                    sin_mat[i][j] = atomic_numbers[i] * atomic_numbers[j] / trig_dist
-                else:
-                    sin_mat[i][j] = sin_mat[j][i]
+        # Periodic "distance" between all pairs of sites
+        vec = coords[:, None, :] - coords[None, :, :]
+        coord_vec = np.sin(np.pi * vec) ** 2
+        trig_dist = np.linalg.norm(coord_vec @ lattice, axis=2) * ANG_TO_BOHR
+        np.fill_diagonal(trig_dist, 1)
+        sin_mat = np.outer(atomic_numbers, atomic_numbers) / trig_dist
+        np.fill_diagonal(sin_mat, 0.5 * atomic_numbers ** 2.4 if self.diag_elems else 0)
+
         if self.flatten:
             eigs, _ = np.linalg.eig(sin_mat)
             zeros = np.zeros((self._max_eigs,))
@@ -394,7 +384,7 @@ class OrbitalFieldMatrix(BaseFeaturizer):
         ofms = []
         vnn = pmg_le.VoronoiNN(allow_pathological=True)
         if symm:
-            symm_struct = SpacegroupAnalyzer(struct).get_symmetrized_structure()
+            symm_struct = get_symmetrized_structure(struct)
             indices = [lst[0] for lst in symm_struct.equivalent_indices]
             counts = [len(lst) for lst in symm_struct.equivalent_indices]
         else:
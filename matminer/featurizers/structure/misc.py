@@ -3,11 +3,13 @@ Miscellaneous structure featurizers.
 """
 
 import numpy as np
+import pandas as pd
 from scipy.stats import gaussian_kde
+from tqdm.auto import tqdm
 from pymatgen.analysis.diffraction.xrd import XRDCalculator
-from pymatgen.analysis.ewald import EwaldSummation
 
-from matminer.featurizers.base import BaseFeaturizer
+from matminer.featurizers.base import BaseFeaturizer, get_profile
+from matminer.utils.caching import get_ewald_summation
 
 
 class EwaldEnergy(BaseFeaturizer):
@@ -35,8 +37,8 @@ class EwaldEnergy(BaseFeaturizer):
         Returns:
             ([float]) - Electrostatic energy of the structure
         """
-        # Compute the total energy
-        ewald = EwaldSummation(strc, acc_factor=self.accuracy)
+        # Compute the total energy, sharing the summation with EwaldSiteEnergy
+        ewald = get_ewald_summation(strc, self.accuracy)
         return [ewald.total_energy / len(strc)] if self.per_atom else [ewald.total_energy]
 
     def feature_labels(self):
@@ -107,9 +109,27 @@ class XRDPowderPattern(BaseFeaturizer):
     """
     1D array representing powder diffraction of a structure as calculated by
     pymatgen. The powder is smeared / normalized according to gaussian_kde.
+
+    Each peak is weighted by the integer part of its intensity, and the
+    pattern is the weighted sum of the peaks broadened with a Gaussian (the
+    kernel density estimate of `scipy.stats.gaussian_kde`), a Lorentzian, or
+    a pseudo-Voigt profile of the same width. The broadened peaks are
+    evaluated directly on the output grid, and `featurize_many` broadens the
+    patterns of many structures at once.
     """
 
-    def __init__(self, two_theta_range=(0, 127), bw_method=0.05, pattern_length=None, **kwargs):
+    # Number of patterns broadened at a time by broaden_peaks
+    _block_size = 256
+
+    def __init__(
+        self,
+        two_theta_range=(0, 127),
+        bw_method=0.05,
+        pattern_length=None,
+        peak_shape="gaussian",
+        voigt_fraction=0.5,
+        **kwargs,
+    ):
         """
         Initialize the featurizer.
 
@@ -118,30 +138,183 @@ class XRDPowderPattern(BaseFeaturizer):
                 two_thetas to calculate in degrees. Defaults to (0, 90). Set to
                 None if you want all diffracted beams within the limiting
                 sphere of radius 2 / wavelength.
-            bw_method (float): how much to smear the XRD pattern
+            bw_method (float or str): how much to smear the XRD pattern, as
+                the bandwidth factor of gaussian_kde (a float, "scott" or
+                "silverman"). A callable is passed to gaussian_kde, and only
+                supports Gaussian peaks.
             pattern_length (float): length of final array; defaults to one value
              per degree (i.e. two_theta_range + 1)
+            peak_shape (str): shape of the broadened peaks: "gaussian",
+                "lorentzian" or "pseudo-voigt". Lorentzian peaks have the same
+                full width at half maximum as the Gaussian peaks.
+            voigt_fraction (float): fraction of the Lorentzian component of
+                pseudo-Voigt peaks
             **kwargs: any other arguments to pass into pymatgen's XRDCalculator,
                 such as the type of radiation.
         """
+        if peak_shape not in ("gaussian", "lorentzian", "pseudo-voigt"):
+            raise ValueError("Unknown peak shape: {}".format(peak_shape))
         self.two_theta_range = two_theta_range
         self.bw_method = bw_method
         self.pattern_length = pattern_length or two_theta_range[1] - two_theta_range[0] + 1
+        self.peak_shape = peak_shape
+        self.voigt_fraction = voigt_fraction
         self.xrd_calc = XRDCalculator(**kwargs)
 
     def featurize(self, strc):
+        positions, weights = self.get_peaks(strc)
+        if callable(self.bw_method):
+            hist = np.repeat(positions, weights.astype(int))
+            kernel = gaussian_kde(hist, bw_method=self.bw_method)
+            return kernel(np.linspace(self.two_theta_range[0], self.two_theta_range[1], self.pattern_length))
+
+        y, success = self.broaden_peaks([(positions, weights)])
+        if not success[0]:
+            raise ValueError("Pattern needs at least two distinct peaks with intensity of at least 1 to be smeared")
+        return y[0]
+
+    def get_peaks(self, strc):
+        """Compute the diffraction peaks of a structure
+
+        Args:
+            strc (Structure): Structure to analyze
+        Returns:
+            positions (ndarray): two theta of each peak, in degrees
+            weights (ndarray): weight of each peak, the integer part of its intensity
+        """
         pattern = self.xrd_calc.get_pattern(strc, two_theta_range=self.two_theta_range)
-        x, y = pattern.x, pattern.y
-        hist = []
-        for x1, y1 in zip(x, y):
-            num = int(y1)
-            hist += [x1] * num
+        return np.asarray(pattern.x, dtype=float), np.floor(np.asarray(pattern.y, dtype=float))
+
+    def broaden_peaks(self, peaks):
+        """Smear the diffraction peaks of many patterns onto the output grid
 
-        kernel = gaussian_kde(hist, bw_method=self.bw_method)
-        x = np.linspace(self.two_theta_range[0], self.two_theta_range[1], self.pattern_length)
-        y = kernel(x)
+        Args:
+            peaks ([(ndarray, ndarray)]): positions and weights of the peaks of
+                each pattern, as computed by `get_peaks`
+        Returns:
+            patterns (ndarray): smeared patterns, shape (n_patterns, pattern_length)
+            success (ndarray): whether each pattern could be smeared. Patterns
+                with fewer than two distinct peaks of non-zero weight cannot.
+        """
+        if callable(self.bw_method):
+            raise ValueError("Broadening many patterns at once requires a float or str bw_method")
+        grid = np.linspace(self.two_theta_range[0], self.two_theta_range[1], self.pattern_length)
+        patterns = np.full((len(peaks), self.pattern_length), np.nan)
+        success = np.zeros(len(peaks), dtype=bool)
+
+        for start in range(0, len(peaks), self._block_size):
+            block = peaks[start : start + self._block_size]
+
+            # Pad the peaks of each pattern with zero-weight peaks
+            n_peaks = max([len(x) for x, _ in block] + [1])
+            positions = np.zeros((len(block), n_peaks))
+            weights = np.zeros((len(block), n_peaks))
+            for i, (x, w) in enumerate(block):
+                positions[i, : len(x)] = x
+                weights[i, : len(w)] = w
+
+            with np.errstate(all="ignore"):
+                # Width of the peaks, as computed by gaussian_kde for the samples
+                #  obtained by repeating each peak as many times as its weight
+                n_samples = weights.sum(axis=1)
+                fractions = weights / n_samples[:, None]
+                mean = (fractions * positions).sum(axis=1)
+                variance = (weights * (positions - mean[:, None]) ** 2).sum(axis=1) / (n_samples - 1)
+                sigma = self._bandwidth_factor(n_samples) * np.sqrt(variance)
+                ok = np.logical_and(n_samples >= 2, variance > 0)
+                sigma[~ok] = 1
+
+                profiles = self._peak_profiles(grid[None, None, :] - positions[:, :, None], sigma[:, None, None])
+                patterns[start : start + len(block)] = np.einsum("ij,ijk->ik", fractions, profiles)
+            patterns[start : start + len(block)][~ok] = np.nan
+            success[start : start + len(block)] = ok
+        return patterns, success
+
+    def _bandwidth_factor(self, n_samples):
+        """Get the factor that multiplies the standard deviation of the samples to give the peak width
 
-        return y
+        Args:
+            n_samples (ndarray): number of samples in each pattern
+        Returns:
+            (ndarray) bandwidth factor of each pattern
+        """
+        if self.bw_method == "scott":
+            return np.power(n_samples, -1.0 / 5)
+        elif self.bw_method == "silverman":
+            return np.power(n_samples * 3.0 / 4.0, -1.0 / 5)
+        elif isinstance(self.bw_method, str):
+            raise ValueError("Unknown bw_method: {}".format(self.bw_method))
+        return np.full(np.shape(n_samples), float(self.bw_method))
+
+    def _peak_profiles(self, dx, sigma):
+        """Evaluate normalized peak profiles
+
+        Args:
+            dx (ndarray): distance from the center of the peak
+            sigma (ndarray): standard deviation of the Gaussian peak
+        Returns:
+            (ndarray) profile values
+        """
+        if self.peak_shape == "gaussian":
+            return self._gaussian(dx, sigma)
+        # Half width at half maximum of a Gaussian with the same full width at half maximum
+        gamma = np.sqrt(2 * np.log(2)) * sigma
+        lorentzian = gamma / (np.pi * (dx ** 2 + gamma ** 2))
+        if self.peak_shape == "lorentzian":
+            return lorentzian
+        return self.voigt_fraction * lorentzian + (1 - self.voigt_fraction) * self._gaussian(dx, sigma)
+
+    @staticmethod
+    def _gaussian(dx, sigma):
+        return np.exp(-0.5 * (dx / sigma) ** 2) / (np.sqrt(2 * np.pi) * sigma)
+
+    def featurize_many(self, entries, ignore_errors=False, return_errors=False, pbar=True):
+        """
+        Compute the XRD patterns of many structures.
+
+        The diffraction peaks of each structure are computed with the same
+        XRDCalculator, and all patterns are then smeared with a few array
+        operations. Structures whose peaks cannot be smeared are featurized
+        with `featurize`, so errors are reported as by
+        `BaseFeaturizer.featurize_many`. Uses the default implementation if
+        featurizing in parallel, with a feature cache, while a
+        `FeaturizationProfile` is active, or with a callable bw_method.
+
+        See `BaseFeaturizer.featurize_many` for the arguments.
+        """
+        if (
+            self.n_jobs != 1
+            or self.feature_cache is not None
+            or get_profile() is not None
+            or callable(self.bw_method)
+            or not isinstance(entries, (tuple, list, np.ndarray, pd.Series, pd.DataFrame))
+            or len(entries) == 0
+        ):
+            return super().featurize_many(entries, ignore_errors, return_errors, pbar)
+        if return_errors and not ignore_errors:
+            raise ValueError("Please set ignore_errors to True to use" " return_errors.")
+
+        if isinstance(entries, pd.DataFrame):
+            entries = entries.values
+        elif isinstance(entries, pd.Series) or not isinstance(entries[0], (tuple, list, np.ndarray)):
+            entries = [(x,) for x in entries]
+
+        # Compute the peaks, leaving entries that fail to `featurize_wrapper`
+        peaks = []
+        for x in tqdm(entries, desc=self.__class__.__name__, disable=not pbar):
+            try:
+                peaks.append(self.get_peaks(*x))
+            except Exception:
+                peaks.append((np.zeros(0), np.zeros(0)))
+        patterns, success = self.broaden_peaks(peaks)
+
+        output = []
+        for x, pattern, ok in zip(entries, patterns, success):
+            if ok:
+                output.append(list(pattern) + [float("nan")] if return_errors else pattern)
+            else:
+                output.append(self.featurize_wrapper(x, return_errors=return_errors, ignore_errors=ignore_errors))
+        return output
 
     def feature_labels(self):
         return ["xrd_{}".format(x) for x in range(self.pattern_length)]
@@ -7,10 +7,9 @@ import math
 import numpy as np
 from pymatgen.core import Structure
 from pymatgen.analysis.local_env import VoronoiNN
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 
 from matminer.featurizers.base import BaseFeaturizer
-from matminer.utils.caching import get_all_nearest_neighbors
+from matminer.utils.caching import get_all_nearest_neighbors, get_symmetrized_structure
 
 
 class DensityFeatures(BaseFeaturizer):
@@ -265,8 +264,7 @@ class StructuralComplexity(BaseFeaturizer):
     def featurize(self, struct):
         n_of_atoms = len(struct.sites)
 
-        sga = SpacegroupAnalyzer(struct, symprec=self.symprec)
-        sym_s = sga.get_symmetrized_structure()
+        sym_s = get_symmetrized_structure(struct, symprec=self.symprec)
 
         v = n_of_atoms
         iG = 0
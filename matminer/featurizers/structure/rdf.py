@@ -3,17 +3,15 @@ Structure featurizers implementing radial distribution functions.
 """
 import math
 import itertools
-from operator import itemgetter
-from copy import copy
 
 import numpy as np
 from pymatgen.core import Structure
 from pymatgen.analysis.local_env import ValenceIonicRadiusEvaluator
-from pymatgen.core.periodic_table import Specie, Element
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+from pymatgen.core.periodic_table import Element
 
 from matminer.featurizers.base import BaseFeaturizer
 from matminer.featurizers.utils.oxidation import has_oxidation_states
+from matminer.utils.caching import get_neighbor_list, get_primitive_structure
 
 
 class RadialDistributionFunction(BaseFeaturizer):
@@ -63,12 +61,11 @@ class RadialDistributionFunction(BaseFeaturizer):
             raise ValueError("Disordered structure support not built yet")
 
         # Get the distances between all atoms
-        neighbors_lst = s.get_all_neighbors(self.cutoff)
-        all_distances = np.concatenate(tuple(map(lambda x: [itemgetter(1)(e) for e in x], neighbors_lst)))
+        distances = get_neighbor_list(s, self.cutoff)[3]
 
         # Compute a histogram
         dist_hist, dist_bins = np.histogram(
-            all_distances,
+            distances,
             bins=np.arange(0, self.cutoff + self.bin_size, self.bin_size),
             density=False,
         )
@@ -152,7 +149,7 @@ class PartialRadialDistributionFunction(BaseFeaturizer):
 
         # Get all of elements that appaer
         for strc in X:
-            elements.update([e.element if isinstance(e, Specie) else e for e in strc.composition.keys()])
+            elements.update(strc.composition.element_composition.elements)
 
         # Remove the elements excluded by the user
         elements.difference_update([Element(e) for e in self.exclude_elems])
@@ -200,43 +197,26 @@ class PartialRadialDistributionFunction(BaseFeaturizer):
             prdf - dict, where the keys is a pair of elements (strings),
                 and the value is the radial distribution function for those paris of elements
         """
-        # Get the composition of the array
-        s = copy(s)
-        s.remove_oxidation_states()
-        composition = s.composition.fractional_composition.to_reduced_dict
-
-        # Get the distances between all atoms
-        neighbors_lst = s.get_all_neighbors(self.cutoff)
-
-        # Sort neighbors by type
-        distances_by_type = {}
-        for p in itertools.product(composition.keys(), composition.keys()):
-            distances_by_type[p] = []
+        # Get the composition of the array, ignoring oxidation states
+        composition = s.composition.element_composition.fractional_composition.to_reduced_dict
+        elements = list(composition.keys())
 
         def get_symbol(site):
             return site.specie.symbol if isinstance(site.specie, Element) else site.specie.element.symbol
 
-        for site, nlst in zip(s.sites, neighbors_lst):  # Each list is a list for each site
-            my_elem = get_symbol(site)
-
-            for neighbor in nlst:
-                rij = neighbor[1]
-                n_elem = get_symbol(neighbor[0])
-                # LW 3May17: Any better ideas than appending each element at a time?
-                distances_by_type[(my_elem, n_elem)].append(rij)
+        # Get the distances between all atoms, and label each pair of atoms by the types of its elements
+        centers, neighbors, _, distances = get_neighbor_list(s, self.cutoff)
+        site_types = np.array([elements.index(get_symbol(site)) for site in s.sites], dtype=int)
+        pair_types = site_types[centers] * len(elements) + site_types[neighbors]
 
         # Compute and normalize the prdfs
         prdf = {}
         dist_bins = self._make_bins()
         shell_volume = 4.0 / 3.0 * math.pi * (np.power(dist_bins[1:], 3) - np.power(dist_bins[:-1], 3))
-        for key, distances in distances_by_type.items():
-            # Compute histogram of distances
-            dist_hist, dist_bins = np.histogram(distances, bins=dist_bins, density=False)
-            # Normalize
+        dist_hists = _histogram_by_type(distances, pair_types, len(elements) ** 2, dist_bins)
+        for key, dist_hist in zip(itertools.product(elements, elements), dist_hists):
             n_alpha = composition[key[0]] * s.num_sites
-            rdf = dist_hist / shell_volume / n_alpha
-
-            prdf[key] = rdf
+            prdf[key] = dist_hist / shell_volume / n_alpha
 
         return dist_bins[:-1], prdf
 
@@ -336,21 +316,19 @@ class ElectronicRadialDistributionFunction(BaseFeaturizer):
             raise ValueError("width of bins for ReDF must be >0")
 
         # Make structure primitive.
-        struct = SpacegroupAnalyzer(s).find_primitive() or s
+        struct = get_primitive_structure(s) or s
 
         # Add oxidation states.
         struct = ValenceIonicRadiusEvaluator(struct).structure
 
-        distribution = np.zeros(self.nbins, dtype=np.float)
-        nbins = int(self.cutoff / self.dr) + 1
-
-        for site in struct.sites:
-            this_charge = float(site.specie.oxi_state)
-            neighbors = struct.get_neighbors(site, self.cutoff)
-            for nnsite, dist, *_ in neighbors:
-                neigh_charge = float(nnsite.specie.oxi_state)
-                bin_index = int(dist / self.dr)
-                distribution[bin_index] += (this_charge * neigh_charge) / (struct.num_sites * dist)
+        # Sum the interactions of all pairs of sites in each bin
+        centers, neighbors, _, distances = get_neighbor_list(struct, self.cutoff)
+        charges = np.array([float(site.specie.oxi_state) for site in struct.sites])
+        distribution = np.bincount(
+            (distances / self.dr).astype(int),
+            weights=charges[centers] * charges[neighbors] / (struct.num_sites * distances),
+            minlength=self.nbins,
+        )
 
         return distribution
 
@@ -373,6 +351,31 @@ class ElectronicRadialDistributionFunction(BaseFeaturizer):
         return ["Nils E. R. Zimmermann", "Alex Dunn"]
 
 
+def _histogram_by_type(distances, types, n_types, bin_edges):
+    """
+    Compute a histogram of the distances of each type of pair of sites.
+
+    Equivalent to `np.histogram(distances[types == t], bins=bin_edges)` for
+    each type t, but computed in a single pass over the distances.
+
+    Args:
+        distances (np.ndarray): Distance of each pair of sites.
+        types (np.ndarray): Type of each pair of sites, from 0 to n_types - 1.
+        n_types (int): Number of types.
+        bin_edges (np.ndarray): Edges of the bins, in increasing order.
+    Returns:
+        (np.ndarray): Number of pairs of each type in each bin, with shape
+            (n_types, n_bins).
+    """
+    n_bins = len(bin_edges) - 1
+    bins = np.searchsorted(bin_edges, distances, side="right") - 1
+    # As in np.histogram, the last bin includes its right edge
+    bins[distances == bin_edges[-1]] = n_bins - 1
+    inside = (bins >= 0) & (bins < n_bins)
+    counts = np.bincount(types[inside] * n_bins + bins[inside], minlength=n_types * n_bins)
+    return counts.reshape(n_types, n_bins)
+
+
 def get_rdf_bin_labels(bin_distances, cutoff):
     """
     Common function for getting bin labels given the distances at which each
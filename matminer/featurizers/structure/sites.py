@@ -5,7 +5,7 @@ Structure featurizers based on aggregating site features.
 import numpy as np
 from pymatgen.analysis.local_env import VoronoiNN
 
-from matminer.featurizers.base import BaseFeaturizer
+from matminer.featurizers.base import BaseFeaturizer, profile_section
 from matminer.featurizers.site import (
     OPSiteFingerprint,
     CoordinationNumber,
@@ -16,6 +16,7 @@ from matminer.featurizers.site import (
     SOAP,
 )
 from matminer.featurizers.utils.stats import PropertyStats
+from matminer.utils.caching import get_equivalent_atoms
 
 
 class SiteStatsFingerprint(BaseFeaturizer):
@@ -28,6 +29,19 @@ class SiteStatsFingerprint(BaseFeaturizer):
     Can optionally compute the the statistics of only sites with certain ranges
     of oxidation states (e.g., only anions).
 
+    If the site featurizer implements `featurize_all_sites(struct, indices)`,
+    which returns the features of many sites as an (n_sites, n_features)
+    array, the site features are computed in a single call. Otherwise,
+    `featurize` is called for each site.
+
+    With `use_symmetry=True`, the sites are grouped into sets of
+    symmetrically-equivalent sites with spglib, only one site of each set is
+    featurized, and its features are used for all sites of the set, so the
+    statistics are weighted by the multiplicity of each set. Only use it with
+    site featurizers whose features do not change under the symmetry
+    operations of the crystal (e.g., not with direction-dependent or
+    per-neighbor-site features).
+
     Features:
         - Returns each statistic of each site feature
     """
@@ -39,6 +53,7 @@ class SiteStatsFingerprint(BaseFeaturizer):
         min_oxi=None,
         max_oxi=None,
         covariance=False,
+        use_symmetry=False,
     ):
         """
         Args:
@@ -52,6 +67,8 @@ class SiteStatsFingerprint(BaseFeaturizer):
                 zero means metals/cations only)
             max_oxi (int): maximum site oxidation state for inclusion
             covariance (bool): Whether to compute the covariance of site features
+            use_symmetry (bool): Whether to featurize only one site of each set of
+                symmetrically-equivalent sites
         """
 
         self.site_featurizer = site_featurizer
@@ -66,6 +83,7 @@ class SiteStatsFingerprint(BaseFeaturizer):
         self.min_oxi = min_oxi
         self.max_oxi = max_oxi
         self.covariance = covariance
+        self.use_symmetry = use_symmetry
 
     @property
     def _site_labels(self):
@@ -88,29 +106,50 @@ class SiteStatsFingerprint(BaseFeaturizer):
         self.site_featurizer.fit(X, y, **fit_kwargs)
         return self
 
+    def _featurize_sites(self, s, indices):
+        """Compute the features of several sites in a structure
+
+        Args:
+            s (Structure): Structure to featurize
+            indices ([int]): Indices of the sites to featurize
+        Returns:
+            (ndarray) features of each site, shape (n_sites, n_site_features).
+                Features that are None are set to zero.
+        """
+        n_features = len(self._site_labels)
+        featurize_all_sites = getattr(self.site_featurizer, "featurize_all_sites", None)
+        if featurize_all_sites is not None:
+            vals = np.array(featurize_all_sites(s, indices), dtype=float)
+        else:
+            vals = np.array(
+                [[0.0 if v is None else v for v in self.site_featurizer.featurize(s, i)] for i in indices],
+                dtype=float,
+            )
+        return vals.reshape(len(indices), n_features)
+
     def featurize(self, s):
         # Get each feature for each site
-        vals = [[] for t in self._site_labels]
-        for i, site in enumerate(s.sites):
-            if (self.min_oxi is None or site.specie.oxi_state >= self.min_oxi) and (
-                self.max_oxi is None or site.specie.oxi_state >= self.max_oxi
-            ):
-                opvalstmp = self.site_featurizer.featurize(s, i)
-                for j, opval in enumerate(opvalstmp):
-                    if opval is None:
-                        vals[j].append(0.0)
-                    else:
-                        vals[j].append(opval)
+        indices = [
+            i
+            for i, site in enumerate(s.sites)
+            if (self.min_oxi is None or site.specie.oxi_state >= self.min_oxi)
+            and (self.max_oxi is None or site.specie.oxi_state >= self.max_oxi)
+        ]
+        with profile_section(self.site_featurizer.__class__.__name__):
+            if self.use_symmetry:
+                equivalent_atoms = get_equivalent_atoms(s)[indices]
+                representatives, inverse = np.unique(equivalent_atoms, return_inverse=True)
+                site_features = self._featurize_sites(s, representatives.tolist())[inverse]
+            else:
+                site_features = self._featurize_sites(s, indices)
+        vals = site_features.T
 
         # If the user does not request statistics, return the site features now
         if self.stats is None:
-            return vals
+            return vals.tolist()
 
-        # Compute the requested statistics
-        stats = []
-        for op in vals:
-            for stat in self.stats:
-                stats.append(PropertyStats().calc_stat(op, stat))
+        # Compute the requested statistics of each site feature
+        stats = PropertyStats.calc_stats(vals, self.stats).flatten().tolist()
 
         # If desired, compute covariances
         if self.covariance:
@@ -2,10 +2,10 @@
 Structure featurizers based on symmetry.
 """
 from pymatgen.analysis.dimensionality import get_dimensionality_larsen
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 import pymatgen.analysis.local_env as pmg_le
 
 from matminer.featurizers.base import BaseFeaturizer
+from matminer.utils.caching import get_spacegroup_analyzer
 
 
 class GlobalSymmetryFeatures(BaseFeaturizer):
@@ -35,7 +35,7 @@ class GlobalSymmetryFeatures(BaseFeaturizer):
         self.features = desired_features if desired_features else self.all_features
 
     def featurize(self, s):
-        sga = SpacegroupAnalyzer(s)
+        sga = get_spacegroup_analyzer(s)
         output = []
 
         if "spacegroup_num" in self.features:
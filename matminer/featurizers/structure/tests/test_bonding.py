@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 from sklearn.exceptions import NotFittedError
 
-from pymatgen.core import Structure, Lattice
+from pymatgen.core import Element, Structure, Lattice
 
 from matminer.featurizers.structure.bonding import (
     MinimumRelativeDistances,
@@ -61,6 +61,42 @@ class BondingStructureTest(StructureFeaturesTest):
         self.assertArrayEqual(df["Al - Al bond frac."].to_numpy(), [0.0, 0.0])
         self.assertArrayEqual(df["Ni - Ni bond frac."].to_numpy(), [0.0, 0.5])
 
+    def test_bob_bag(self):
+        bob = BagofBonds(coulomb_matrix=SineCoulombMatrix(flatten=False))
+        al, ni = Element("Al"), Element("Ni")
+        self.assertEqual(
+            bob.bag(self.ni3al, return_baglens=True),
+            {(al,): 1, (ni,): 3, (al, ni): 6, (ni, ni): 6},
+        )
+        bags = bob.bag(self.ni3al)
+        self.assertEqual(list(bags), [(al,), (al, ni), (ni,), (ni, ni)])
+        self.assertArrayAlmostEqual(bags[(ni,)], [1486.4464890775491] * 3)
+        self.assertArrayAlmostEqual(bags[(ni, ni)], [83.33991275736257] * 6)
+
+        # The values of each bag are sorted
+        cm = bob.coulomb_matrix.featurize(self.nacl)[0]
+        bags = bob.bag(self.nacl)
+        self.assertEqual(sorted(cm.ravel().tolist()), sorted(sum(bags.values(), [])))
+        for values in bags.values():
+            self.assertEqual(values, sorted(values))
+
+        # The bag lengths match the number of values in each bag
+        for s in [self.nacl, self.cscl, self.ni3al, self.diamond]:
+            self.assertEqual(bob.bag(s, return_baglens=True), {k: len(v) for k, v in bob.bag(s).items()})
+
+    def test_fit_generator(self):
+        structures = [self.ni3al, self.cscl, self.diamond_no_oxi]
+
+        bob = BagofBonds(coulomb_matrix=CoulombMatrix(flatten=False))
+        bob.fit(s for s in structures)
+        self.assertEqual(bob.feature_labels(), bob.fit(structures).feature_labels())
+        self.assertEqual(bob.bag_lens[(Element("Ni"), Element("Ni"))], 6)
+
+        bf = BondFractions()
+        bf.fit(s for s in structures)
+        self.assertEqual(bf.feature_labels(), bf.fit(structures).feature_labels())
+        self.assertRaises(ValueError, bf.fit, (s for s in [self.ni3al, "Ni3Al"]))
+
     def test_bob(self):
 
         # Test a single fit and featurization
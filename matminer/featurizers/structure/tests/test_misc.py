@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from matminer.featurizers.composition import ElementProperty
 from matminer.featurizers.structure.misc import (
     EwaldEnergy,
@@ -51,6 +53,22 @@ class MiscStructureFeaturesTest(StructureFeaturesTest):
         self.assertEqual(len(pattern), 91)
         self.assertEqual(len(xpp.feature_labels()), 91)
 
+        # featurizing many structures at once
+        xpp = XRDPowderPattern()
+        xpp.set_n_jobs(1)
+        patterns = xpp.featurize_many([self.diamond, self.nacl, self.cscl], pbar=False)
+        for s, pattern in zip([self.diamond, self.nacl, self.cscl], patterns):
+            self.assertArrayAlmostEqual(pattern, xpp.featurize(s))
+
+        # other peak shapes
+        for shape in ["lorentzian", "pseudo-voigt"]:
+            xpp = XRDPowderPattern(two_theta_range=(0, 1000), pattern_length=10001, peak_shape=shape)
+            pattern = xpp.broaden_peaks([(np.array([40.0, 60.0]), np.array([1.0, 3.0]))])[0][0]
+            self.assertAlmostEqual(np.trapz(pattern, dx=0.1), 1, places=1)
+            self.assertAlmostEqual(np.argmax(pattern) * 0.1, 60)
+        with self.assertRaises(ValueError):
+            XRDPowderPattern(peak_shape="triangle")
+
 
 if __name__ == "__main__":
     unittest.main()
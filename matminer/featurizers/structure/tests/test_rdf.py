@@ -84,6 +84,8 @@ class StructureRDFTest(StructureFeaturesTest):
         self.assertAlmostEqual(prdf[("Cs", "Cl")][int(round(3.6 / 0.1))], 0.477823197)
         self.assertAlmostEqual(prdf[("Cl", "Cs")][int(round(3.6 / 0.1))], 0.477823197)
         self.assertAlmostEqual(prdf[("Cs", "Cs")][int(round(3.6 / 0.1))], 0)
+        # The oxidation states of the input are kept
+        self.assertEqual({"Cs+", "Cl-"}, {site.species_string for site in self.cscl})
 
         # Do Ni3Al, make sure it captures the antisymmetry of Ni/Al sites
         distances, prdf = PartialRadialDistributionFunction(cutoff=10, bin_size=0.5).compute_prdf(self.ni3al)
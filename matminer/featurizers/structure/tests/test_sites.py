@@ -2,13 +2,45 @@ import unittest
 
 import numpy as np
 
-from matminer.featurizers.site import SiteElementalProperty
+from matminer.featurizers.base import BaseFeaturizer
+from matminer.featurizers.site import AGNIFingerprints, SiteElementalProperty
 from matminer.featurizers.structure.sites import (
     SiteStatsFingerprint,
 )
 from matminer.featurizers.structure.tests.base import StructureFeaturesTest
 
 
+class SiteLoopFeaturizer(BaseFeaturizer):
+    """Site featurizer that hides the "featurize_all_sites" of another one"""
+
+    def __init__(self, featurizer):
+        self.featurizer = featurizer
+
+    def featurize(self, struct, idx):
+        return self.featurizer.featurize(struct, idx)
+
+    def feature_labels(self):
+        return self.featurizer.feature_labels()
+
+    def citations(self):
+        return []
+
+    def implementors(self):
+        return []
+
+
+class CountingFeaturize:
+    """Wrapper that counts the calls to a featurize function"""
+
+    def __init__(self, featurize):
+        self.featurize = featurize
+        self.count = 0
+
+    def __call__(self, *x):
+        self.count += 1
+        return self.featurize(*x)
+
+
 class StructureSitesFeaturesTest(StructureFeaturesTest):
     def test_sitestatsfingerprint(self):
         # Test matrix.
@@ -76,6 +108,33 @@ class StructureSitesFeaturesTest(StructureFeaturesTest):
         self.assertAlmostEqual(feats[1], 0.0)
         self.assertAlmostEqual(np.sum(feats), 207.88194724, places=5)
 
+    def test_sitestatsfingerprint_all_sites(self):
+        # Featurizers with and without "featurize_all_sites" should give the same results
+        agni = AGNIFingerprints(directions=[None, "x"], cutoff=4)
+        fast = SiteStatsFingerprint(agni, stats=("mean", "std_dev", "maximum"), covariance=True)
+        slow = SiteStatsFingerprint(SiteLoopFeaturizer(agni), stats=("mean", "std_dev", "maximum"), covariance=True)
+        self.assertEqual(fast.feature_labels(), slow.feature_labels())
+        for struct in [self.sc, self.cscl, self.nacl]:
+            self.assertArrayAlmostEqual(slow.featurize(struct), fast.featurize(struct))
+
+        fast.stats = None
+        slow.stats = None
+        self.assertArrayAlmostEqual(slow.featurize(self.cscl), fast.featurize(self.cscl))
+
+    def test_sitestatsfingerprint_symmetry(self):
+        # Featurizing one site of each set of equivalent sites gives the same statistics
+        struct = self.nacl.copy()
+        struct.make_supercell([2, 1, 1])
+        site_featurizer = SiteLoopFeaturizer(SiteElementalProperty(properties=["Number", "AtomicWeight"]))
+        site_featurizer.featurize = CountingFeaturize(site_featurizer.featurize)
+        f = SiteStatsFingerprint(site_featurizer, stats=("mean", "std_dev", "maximum"), covariance=True)
+        expected = f.featurize(struct)
+        self.assertEqual(len(struct), site_featurizer.featurize.count)
+        f.use_symmetry = True
+        site_featurizer.featurize.count = 0
+        self.assertArrayAlmostEqual(expected, f.featurize(struct))
+        self.assertEqual(2, site_featurizer.featurize.count)
+
     def test_ward_prb_2017_lpd(self):
         """Test the local property difference attributes from Ward 2017"""
         f = SiteStatsFingerprint.from_preset("LocalPropertyDifference_ward-prb-2017")
@@ -1,7 +1,10 @@
 import os
 import copy
+import json
 import unittest
+import tempfile
 import warnings
+from contextlib import nullcontext
 from itertools import product
 
 import pandas as pd
@@ -10,13 +13,18 @@ from sklearn.dummy import DummyRegressor, DummyClassifier
 from pymatgen.core.structure import Structure
 from pymatgen.util.testing import PymatgenTest
 
-from matminer.utils.caching import _get_all_nearest_neighbors
+from matminer.utils.caching import FeatureCache, get_nn_cache
 from matminer.featurizers.base import (
     BaseFeaturizer,
+    FeaturizationProfile,
+    FeaturizerPool,
     MultipleFeaturizer,
     StackedFeaturizer,
+    get_executor,
+    get_profile,
 )
-from matminer.featurizers.structure import SiteStatsFingerprint
+from matminer.featurizers.composition import ElementProperty
+from matminer.featurizers.structure import SiteStatsFingerprint, XRDPowderPattern
 
 
 class SingleFeaturizer(BaseFeaturizer):
@@ -134,6 +142,59 @@ class MultiTypeFeaturizer(BaseFeaturizer):
         return []
 
 
+class CountingFeaturizer(SingleFeaturizer):
+    """Records the entries it featurizes, and fails on entries in `fail_on`"""
+
+    fail_on = ()
+
+    def __init__(self, offset=1):
+        self.offset = offset
+        self.seen = []
+
+    def featurize(self, x):
+        if x in self.fail_on:
+            raise ValueError("Interrupted")
+        self.seen.append(x)
+        return [x + self.offset]
+
+
+class HiddenOffset:
+    """An offset whose value cannot be recovered from its constructor arguments"""
+
+    def __init__(self, value):
+        self._value = value
+
+    def __radd__(self, x):
+        return x + self._value
+
+
+class SiteFeaturizer(BaseFeaturizer):
+    """Records the sites it featurizes at once, and fails on sites in `fail_on`"""
+
+    fail_on = ()
+
+    def __init__(self):
+        self.calls = []
+
+    def featurize(self, struct, idx):
+        if idx in self.fail_on:
+            raise ValueError("Bad site")
+        return [idx, len(struct), os.getpid()]
+
+    def featurize_all_sites(self, struct, indices):
+        self.calls.append(list(indices))
+        return np.array([self.featurize(struct, i) for i in indices])
+
+    def feature_labels(self):
+        return ["index", "n_sites", "pid"]
+
+    def citations(self):
+        return []
+
+    def implementors(self):
+        return []
+
+
 class TestBaseClass(PymatgenTest):
     def setUp(self):
         self.single = SingleFeaturizer()
@@ -155,6 +216,138 @@ class TestBaseClass(PymatgenTest):
         self.assertArrayAlmostEqual(data["w"], [0, 1, 2])
         self.assertArrayAlmostEqual(data["z"], [3, 4, 5])
 
+    def test_chunked_dataframe(self):
+        data = pd.DataFrame({"x": list(range(10))})
+        self.multi.set_n_jobs(1)
+        res = self.multi.featurize_dataframe(data, "x", chunk_size=3)
+        self.assertArrayAlmostEqual(res["w"], np.arange(10) - 1)
+        self.assertArrayAlmostEqual(res["z"], np.arange(10) + 2)
+        self.assertEqual("float64", res["w"].dtype)
+
+        # Non-numeric features
+        res = self.matrix.featurize_dataframe(data, "x", chunk_size=4)
+        self.assertArrayAlmostEqual(np.eye(2, 2), res["representation"][9])
+
+        # Errors
+        data = pd.DataFrame({"x": [1, "a", 3]})
+        res = self.multi.featurize_dataframe(data, "x", chunk_size=2, ignore_errors=True, return_errors=True)
+        self.assertArrayAlmostEqual(res["z"], [3, np.nan, 5])
+        self.assertIn("TypeError", res["MultipleFeatureFeaturizer Exceptions"][1])
+
+        # Multiple arguments, in parallel
+        data = pd.DataFrame({"x": [1, 2, 3], "x2": [4, 5, 6]})
+        self.multiargs.set_n_jobs(2)
+        res = self.multiargs.featurize_dataframe(data, ["x", "x2"], chunk_size=2)
+        self.assertArrayAlmostEqual(res["y"], [5, 7, 9])
+
+    def test_checkpoint(self):
+        data = pd.DataFrame({"x": list(range(10))}, index=list(range(10, 20)))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Interrupt the first run in the third block
+            f = CountingFeaturizer()
+            f.set_n_jobs(1)
+            CountingFeaturizer.fail_on = (7,)
+            with self.assertRaises(ValueError):
+                f.featurize_dataframe(data, "x", checkpoint_dir=tmpdir, chunk_size=3, pbar=False)
+            CountingFeaturizer.fail_on = ()
+            self.assertEqual(2, len(os.listdir(tmpdir)))
+
+            # Restart: only the remaining blocks are computed
+            f = CountingFeaturizer()
+            f.set_n_jobs(1)
+            res = f.featurize_dataframe(data, "x", checkpoint_dir=tmpdir, chunk_size=3, pbar=False)
+            self.assertArrayAlmostEqual(res["y"], np.arange(10) + 1)
+            self.assertEqual([6, 7, 8, 9], f.seen)
+            self.assertEqual(4, len(os.listdir(tmpdir)))
+
+            # Changing the settings, the row index, or the chunk size recomputes
+            f = CountingFeaturizer(offset=2)
+            f.set_n_jobs(1)
+            res = f.featurize_dataframe(data, "x", checkpoint_dir=tmpdir, chunk_size=3, pbar=False)
+            self.assertArrayAlmostEqual(res["y"], np.arange(10) + 2)
+            self.assertEqual(list(range(10)), f.seen)
+            f.seen = []
+            f.featurize_dataframe(data.iloc[::-1], "x", checkpoint_dir=tmpdir, chunk_size=3, pbar=False)
+            self.assertEqual(list(range(9, -1, -1)), f.seen)
+            f.seen = []
+            f.featurize_dataframe(data, "x", checkpoint_dir=tmpdir, chunk_size=4, pbar=False)
+            self.assertEqual(list(range(10)), f.seen)
+
+            # Non-numeric features and MultipleFeaturizer
+            mf = MultipleFeaturizer([self.single, self.matrix])
+            mf.set_n_jobs(1)
+            mf.featurize_dataframe(data, "x", checkpoint_dir=tmpdir, pbar=False)
+            res = mf.featurize_dataframe(data, "x", checkpoint_dir=tmpdir, pbar=False)
+            self.assertArrayAlmostEqual(np.eye(2, 2), res["representation"][10])
+            self.assertArrayAlmostEqual(res["y"], np.arange(10) + 1)
+
+        # Featurizers whose settings cannot be represented are not checkpointed
+        with tempfile.TemporaryDirectory() as tmpdir:
+            f = CountingFeaturizer(offset=HiddenOffset(1))
+            f.set_n_jobs(1)
+            with self.assertWarns(UserWarning):
+                res = f.featurize_dataframe(data, "x", checkpoint_dir=tmpdir, pbar=False)
+            self.assertArrayAlmostEqual(res["y"], np.arange(10) + 1)
+            self.assertEqual([], os.listdir(tmpdir))
+
+    def test_feature_cache(self):
+        cache = FeatureCache()
+        f = CountingFeaturizer()
+        f.set_n_jobs(1)
+        f.set_feature_cache(cache)
+        self.assertArrayAlmostEqual(f.featurize_many([1, 2, 1, 2], pbar=False), [[2], [3], [2], [3]])
+        self.assertEqual([1, 2], f.seen)
+        self.assertEqual(2, cache.cache_info()["hits"])
+
+        # A featurizer with the same settings shares entries, others do not
+        f2 = CountingFeaturizer()
+        f2.set_feature_cache(cache)
+        f2.featurize_wrapper((1,))
+        self.assertEqual([], f2.seen)
+        f2.set_params(offset=2)
+        self.assertEqual([3], f2.featurize_wrapper((1,)))
+        self.assertEqual([1], f2.seen)
+
+        # Errors are not cached
+        CountingFeaturizer.fail_on = (5,)
+        self.assertTrue(np.isnan(f.featurize_wrapper((5,), ignore_errors=True)[0]))
+        CountingFeaturizer.fail_on = ()
+        self.assertEqual([6], f.featurize_wrapper((5,)))
+
+        # Errors of the cache are not reported as featurization errors
+        class BrokenCache(FeatureCache):
+            def get(self, key):
+                raise OSError("Disk full")
+
+        f.set_feature_cache(BrokenCache())
+        with self.assertRaisesRegex(OSError, "Disk full"):
+            f.featurize_wrapper((1,), ignore_errors=True)
+        f.set_feature_cache(cache)
+
+        # Children of a MultipleFeaturizer use the cache
+        mf = MultipleFeaturizer([CountingFeaturizer(), self.multi])
+        mf.set_feature_cache(cache)
+        self.assertIs(cache, mf.featurizers[1].feature_cache)
+        self.assertEqual([2, 0, 3], mf.featurize_wrapper((1,)))
+        self.assertEqual([], mf.featurizers[0].seen)
+
+        # Featurizers whose settings cannot be represented are not cached
+        f = CountingFeaturizer(offset=HiddenOffset(1))
+        f.set_n_jobs(1)
+        f.set_feature_cache(cache)
+        self.assertArrayAlmostEqual(f.featurize_many([1, 2, 1, 2], pbar=False), [[2], [3], [2], [3]])
+        self.assertEqual([1, 2, 1, 2], f.seen)
+
+    def test_featurize_iter(self):
+        self.single.set_n_jobs(1)
+        blocks = list(self.single.featurize_iter((x for x in range(5)), chunk_size=2, pbar=False))
+        self.assertEqual([2, 2, 1], [len(b) for b in blocks])
+        self.assertArrayAlmostEqual(sum(blocks, []), [[1], [2], [3], [4], [5]])
+
+        blocks = list(self.multiargs.featurize_iter([(1, 4), (2, 5)], chunk_size=5, pbar=False))
+        self.assertArrayAlmostEqual(blocks[0], [[5], [7]])
+        self.assertEqual([], list(self.single.featurize_iter([], pbar=False)))
+
     def test_matrix(self):
         """Test the ability to add features that are matrices to a dataframe"""
         data = self.make_test_data()
@@ -179,8 +372,8 @@ class TestBaseClass(PymatgenTest):
         self.assertArrayAlmostEqual(data["y"], [2, 3, 4])
 
     def test_multiple(self):
-        # test iterating over both entries and featurizers
-        for iter_entries in [True, False]:
+        # test iterating over entries, featurizers and shards of entries
+        for iter_entries in [True, False, "shards"]:
             multi_f = MultipleFeaturizer([self.single, self.multi], iterate_over_entries=iter_entries)
             data = self.make_test_data()
 
@@ -268,6 +461,175 @@ class TestBaseClass(PymatgenTest):
         data = s.featurize_dataframe(data, ["x", "x2"])
         self.assertArrayAlmostEqual(data["y"], [5, 7, 9])
 
+    def test_featurizer_pool(self):
+        self.assertIsNone(get_executor())
+        with FeaturizerPool(2) as pool:
+            self.assertIs(pool, get_executor())
+
+            # Pool is reused across calls and featurizers
+            self.single.set_n_jobs(2)
+            mat = self.single.featurize_many([1, 2, 3], pbar=False)
+            self.assertArrayAlmostEqual(mat, [[2], [3], [4]])
+            workers = pool.pool
+            self.multiargs.set_n_jobs(2)
+            data = self.multiargs.featurize_dataframe(pd.DataFrame({"x": [1, 2, 3], "x2": [4, 5, 6]}), ["x", "x2"])
+            self.assertArrayAlmostEqual(data["y"], [5, 7, 9])
+            self.assertIs(workers, pool.pool)
+
+            # Each featurizer state is shipped once, however many calls use it
+            self.single.featurize_many(list(range(10)), pbar=False)
+            state_dir = pool._state_dir
+            self.assertEqual(2, len(os.listdir(state_dir)))
+
+            # Changes to the featurizer state are shipped to the workers
+            ft = self.fittable
+            ft.set_n_jobs(2)
+            ft.fit([1, 2])
+            self.assertArrayAlmostEqual(ft.featurize_many([1, 2], pbar=False), [[4, 5], [5, 6]])
+            ft.fit([1])
+            self.assertArrayAlmostEqual(ft.featurize_many([1, 2], pbar=False), [[4], [5]])
+
+            # Errors are handled as without the pool
+            mf = MultipleFeaturizer([self.multi, self.single], iterate_over_entries=False)
+            mf.set_n_jobs(2)
+            results = mf.featurize_many(["a", 2], ignore_errors=True, return_errors=True, pbar=False)
+            self.assertIn("TypeError", results[0][-1])
+        self.assertIsNone(get_executor())
+        self.assertIsNone(pool._pool)
+        self.assertFalse(os.path.exists(state_dir))
+
+    def test_shards(self):
+        entries = list(range(10))
+        expected = MultipleFeaturizer([self.single, self.multi]).featurize_many(entries, pbar=False)
+        mf = MultipleFeaturizer([self.single, self.multi, MatrixFeaturizer()], iterate_over_entries="shards")
+        for n_jobs, shard_size in [(1, None), (2, None), (2, 3)]:
+            mf.set_n_jobs(n_jobs)
+            features = mf.featurize_shards(entries, pbar=False, shard_size=shard_size)
+            self.assertEqual((10, 4), features.shape)
+            self.assertEqual(object, features.dtype)
+            self.assertArrayAlmostEqual(expected, features[:, :3].astype(float))
+            self.assertArrayAlmostEqual(np.eye(2, 2), features[9, 3])
+            self.assertEqual(
+                ["SingleFeaturizer", "MultipleFeatureFeaturizer", "MatrixFeaturizer"], list(mf.timings_.index)
+            )
+            self.assertTrue((mf.timings_ > 0).all())
+
+        # Numeric features are stored in a float array
+        mf = MultipleFeaturizer([self.single, self.multi], iterate_over_entries="shards")
+        mf.set_n_jobs(1)
+        features = mf.featurize_shards(entries, pbar=False)
+        self.assertEqual(np.float64, features.dtype)
+        self.assertArrayAlmostEqual(expected, features)
+        self.assertEqual((0, 3), mf.featurize_shards([], pbar=False).shape)
+
+        # Shards are run in a pool that is already active
+        with FeaturizerPool(2) as pool:
+            mf.set_n_jobs(2)
+            self.assertArrayAlmostEqual(expected, mf.featurize_many(entries, pbar=False))
+            self.assertIsNotNone(pool._pool)
+            results = mf.featurize_many(["a", 2], ignore_errors=True, return_errors=True, pbar=False)
+            self.assertIn("TypeError", results[0][1])
+            self.assertArrayAlmostEqual([3, 1, 4], [results[1][0], results[1][2], results[1][3]])
+
+    def test_site_groups(self):
+        s1 = self.get_structure("Si")
+        s2 = s1.copy()
+        s2.make_supercell([2, 1, 1])
+        rows = [(s1.copy(), 1), (s2, 3), (s1.copy(), 0), (s2, 1), (s2, 0)]
+        data = pd.DataFrame(rows, columns=["structure", "site"])
+        expected = [[1, 2], [3, 4], [0, 2], [1, 4], [0, 4]]
+
+        # Sites are featurized together for each structure, including copies
+        f = SiteFeaturizer()
+        f.set_n_jobs(1)
+        result = f.featurize_dataframe(data, ["structure", "site"], pbar=False)
+        self.assertArrayAlmostEqual(expected, result[["index", "n_sites"]].values)
+        self.assertEqual([[1, 0], [3, 1, 0]], f.calls)
+
+        # Only sites missing from the feature cache are featurized
+        f.set_feature_cache(FeatureCache())
+        f.featurize_many(rows[:2], pbar=False)
+        f.calls = []
+        self.assertArrayAlmostEqual(expected, np.array(f.featurize_many(rows, pbar=False))[:, :2])
+        self.assertEqual([[0], [1, 0]], f.calls)
+        f.set_feature_cache(None)
+
+        # Errors are only reported for the sites that caused them
+        f.fail_on = (3,)
+        results = f.featurize_many(rows, ignore_errors=True, return_errors=True, pbar=False)
+        self.assertIn("Bad site", results[1][-1])
+        self.assertArrayAlmostEqual(expected[3], results[3][:2])
+        self.assertTrue(np.isnan(results[3][-1]))
+        with self.assertRaises(ValueError):
+            f.featurize_many(rows, pbar=False)
+        f.fail_on = ()
+
+        # Each structure is featurized by a single worker
+        for pool in [nullcontext(), FeaturizerPool(2)]:
+            with pool:
+                f.set_n_jobs(2)
+                result = f.featurize_dataframe(data, ["structure", "site"], pbar=False)
+                self.assertArrayAlmostEqual(expected, result[["index", "n_sites"]].values)
+                self.assertEqual(1, result.loc[result["n_sites"] == 4, "pid"].nunique())
+
+    def test_profile(self):
+        data = pd.DataFrame({"x": ["a", 2, 3]}, index=[10, 11, 12])
+        for iter_entries, n_jobs in product([True, "shards"], [1, 2]):
+            mf = MultipleFeaturizer([self.single, self.multi], iterate_over_entries=iter_entries)
+            mf.set_n_jobs(n_jobs)
+            with FeaturizationProfile() as profile:
+                self.assertIs(profile, get_profile())
+                mf.featurize_dataframe(data, "x", ignore_errors=True, pbar=False)
+            self.assertIsNone(get_profile())
+
+            # Entries are labeled by row, and children are timed separately
+            df = profile.to_dataframe()
+            self.assertEqual(9, len(df))
+            self.assertEqual(
+                [
+                    "MultipleFeaturizer",
+                    "MultipleFeaturizer/SingleFeaturizer",
+                    "MultipleFeaturizer/MultipleFeatureFeaturizer",
+                ],
+                df["featurizer"].iloc[:3].tolist(),
+            )
+            self.assertEqual([10, 10, 10, 11, 11, 11, 12, 12, 12], df["row"].tolist())
+            self.assertTrue((df["seconds"] > 0).all())
+
+            # Errors caught in each child are counted
+            summary = profile.summary()
+            self.assertEqual([3, 3, 3], summary["entries"].tolist())
+            self.assertEqual([2, 1, 1], summary["errors"].tolist())
+            self.assertEqual(3, len(profile.slowest(5)))
+            self.assertEqual(1, len(profile.slowest(1, featurizer="MultipleFeaturizer/SingleFeaturizer")))
+            self.assertEqual(9, len(json.loads(profile.to_json())))
+
+        # Positions label entries outside of dataframes, and formulas are recorded
+        s = Structure([[3.52, 0, 0], [0, 3.52, 0], [0, 0, 3.52]], ["Al"], [[0, 0, 0]])
+        ssf = SiteStatsFingerprint.from_preset("CoordinationNumber_ward-prb-2017")
+        ssf.set_n_jobs(1)
+        with FeaturizationProfile() as profile:
+            ssf.featurize_many([s, s], pbar=False)
+            self.single.set_n_jobs(1)
+            list(self.single.featurize_iter([1, 2, 3], chunk_size=2, pbar=False))
+        df = profile.to_dataframe()
+        self.assertEqual(
+            ["SiteStatsFingerprint", "SiteStatsFingerprint/CoordinationNumber"] * 2, df["featurizer"][:4].tolist()
+        )
+        self.assertEqual(["Al"] * 4, df["formula"][:4].tolist())
+        self.assertEqual([0, 0, 1, 1, 0, 1, 2], df["row"].tolist())
+
+        # Featurizers with their own featurize_many are recorded too
+        ep = ElementProperty.from_preset("magpie")
+        xrd = XRDPowderPattern()
+        xrd.set_n_jobs(1)
+        with FeaturizationProfile() as profile:
+            ep.featurize_dataframe(pd.DataFrame({"c": [s.composition] * 2}, index=[5, 6]), "c", pbar=False)
+            xrd.featurize_many([s], pbar=False)
+        df = profile.to_dataframe()
+        self.assertEqual(["ElementProperty"] * 2 + ["XRDPowderPattern"], df["featurizer"].tolist())
+        self.assertEqual([5, 6, 0], df["row"].tolist())
+
     def test_fittable(self):
         data = self.make_test_data()
         ft = self.fittable
@@ -417,7 +779,7 @@ class TestBaseClass(PymatgenTest):
         )
 
         # Reset the cache before tests
-        _get_all_nearest_neighbors.cache_clear()
+        get_nn_cache().cache_clear()
 
         # Create a dataframe with two SC structures in it
         data = pd.DataFrame(
@@ -432,16 +794,16 @@ class TestBaseClass(PymatgenTest):
         # Call featurize on both, check the number of cache misses/hits
         feat.featurize(data["strcs"][0])
         feat.featurize(data["strcs"][1])
-        self.assertEqual(2, _get_all_nearest_neighbors.cache_info().hits)
-        self.assertEqual(2, _get_all_nearest_neighbors.cache_info().misses)
+        self.assertEqual(2, get_nn_cache().cache_info().hits)
+        self.assertEqual(2, get_nn_cache().cache_info().misses)
 
         # Verify the number of cache misses, it should be the same as before
         feat.set_n_jobs(1)
-        _get_all_nearest_neighbors.cache_clear()
+        get_nn_cache().cache_clear()
         feat.featurize_dataframe(data, "strcs")
 
-        self.assertEqual(2, _get_all_nearest_neighbors.cache_info().hits)
-        self.assertEqual(2, _get_all_nearest_neighbors.cache_info().misses)
+        self.assertEqual(2, get_nn_cache().cache_info().hits)
+        self.assertEqual(2, get_nn_cache().cache_info().misses)
 
     def test_ignore_errors(self):
         # Make sure multiplefeaturizer returns the correct sub-featurizer multiindex keys
@@ -449,7 +811,7 @@ class TestBaseClass(PymatgenTest):
         # Iterate through many tests: single/parallel, returning errors or not,
         # multiindex or not, and interation over entires/featurizers
 
-        for mi, re, n, iter_entries in product([True, False], [True, False], [1, 2], [True, False]):
+        for mi, re, n, iter_entries in product([True, False], [True, False], [1, 2], [True, False, "shards"]):
 
             mf = MultipleFeaturizer([self.multi, self.single], iterate_over_entries=iter_entries)
             # Make some test data that will cause errors
@@ -1,5 +1,6 @@
 import json
 import os
+import numpy as np
 import pandas as pd
 import unittest
 
@@ -9,6 +10,7 @@ from matminer.featurizers.dos import (
     Hybridization,
     SiteDOS,
     DosAsymmetry,
+    _get_sampling_weights,
 )
 from pymatgen.electronic_structure.dos import CompleteDos
 from pymatgen.util.testing import PymatgenTest
@@ -116,6 +118,16 @@ class DOSFeaturesTest(PymatgenTest):
         asym = asym.featurize_dataframe(self.nb3sn_df, col_id="dos", inplace=False)["dos_asymmetry"][0]
         self.assertAlmostEqual(asym, -0.9100, 3)
 
+    def test_sampling_weights(self):
+        # weighting the dos is the same as summing its interpolation at the sampled energies
+        energies = np.array([-2.0, -1.0, -0.2, 0.0, 0.5, 1.5])
+        densities = np.array([1.0, 3.0, 0.5, 2.0, 4.0, 1.0])
+        for edge, direction in [(0.0, 1.0), (0.1, -1.0), (1.4, 1.0), (-1.9, -1.0)]:
+            space = np.linspace(edge, edge + direction * 5.0 * 0.1, num=20)
+            expected = sum(np.interp(e, energies, densities) * np.exp(-abs(e - edge) * 0.1) for e in space)
+            weights = _get_sampling_weights(energies, edge, direction, 0.1, 20)
+            self.assertAlmostEqual(expected, weights @ densities)
+
 
 if __name__ == "__main__":
     unittest.main()
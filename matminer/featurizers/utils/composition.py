@@ -0,0 +1,214 @@
+"""
+Tools for featurizing many compositions at once with dense arrays.
+
+Compositions are encoded as arrays of atomic numbers and element fractions,
+and elemental properties are gathered from a precomputed (Z, property) table.
+Featurizers built on these tools compute the features of thousands of
+compositions with a few vectorized NumPy operations instead of a Python loop
+over compositions and elements.
+"""
+
+import numpy as np
+import pandas as pd
+from pymatgen.core import Composition, Element
+from scipy import sparse
+from tqdm.auto import tqdm
+
+from matminer.featurizers.base import BaseFeaturizer, get_profile
+
+# Number of elements covered by the dense tables
+MAX_Z = 103
+
+# Number of compositions featurized at a time by featurize_many_dense
+_BLOCK_SIZE = 10000
+
+
+class CompositionArrays:
+    """Dense encoding of a list of compositions
+
+    Each composition is a row of padded arrays holding the atomic numbers of
+    its elements and their fractions. Compositions that cannot be encoded
+    (e.g., not a Composition, or containing elements beyond `MAX_Z`) are
+    marked as not valid and left empty.
+
+    Args:
+        compositions ([Composition]): Compositions to encode
+
+    Attributes:
+        compositions ([Composition]): The encoded compositions
+        z (ndarray): Atomic number of each element, zero for padding.
+            Shape (n_compositions, max_elements)
+        amounts (ndarray): Amount of each element in the composition
+        fractions (ndarray): Atomic fraction of each element
+        mask (ndarray): Which entries of each row are elements
+        valid (ndarray): Whether each composition could be encoded
+    """
+
+    def __init__(self, compositions):
+        self.compositions = list(compositions)
+        self.valid = np.zeros(len(self.compositions), dtype=bool)
+        all_z, all_amounts, counts = [], [], []
+        for i, comp in enumerate(self.compositions):
+            items = {}
+            if isinstance(comp, Composition):
+                # Read the amounts directly, avoiding the much slower Composition.__getitem__
+                amounts = getattr(comp, "_data", None)
+                for sp, amt in (amounts if amounts is not None else dict(comp.items())).items():
+                    z = getattr(sp, "Z", 0)
+                    items[z] = items.get(z, 0) + amt
+            if len(items) > 0 and 0 < min(items) and max(items) <= MAX_Z:
+                self.valid[i] = True
+                all_z.extend(items.keys())
+                all_amounts.extend(items.values())
+                counts.append(len(items))
+            else:
+                counts.append(0)
+
+        # Store the elements of each composition in consecutive columns of its row
+        counts = np.array(counts, dtype=int)
+        rows = np.repeat(np.arange(len(counts)), counts)
+        cols = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        self.z = np.zeros((len(counts), max(counts.max(initial=0), 1)), dtype=int)
+        self.amounts = np.zeros(self.z.shape)
+        self.z[rows, cols] = all_z
+        self.amounts[rows, cols] = all_amounts
+        self.mask = self.z > 0
+
+        total = self.amounts.sum(axis=1)
+        total[total == 0] = 1
+        self.fractions = self.amounts / total[:, None]
+
+    def __len__(self):
+        return len(self.z)
+
+    def n_elements(self):
+        """Number of elements in each composition
+
+        Returns:
+            (ndarray) count of elements per composition
+        """
+        return self.mask.sum(axis=1)
+
+    def sparse_fractions(self):
+        """Element fractions as a sparse matrix
+
+        Returns:
+            (csr_matrix) fraction of each element, shape (n_compositions, MAX_Z).
+                Column ``Z - 1`` corresponds to the element with atomic number Z
+        """
+        rows = np.repeat(np.arange(len(self)), self.mask.sum(axis=1))
+        return sparse.csr_matrix(
+            (self.fractions[self.mask], (rows, self.z[self.mask] - 1)),
+            shape=(len(self), MAX_Z),
+        )
+
+    def gather(self, table):
+        """Look up a per-element table for every element of every composition
+
+        Args:
+            table (ndarray): Table whose first axis is the atomic number
+                (row 0 is used for padding), e.g. from `get_property_table`
+        Returns:
+            (ndarray) values, shape (n_compositions, max_elements) + table.shape[1:]
+        """
+        return table[self.z]
+
+
+def get_property_table(data_source, properties):
+    """Tabulate elemental properties for all elements up to `MAX_Z`
+
+    Args:
+        data_source (AbstractData): Source of the elemental properties
+        properties ([str]): Names of the properties
+    Returns:
+        table (ndarray): Property values, shape (MAX_Z + 1, n_properties).
+            Row ``Z`` holds the properties of the element with atomic number Z.
+        missing (ndarray): Whether a value is not available or is not a number,
+            in which case featurizing a composition containing that element
+            must fall back to the data source
+    """
+    table = np.full((MAX_Z + 1, len(properties)), np.nan)
+    missing = np.ones((MAX_Z + 1, len(properties)), dtype=bool)
+    for z in range(1, MAX_Z + 1):
+        elem = Element.from_Z(z)
+        for j, prop in enumerate(properties):
+            try:
+                table[z, j] = float(data_source.get_elemental_property(elem, prop))
+                missing[z, j] = False
+            except Exception:
+                pass
+    return table, missing
+
+
+def featurize_many_dense(featurizer, entries, featurize_block, ignore_errors=False, return_errors=False, pbar=True):
+    """Featurize many compositions with a dense, vectorized featurization function
+
+    Implements `featurize_many` for composition featurizers. Compositions are
+    encoded in blocks as `CompositionArrays`, and `featurize_block` computes
+    the features of a whole block at once. Entries that cannot be handled
+    by `featurize_block` are featurized one at a time with
+    `featurize_wrapper`, so that errors are reported the same way as in
+    `BaseFeaturizer.featurize_many`.
+
+    The blocks are featurized in the calling process whatever the `n_jobs`
+    setting of the featurizer or the active `FeaturizerPool`, as vectorized
+    featurization is faster than sending the compositions to workers. If the
+    featurizer has a feature cache, or while a `FeaturizationProfile` is
+    active, the default implementation is used so that each composition is
+    looked up in the cache and timed.
+
+    Args:
+        featurizer (BaseFeaturizer): Composition featurizer
+        entries (list-like): Compositions to featurize, or 1-tuples of compositions
+        featurize_block (callable): Function that takes a `CompositionArrays`
+            and returns the features of each composition, shape
+            (n_compositions, n_features), and a boolean array of which rows
+            were computed successfully
+        ignore_errors (bool): See `BaseFeaturizer.featurize_many`
+        return_errors (bool): See `BaseFeaturizer.featurize_many`
+        pbar (bool): Show a progress bar for featurization if True.
+    Returns:
+        (list) features for each entry
+    """
+    if return_errors and not ignore_errors:
+        raise ValueError("Please set ignore_errors to True to use" " return_errors.")
+
+    # Check inputs
+    if not isinstance(entries, (tuple, list, np.ndarray, pd.Series, pd.DataFrame)):
+        raise Exception("'entries' must be a list-like object")
+
+    if len(entries) == 0:
+        return []
+    if featurizer.feature_cache is not None or get_profile() is not None:
+        return BaseFeaturizer.featurize_many(featurizer, entries, ignore_errors, return_errors, pbar)
+
+    # Get the list of compositions, falling back to the default implementation for other inputs
+    if isinstance(entries, pd.DataFrame):
+        if entries.shape[1] != 1:
+            return BaseFeaturizer.featurize_many(featurizer, entries, ignore_errors, return_errors, pbar)
+        compositions = list(entries.values[:, 0])
+    elif isinstance(entries, pd.Series) or not isinstance(entries[0], (tuple, list, np.ndarray)):
+        compositions = list(entries)
+    elif all(len(x) == 1 for x in entries):
+        compositions = [x[0] for x in entries]
+    else:
+        return BaseFeaturizer.featurize_many(featurizer, entries, ignore_errors, return_errors, pbar)
+
+    progress = tqdm(total=len(compositions), desc=featurizer.__class__.__name__, disable=not pbar)
+    output = []
+    for start in range(0, len(compositions), _BLOCK_SIZE):
+        block = compositions[start : start + _BLOCK_SIZE]
+        arrays = CompositionArrays(block)
+        with np.errstate(all="ignore"):
+            features, success = featurize_block(arrays)
+        success = np.logical_and(success, arrays.valid)
+        for comp, row, ok in zip(block, features.tolist(), success):
+            if ok:
+                output.append(row + [float("nan")] if return_errors else row)
+            else:
+                output.append(
+                    featurizer.featurize_wrapper((comp,), return_errors=return_errors, ignore_errors=ignore_errors)
+                )
+        progress.update(len(block))
+    progress.close()
+    return output
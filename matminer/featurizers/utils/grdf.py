@@ -32,6 +32,32 @@ def initialize_pairwise_function(name, **options):
     return output
 
 
+def evaluate_functions(functions, r):
+    """Evaluate many pairwise functions for many distances
+
+    Functions of the same class are evaluated together with array operations,
+    rather than calling each function separately.
+
+    Args:
+        functions ([AbstractPairwise]) - Pairwise functions, e.g. the bins of a
+            Generalized Radial Distribution Function
+        r ([float]) - Pairwise distances
+    Returns:
+        (ndarray) - Value of each function at each distance, shape
+            (len(functions), len(r))
+    """
+    r = np.asarray(r, dtype=float).ravel()
+    output = np.empty((len(functions), len(r)))
+
+    # Group the functions by class
+    by_class = {}
+    for i, f in enumerate(functions):
+        by_class.setdefault(type(f), []).append(i)
+    for cls, indices in by_class.items():
+        output[indices] = cls._evaluate_functions([functions[i] for i in indices], r)
+    return output
+
+
 class AbstractPairwise(object):
     """Abstract class for pairwise functions used in Generalized Radial Distribution Function"""
 
@@ -55,6 +81,30 @@ class AbstractPairwise(object):
 
         raise NotImplementedError()
 
+    def evaluate(self, r):
+        """Evaluate this function for many distances
+
+        Args:
+            r ([float]) - Pairwise distances
+        Returns:
+            (ndarray) - Value of the function at each distance, as floats
+        """
+        return np.asarray(self(np.asarray(r, dtype=float)), dtype=float)
+
+    @classmethod
+    def _evaluate_functions(cls, functions, r):
+        """Evaluate many functions of this class for many distances
+
+        Subclasses can override this to evaluate all of the functions at once.
+
+        Args:
+            functions ([AbstractPairwise]) - Functions of this class
+            r (ndarray) - Pairwise distances, 1D array
+        Returns:
+            (ndarray) - Values of the functions, shape (len(functions), len(r))
+        """
+        return np.array([f.evaluate(r) for f in functions], dtype=float).reshape(len(functions), len(r))
+
     @lru_cache(maxsize=128)
     def volume(self, cutoff):
         """Compute the volume of this pairwise function
@@ -85,11 +135,13 @@ class Histogram(AbstractPairwise):
         self.width = width
 
     def __call__(self, r_ij):
-        return np.logical_and(
-            np.greater_equal(r_ij, self.start),
-            np.less(r_ij, self.start + self.width),
-            dtype=np.float,
-        )
+        return np.logical_and(np.greater_equal(r_ij, self.start), np.less(r_ij, self.start + self.width)).astype(float)
+
+    @classmethod
+    def _evaluate_functions(cls, functions, r):
+        starts = np.array([f.start for f in functions], dtype=float)[:, None]
+        ends = starts + np.array([f.width for f in functions], dtype=float)[:, None]
+        return np.logical_and(np.greater_equal(r, starts), np.less(r, ends)).astype(float)
 
     def volume(self, cutoff):
         return 4.0 / 3 * np.pi * (min(self.start + self.width, cutoff) ** 3 - self.start ** 3)
@@ -111,6 +163,12 @@ class Gaussian(AbstractPairwise):
     def __call__(self, r_ij):
         return np.exp(-1 * np.power(np.subtract(r_ij, self.center) / self.width, 2))
 
+    @classmethod
+    def _evaluate_functions(cls, functions, r):
+        centers = np.array([f.center for f in functions], dtype=float)[:, None]
+        widths = np.array([f.width for f in functions], dtype=float)[:, None]
+        return np.exp(-1 * np.power(np.subtract(r, centers) / widths, 2))
+
     def volume(self, cutoff):
         return (
             pi
@@ -138,6 +196,10 @@ class Cosine(AbstractPairwise):
     def __call__(self, r_ij):
         return np.cos(np.multiply(r_ij, self.a))
 
+    @classmethod
+    def _evaluate_functions(cls, functions, r):
+        return np.cos(np.multiply(r, np.array([f.a for f in functions], dtype=float)[:, None]))
+
     def volume(self, cutoff):
         return (
             4
@@ -161,6 +223,10 @@ class Sine(AbstractPairwise):
     def __call__(self, r_ij):
         return np.sin(np.multiply(r_ij, self.a))
 
+    @classmethod
+    def _evaluate_functions(cls, functions, r):
+        return np.sin(np.multiply(r, np.array([f.a for f in functions], dtype=float)[:, None]))
+
     def volume(self, cutoff):
         return (
             4
@@ -187,3 +253,7 @@ class Bessel(AbstractPairwise):
 
     def __call__(self, r_ij):
         return jv(self.n, r_ij)
+
+    @classmethod
+    def _evaluate_functions(cls, functions, r):
+        return jv(np.array([f.n for f in functions])[:, None], r)
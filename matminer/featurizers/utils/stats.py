@@ -32,6 +32,16 @@ class PropertyStats(object):
     You can, of course, call the statistical functions directly. All take at
     least two arguments.  The first is the data being assessed and the second,
     optional, argument is the weights.
+
+    Many lists of values can be assessed at once with ``calc_stats``, which
+    takes a 2D array with one list of values per row and computes several
+    statistics of every row in a single vectorized call::
+
+        x = [[1, 2, 3], [4, 5, 6]]
+        PropertyStats.calc_stats(x, ['mean', 'maximum']) # [[2, 3], [5, 6]]
+
+    Rows with different numbers of values are handled by passing a boolean
+    ``mask`` marking which entries of each row are used.
     """
 
     @staticmethod
@@ -51,6 +61,48 @@ class PropertyStats(object):
         statistics = stat.split("::")
         return getattr(PropertyStats, statistics[0])(data_lst, weights, *statistics[1:])
 
+    @staticmethod
+    def calc_stats(data, stats, weights=None, mask=None):
+        """
+        Compute several property statistics for many lists of values at once
+
+        Supports all statistics that produce a single number: minimum,
+        maximum, range, mean, inverse_mean, avg_dev, std_dev, skewness,
+        kurtosis, geom_std_dev, mode, holder_mean and quantile. The results
+        match those of ``calc_stat`` applied to each row.
+
+        Args:
+            data (2D array of floats): values, one list of values per row
+            stats ([str]): Names of the statistics to compute, using the same
+                format as ``calc_stat`` (e.g., "holder_mean::2")
+            weights (2D array of floats): (Optional) weights for each value
+            mask (2D array of bools): (Optional) which values of each row to
+                use. By default, all values are used
+        Returns:
+            (ndarray) statistics, shape (n_rows, n_stats)
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        if mask is None:
+            mask = np.ones(data.shape, dtype=bool)
+        else:
+            mask = np.broadcast_to(np.asarray(mask, dtype=bool), data.shape)
+        weighted = weights is not None
+        if weighted:
+            weights = np.where(mask, np.broadcast_to(np.asarray(weights, dtype=float), data.shape), 0.0)
+        else:
+            weights = mask.astype(float)
+        batch = _BatchStats(np.where(mask, data, 0.0), weights, mask, weighted)
+
+        output = np.empty((data.shape[0], len(stats)))
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for i, stat in enumerate(stats):
+                statistics = stat.split("::")
+                func = getattr(batch, statistics[0], None)
+                if statistics[0].startswith("_") or func is None:
+                    raise ValueError("Statistic not supported by calc_stats: {}".format(stat))
+                output[:, i] = func(*statistics[1:])
+        return output
+
     @staticmethod
     def minimum(data_lst, weights=None):
         """Minimum value in a list
@@ -338,3 +390,128 @@ class PropertyStats(object):
         """
         q = float(q)
         return np.quantile(data_lst, q=q)
+
+
+class _BatchStats:
+    """Vectorized versions of the PropertyStats statistics
+
+    Operates on the rows of 2D arrays of values. Entries that are not part of a
+    row are marked by `mask`, and their values and weights are zero.
+    Intermediate results shared by several statistics are computed only once.
+
+    Args:
+        data (ndarray): values, with masked entries set to zero
+        weights (ndarray): weights, with masked entries set to zero
+        mask (ndarray): which entries of each row are used
+        weighted (bool): whether the weights were provided by the user. The
+            unweighted versions of some statistics use different formulae
+    """
+
+    def __init__(self, data, weights, mask, weighted):
+        self.data = data
+        self.weights = weights
+        self.mask = mask
+        self.weighted = weighted
+        self.count = mask.sum(axis=1)
+        self.total_weight = weights.sum(axis=1)
+        self.has_nan = np.logical_and(np.isnan(data), mask).any(axis=1)
+        self._mean = None
+
+    def _masked(self, fill):
+        return np.where(self.mask, self.data, fill)
+
+    def _moment(self, data, order, mean):
+        """Weighted central moment of each row"""
+        return (self.weights * np.power(data - mean[:, None], order)).sum(axis=1) / self.total_weight
+
+    def minimum(self):
+        return np.where(self.has_nan, np.nan, self._masked(np.inf).min(axis=1))
+
+    def maximum(self):
+        return np.where(self.has_nan, np.nan, self._masked(-np.inf).max(axis=1))
+
+    def range(self):
+        return self.maximum() - self.minimum()
+
+    def mean(self):
+        if self._mean is None:
+            self._mean = (self.weights * self.data).sum(axis=1) / self.total_weight
+        return self._mean
+
+    def inverse_mean(self):
+        inverse = np.where(self.mask, 1.0 / self._masked(1.0), 0.0)
+        return (self.weights * inverse).sum(axis=1) / self.total_weight
+
+    def avg_dev(self):
+        mean = self.mean()
+        return (self.weights * np.abs(self.data - mean[:, None])).sum(axis=1) / self.total_weight
+
+    def std_dev(self):
+        if self.weighted:
+            beta = self.total_weight / (self.total_weight ** 2 - (self.weights ** 2).sum(axis=1))
+            result = np.sqrt(beta * self._moment(self.data, 2, self.mean()) * self.total_weight)
+        else:
+            result = np.sqrt(self._moment(self.data, 2, self.mean()))
+        return np.where(self.count == 1, 0.0, result)
+
+    def skewness(self):
+        mean = self.mean()
+        u2 = self._moment(self.data, 2, mean)
+        u3 = self._moment(self.data, 3, mean)
+        if self.weighted:
+            zero = np.isclose(u3, 0)
+        else:
+            zero = u2 <= (np.finfo(float).eps * mean) ** 2
+        result = np.where(zero, 0.0, u3 / u2 ** 1.5)
+        return np.where(self.count == 1, 0.0, result)
+
+    def kurtosis(self):
+        mean = self.mean()
+        u2 = self._moment(self.data, 2, mean)
+        u4 = self._moment(self.data, 4, mean)
+        if self.weighted:
+            zero = np.isclose(u4 * self.total_weight, 0)
+        else:
+            zero = u2 <= (np.finfo(float).eps * mean) ** 2
+        result = np.where(zero, 0.0, u4 / u2 ** 2)
+        return np.where(self.count == 1, 0.0, result)
+
+    def geom_std_dev(self):
+        mean = self.holder_mean(0, weighted=True)
+        beta = self.total_weight / (self.total_weight ** 2 - (self.weights ** 2).sum(axis=1))
+        dev = np.where(self.mask, np.log(self._masked(1.0) / mean[:, None]), 0.0)
+        return np.sqrt(np.exp(beta * (self.weights * dev ** 2).sum(axis=1)))
+
+    def mode(self):
+        data = self._masked(np.inf)
+        if self.weighted:
+            # Entries with the largest weight
+            most_freq = np.isclose(self.weights, self.weights.max(axis=1)[:, None]) & self.mask
+        else:
+            # Entries whose value occurs most often
+            counts = ((data[:, :, None] == data[:, None, :]) & self.mask[:, None, :]).sum(axis=2)
+            counts = np.where(self.mask, counts, 0)
+            most_freq = counts == counts.max(axis=1)[:, None]
+        return np.where(most_freq, data, np.inf).min(axis=1)
+
+    def holder_mean(self, power=1, weighted=None):
+        power = float(power)
+        weights = self.weights
+        if not (self.weighted if weighted is None else weighted):
+            weights = self.mask.astype(float)
+        total_weight = weights.sum(axis=1)
+        data = self._masked(1.0)
+
+        if power == -1:
+            return total_weight / (weights / data).sum(axis=1)
+        elif power == 0:
+            return np.prod(np.power(data, weights / total_weight[:, None]), axis=1)
+        else:
+            return np.power((weights * np.power(data, power)).sum(axis=1) / total_weight, 1.0 / power)
+
+    def quantile(self, q=0.5):
+        q = float(q)
+        if self.mask.all():
+            return np.quantile(self.data, q=q, axis=1)
+        # nanquantile skips the masked entries, but would also skip NaN values in a row
+        return np.where(self.has_nan, np.nan, np.nanquantile(self._masked(np.nan), q=q, axis=1))
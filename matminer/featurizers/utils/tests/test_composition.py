@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+from pymatgen.core import Composition
+from pymatgen.core.periodic_table import Specie
+
+from matminer.featurizers.utils.composition import MAX_Z, CompositionArrays, get_property_table
+from matminer.utils.data import MagpieData
+
+
+class TestCompositionArrays(unittest.TestCase):
+    def test_encoding(self):
+        comps = [
+            Composition("Fe2O3"),
+            Composition({Specie("Fe", 2): 1, Specie("O", -2): 1}),
+            Composition("Al"),
+            "not a composition",
+        ]
+        arrays = CompositionArrays(comps)
+        self.assertEqual((4, 2), arrays.z.shape)
+        self.assertEqual([True, True, True, False], arrays.valid.tolist())
+        self.assertEqual([2, 2, 1, 0], arrays.n_elements().tolist())
+        self.assertEqual([13, 0], arrays.z[2].tolist())
+        np.testing.assert_allclose([1, 0], arrays.fractions[2])
+
+        fractions = arrays.sparse_fractions().toarray()
+        self.assertEqual((4, MAX_Z), fractions.shape)
+        self.assertAlmostEqual(0.4, fractions[0, 25])
+        self.assertAlmostEqual(0.6, fractions[0, 7])
+        self.assertAlmostEqual(0.5, fractions[1, 25])
+        self.assertEqual(0, fractions[3].sum())
+
+    def test_property_table(self):
+        table, missing = get_property_table(MagpieData(), ["Number", "Electronegativity"])
+        self.assertEqual((MAX_Z + 1, 2), table.shape)
+        self.assertTrue(missing[0].all())
+        self.assertFalse(missing[1:].any())
+        self.assertEqual(26, table[26, 0])
+
+        arrays = CompositionArrays([Composition("Fe2O3")])
+        np.testing.assert_allclose([[26, 8]], arrays.gather(table)[:, :, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
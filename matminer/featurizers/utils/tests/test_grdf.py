@@ -7,6 +7,7 @@ from matminer.featurizers.utils.grdf import (
     Cosine,
     Bessel,
     Sine,
+    evaluate_functions,
 )
 
 import numpy as np
@@ -52,6 +53,15 @@ class GRDFTests(PymatgenTest):
         self.assertArrayAlmostEqual([jv(2, 1)], [b(1)])
         self.assertAlmostEqual(163.355, b.volume(5), 2)
 
+    def test_evaluate_functions(self):
+        functions = [Gaussian(1, 0), Histogram(1, 2), Gaussian(2, 3), Cosine(2), Sine(3), Bessel(1), Bessel(2)]
+        r = [0.5, 1.0, 2.5, 4.0]
+        values = evaluate_functions(functions, r)
+        self.assertEqual((7, 4), values.shape)
+        for f, row in zip(functions, values):
+            self.assertArrayAlmostEqual(f(np.array(r)), row)
+        self.assertEqual((7, 0), evaluate_functions(functions, []).shape)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -88,3 +88,64 @@ class TestPropertyStats(TestCase):
     def test_quantile(self):
         self._run_test("quantile::0.5", 1, 1, 0.5, 0.5)
         self._run_test("quantile::0.3", 1, 1, 0.3, 0.3)
+
+    def test_calc_stats(self):
+        stats = [
+            "minimum",
+            "maximum",
+            "range",
+            "mean",
+            "avg_dev",
+            "std_dev",
+            "skewness",
+            "kurtosis",
+            "mode",
+            "holder_mean::0",
+            "holder_mean::2",
+            "quantile::0.3",
+        ]
+        expected = [
+            [1, 1, 0, 1, 0, 0, 0, 0, 1, 1, 1, 1],
+            [0, 1.5, 1.5, 2.0 / 3, 5.0 / 9, 0.623609564, 0.38180177, 1.5, 0, 0, sqrt(5.0 / 6), 0.3],
+        ]
+        expected_weighted = [
+            [1, 1, 0, 1, 0, 0, 0, 0, 1, 1, 1, 1],
+            [0, 1.5, 1.5, 5.0 / 7, 0.448979592, 0.694365075, 0.559451361, 1.9403292181, 0.5, 0, 0.88640526, 0.3],
+        ]
+
+        # Rows of the same length
+        data = [self.sample_1, self.sample_2]
+        weights = [self.sample_1_weights, self.sample_2_weights]
+        np.testing.assert_array_almost_equal(expected, PropertyStats.calc_stats(data, stats))
+        np.testing.assert_array_almost_equal(expected_weighted, PropertyStats.calc_stats(data, stats, weights))
+
+        # Rows of different lengths, padded with values that must be ignored
+        data = [[1, 1, 1, 0, 0], [0.5, 1.5, 0, 0, 0], [1, 2, 10, -3, 7]]
+        weights = [[1, 1, 1, 0, 0], [2, 1, 0.5, 0, 0], [2, 1, 9, 9, 9]]
+        mask = [[True] * 3 + [False] * 2, [True] * 3 + [False] * 2, [True] * 2 + [False] * 3]
+        result = PropertyStats.calc_stats(data, stats, mask=mask)
+        np.testing.assert_array_almost_equal(expected, result[:2])
+        result = PropertyStats.calc_stats(data, stats, weights, mask)
+        np.testing.assert_array_almost_equal(expected_weighted, result[:2])
+        self.assertAlmostEqual(4.0 / 3, result[2, stats.index("mean")])
+        self.assertAlmostEqual(1, result[2, stats.index("mode")])
+
+        # Other statistics
+        result = PropertyStats.calc_stats([[0.5, 1.5, 1], [1, 1, 2]], ["geom_std_dev", "holder_mean::-1"])
+        np.testing.assert_array_almost_equal([1.166860716, 1.2], result[:, 0:2].diagonal(), 3)
+        result = PropertyStats.calc_stats([[0.5, 1.5, 1]], ["geom_std_dev"], [[2, 1, 0]])
+        self.assertAlmostEqual(1.352205875, result[0, 0])
+        result = PropertyStats.calc_stats([[1, np.nan]], ["minimum", "maximum", "range", "mean"])
+        self.assertTrue(np.isnan(result).all())
+
+        # NaN values within the mask are propagated, as by calc_stat
+        result = PropertyStats.calc_stats(
+            [[1, np.nan, 0], [1, 2, np.nan]], ["quantile::0.5"], mask=[[True, True, False]] * 2
+        )
+        self.assertTrue(np.isnan(result[0, 0]))
+        self.assertTrue(np.isnan(PropertyStats.calc_stat([1, np.nan], "quantile::0.5")))
+        self.assertAlmostEqual(1.5, result[1, 0])
+
+        # Statistics that do not produce a single number
+        with self.assertRaises(ValueError):
+            PropertyStats.calc_stats(data, ["sorted"])
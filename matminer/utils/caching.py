@@ -1,9 +1,516 @@
 """Provides utility functions for caching the results of expensive operations,
-such as determining the nearest neighbors of atoms in a structure"""
+such as determining the nearest neighbors of atoms in a structure or
+analyzing its symmetry"""
 
-from functools import lru_cache
+import copy
+import hashlib
+import inspect
+import os
+import pickle
+from collections import OrderedDict, namedtuple
+from enum import Enum
+from numbers import Integral, Number
 
-from pymatgen.core.structure import IStructure, Structure
+import numpy as np
+import pandas as pd
+from pymatgen.analysis.ewald import EwaldSummation
+from pymatgen.core.composition import Composition
+from pymatgen.core.structure import IStructure, SiteCollection
+from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "evictions"])
+
+
+class LRUCache:
+    """A size-bounded mapping that evicts the least recently used entries
+
+    Args:
+        maxsize (int): Maximum number of entries. None for no limit.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Get an entry, marking it as recently used
+
+        Args:
+            key: Key of the entry
+            default: Value returned if the key is not in the cache
+        Returns:
+            The cached value, or default
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Add an entry, evicting the least recently used entries if needed
+
+        Args:
+            key: Key of the entry
+            value: Value to store
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def set_maxsize(self, maxsize):
+        """Change the maximum number of entries, evicting entries if needed
+
+        Args:
+            maxsize (int): Maximum number of entries. None for no limit.
+        """
+        self.maxsize = maxsize
+        if maxsize is not None:
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def cache_info(self):
+        """Get the cache statistics
+
+        Returns:
+            (CacheInfo) numbers of hits, misses and evictions, and the
+                maximum and current number of entries
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data), self.evictions)
+
+    def cache_clear(self):
+        """Remove all entries and reset the statistics"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+def get_structure_key(structure):
+    """Get a hash identifying the contents of a structure
+
+    The hash covers the lattice, species, fractional coordinates (or Cartesian
+    coordinates for molecules), site properties and charge, so structures
+    that are equal site-by-site have the same key regardless of whether
+    they are the same Python object. It is much cheaper to compute than
+    `hash(IStructure)` or `str(structure)`.
+
+    Args:
+        structure (SiteCollection): Structure or Molecule
+    Returns:
+        (str) hex digest
+    """
+    h = hashlib.sha1()
+    lattice = getattr(structure, "lattice", None)
+    if lattice is not None:
+        h.update(np.ascontiguousarray(lattice.matrix, dtype=np.float64).tobytes())
+        h.update(np.ascontiguousarray(structure.frac_coords, dtype=np.float64).tobytes())
+    else:
+        h.update(np.ascontiguousarray(structure.cart_coords, dtype=np.float64).tobytes())
+    h.update("\0".join(site.species_string for site in structure).encode())
+    site_properties = structure.site_properties
+    if site_properties:
+        h.update(repr(sorted(site_properties.items())).encode())
+    h.update(repr(getattr(structure, "_charge", None)).encode())
+    return h.hexdigest()
+
+
+def get_composition_key(composition):
+    """Get a hash identifying a composition
+
+    Args:
+        composition (Composition): Composition
+    Returns:
+        (str) hex digest
+    """
+    items = sorted((str(sp), float(amt)) for sp, amt in composition.items())
+    return hashlib.sha1(repr(items).encode()).hexdigest()
+
+
+def get_input_key(x):
+    """Get a hash identifying the inputs to a featurizer
+
+    Structures and compositions are identified by their contents (see
+    `get_structure_key` and `get_composition_key`), and other inputs by their
+    pickled representation.
+
+    Args:
+        x (tuple): Arguments to `featurize`
+    Returns:
+        (str) hex digest, or None if the inputs cannot be hashed
+    """
+    h = hashlib.sha1()
+    for arg in x:
+        if isinstance(arg, SiteCollection):
+            h.update(b"S" + get_structure_key(arg).encode())
+        elif isinstance(arg, Composition):
+            h.update(b"C" + get_composition_key(arg).encode())
+        elif isinstance(arg, np.ndarray) and arg.dtype != object:
+            h.update(b"A" + repr((arg.dtype, arg.shape)).encode() + np.ascontiguousarray(arg).tobytes())
+        elif arg is None or isinstance(arg, (str, bool, int, float)):
+            h.update(b"V" + repr(arg).encode())
+        else:
+            try:
+                h.update(b"P" + pickle.dumps(arg))
+            except Exception:
+                return None
+    return h.hexdigest()
+
+
+def get_params_token(obj):
+    """Make a deterministic text representation of the settings of an object
+
+    Unlike `repr`, the output is never abbreviated and the settings of any
+    nested estimators (e.g., the featurizers of a MultipleFeaturizer) are
+    included in full. Objects other than numbers, strings and containers
+    (e.g., NearNeighbors classes and data sources) are represented by their
+    `as_dict()` if they are MSONable, or else by the constructor arguments
+    stored on them as attributes of the same name, so the output is the same
+    in every process and differs between differently-configured objects.
+
+    Args:
+        obj: Featurizer, or one of its parameters
+    Returns:
+        (str) token, or None if the object cannot be represented
+            deterministically
+    """
+    if inspect.isfunction(obj) or inspect.isclass(obj) or inspect.isbuiltin(obj):
+        # Lambdas and functions defined inside other functions have no unique name
+        if "<" in obj.__qualname__:
+            return None
+        return "{}.{}".format(obj.__module__, obj.__qualname__)
+    elif hasattr(obj, "get_params"):
+        try:
+            params = obj.get_params(deep=False)
+        except AttributeError:
+            # Not all constructor arguments are stored as attributes
+            return None
+        return _join_params_token(obj.__class__.__name__, params)
+    elif isinstance(obj, dict):
+        items = [(get_params_token(k), get_params_token(v)) for k, v in obj.items()]
+        if any(k is None or v is None for k, v in items):
+            return None
+        return "{%s}" % ", ".join("{}: {}".format(k, v) for k, v in sorted(items))
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        tokens = [get_params_token(x) for x in obj]
+        if any(t is None for t in tokens):
+            return None
+        if isinstance(obj, (set, frozenset)):
+            tokens = sorted(tokens)
+        return "[%s]" % ", ".join(tokens)
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return get_params_token(obj.tolist())
+        return "ndarray({}, {}, {})".format(
+            obj.dtype, obj.shape, hashlib.sha1(np.ascontiguousarray(obj).tobytes()).hexdigest()
+        )
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        try:
+            values = pd.util.hash_pandas_object(obj).values
+        except TypeError:
+            return None
+        labels = get_params_token(list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name)
+        return "{}({}, {})".format(obj.__class__.__name__, labels, hashlib.sha1(values.tobytes()).hexdigest())
+
+    elif obj is None or isinstance(obj, (bool, Number, str, bytes, Enum, np.generic)):
+        return repr(obj)
+
+    # The repr of other objects may omit their settings (e.g., NearNeighbors)
+    name = "{}.{}".format(obj.__class__.__module__, obj.__class__.__qualname__)
+    if callable(getattr(obj, "as_dict", None)):
+        try:
+            return _join_params_token(name, obj.as_dict())
+        except Exception:
+            return None
+    return _join_params_token(name, _get_init_params(obj))
+
+
+def _join_params_token(name, params):
+    """Make the token of an object from its class name and its settings
+
+    Args:
+        name (str): Name of the class
+        params (dict): Settings of the object. None if not known
+    Returns:
+        (str) token, or None if any of the settings cannot be represented
+    """
+    if params is None:
+        return None
+    tokens = []
+    for k in sorted(params):
+        token = get_params_token(params[k])
+        if token is None:
+            return None
+        tokens.append("{}={}".format(k, token))
+    return "{}({})".format(name, ", ".join(tokens))
+
+
+def _get_init_params(obj):
+    """Get the constructor arguments of an object, as stored on the object
+
+    Args:
+        obj: Object to study
+    Returns:
+        (dict) value of each argument of `__init__`, or None if they are not
+            all stored as attributes of the same name
+    """
+    init = obj.__class__.__init__
+    if init is object.__init__:
+        # No arguments, so the state of the object is only known if it has none
+        return {} if not getattr(obj, "__dict__", None) else None
+    try:
+        parameters = list(inspect.signature(init).parameters.values())[1:]
+    except (TypeError, ValueError):
+        return None
+    params = {}
+    for p in parameters:
+        if p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) or not hasattr(obj, p.name):
+            return None
+        params[p.name] = getattr(obj, p.name)
+    return params
+
+
+# Number of entries in each on-disk feature cache, keyed by directory, as last
+#  counted by this process plus the entries it has written since. Kept at module
+#  level, as worker processes receive a fresh copy of the FeatureCache with each task
+_disk_sizes = {}
+
+
+class FeatureCache:
+    """An in-memory and (optionally) on-disk cache of computed features
+
+    Entries are keyed by a hash of the featurizer class, its settings and
+    feature labels, and the contents of its inputs (see `get_input_key`), so
+    featurizing an equivalent structure or composition again with an
+    equivalently-configured featurizer is a lookup, even across experiments
+    if a directory is used. Only successful featurizations are cached, and
+    nothing is cached for featurizers whose settings cannot be represented
+    deterministically (see `get_params_token`).
+
+    Enable it for a featurizer with `featurizer.set_feature_cache(cache)`. The
+    same cache can be shared by many featurizers. When featurizing in
+    parallel, each worker process holds its own copy of the in-memory cache,
+    while the on-disk cache is shared. Entries removed from disk by another
+    process are treated as misses, and the number of entries on disk is
+    recounted before evicting, so `disk_maxsize` holds across processes up to
+    the entries written between two evictions.
+
+    Args:
+        maxsize (int): Maximum number of entries held in memory.
+        directory (str): Directory for the on-disk cache. None to only cache
+            in memory. Only use directories you trust, as entries are
+            unpickled when loaded.
+        disk_maxsize (int): Maximum number of entries held on disk. When it
+            is exceeded, the least recently used 10% of entries are removed.
+            None for no limit.
+        use_symmetry (bool): Whether to identify a site given as a
+            `(structure, index)` pair by the first of its set of
+            symmetrically-equivalent sites (see `get_equivalent_atoms`), so
+            the features of equivalent sites are computed only once. Only
+            use it for site featurizers whose features do not change under
+            the symmetry operations of the crystal.
+    """
+
+    def __init__(self, maxsize=10000, directory=None, disk_maxsize=None, use_symmetry=False):
+        self.memory = LRUCache(maxsize)
+        self.directory = directory
+        self.disk_maxsize = disk_maxsize
+        self.use_symmetry = use_symmetry
+        self.disk_hits = 0
+        self.disk_evictions = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            _disk_sizes[directory] = len(self._disk_files())
+
+    def make_key(self, featurizer, x):
+        """Get the cache key for featurizing some inputs with a featurizer
+
+        Args:
+            featurizer (BaseFeaturizer): Featurizer
+            x (tuple): Arguments to `featurizer.featurize`
+        Returns:
+            (str) key, or None if the inputs or the settings of the
+                featurizer cannot be hashed
+        """
+        if self.use_symmetry and len(x) == 2 and isinstance(x[0], IStructure) and isinstance(x[1], Integral):
+            x = (x[0], int(get_equivalent_atoms(x[0])[x[1]]))
+        input_key = get_input_key(x)
+        if input_key is None:
+            return None
+        token = get_params_token(featurizer)
+        if token is None:
+            return None
+        token += repr(featurizer.feature_labels())
+        return hashlib.sha1((token + input_key).encode()).hexdigest()
+
+    def get(self, key):
+        """Get cached features
+
+        Args:
+            key (str): Key from `make_key`
+        Returns:
+            (list) features, or None if not cached
+        """
+        features = self.memory.get(key)
+        if features is None and self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as fp:
+                    features = pickle.load(fp)
+                os.utime(path)
+            except FileNotFoundError:
+                # Not cached, or evicted by another process
+                pass
+            if features is not None:
+                self.disk_hits += 1
+                self.memory.put(key, features)
+        return None if features is None else copy.copy(features)
+
+    def put(self, key, features):
+        """Cache features
+
+        Args:
+            key (str): Key from `make_key`
+            features (list): Features to cache
+        """
+        self.memory.put(key, features)
+        if self.directory is not None:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            exists = os.path.isfile(path)
+            tmp_path = "{}.{}.tmp".format(path, os.getpid())
+            with open(tmp_path, "wb") as fp:
+                pickle.dump(features, fp)
+            os.replace(tmp_path, path)
+            if not exists:
+                if self.directory not in _disk_sizes:
+                    _disk_sizes[self.directory] = len(self._disk_files())
+                else:
+                    _disk_sizes[self.directory] += 1
+            if self.disk_maxsize is not None and _disk_sizes[self.directory] > self.disk_maxsize:
+                self._evict_disk()
+
+    def cache_info(self):
+        """Get the cache statistics
+
+        Returns:
+            (dict) hits in memory and on disk, misses, evictions from memory
+                and disk, and the current number of entries in memory and on
+                disk
+        """
+        info = self.memory.cache_info()
+        return {
+            "hits": info.hits,
+            "disk_hits": self.disk_hits,
+            "misses": info.misses - self.disk_hits,
+            "evictions": info.evictions,
+            "disk_evictions": self.disk_evictions,
+            "currsize": info.currsize,
+            "disk_currsize": _disk_sizes.get(self.directory, 0),
+        }
+
+    def cache_clear(self):
+        """Remove all entries, including those on disk, and reset statistics"""
+        self.memory.cache_clear()
+        for path in self._disk_files():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        if self.directory is not None:
+            _disk_sizes[self.directory] = 0
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def _disk_files(self):
+        if self.directory is None:
+            return []
+        return [
+            os.path.join(self.directory, d, f)
+            for d in os.listdir(self.directory)
+            if os.path.isdir(os.path.join(self.directory, d))
+            for f in os.listdir(os.path.join(self.directory, d))
+            if f.endswith(".pkl")
+        ]
+
+    def _evict_disk(self):
+        """Remove the least recently used 10% of the entries on disk
+
+        The entries are recounted first, as other processes may have added or
+        removed entries since this process last counted them.
+        """
+        paths = []
+        for path in self._disk_files():
+            try:
+                paths.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                pass
+        n_entries = len(paths)
+        if n_entries > self.disk_maxsize:
+            n_keep = int(self.disk_maxsize * 0.9)
+            for _, path in sorted(paths)[: n_entries - n_keep]:
+                try:
+                    os.remove(path)
+                    self.disk_evictions += 1
+                except FileNotFoundError:
+                    pass
+            n_entries = n_keep
+        _disk_sizes[self.directory] = n_entries
+
+    def __getstate__(self):
+        # Workers start with an empty in-memory cache
+        state = self.__dict__.copy()
+        state["memory"] = LRUCache(self.memory.maxsize)
+        return state
+
+
+# Neighbor lists shared by all featurizers in this process, keyed by the
+#  neighbor-finding settings and the contents of the structure
+_nn_cache = LRUCache(maxsize=16)
+
+
+def get_nn_cache():
+    """Get the cache of neighbor lists shared by all featurizers
+
+    Use `get_nn_cache().cache_info()` for the number of hits, misses and
+    evictions, and `get_nn_cache().cache_clear()` to empty it.
+
+    Returns:
+        (LRUCache)
+    """
+    return _nn_cache
+
+
+def set_nn_cache_size(maxsize):
+    """Set the maximum number of entries in the neighbor list cache
+
+    Each entry holds the neighbors of all sites of one structure for one
+    neighbor-finding method, so the cache should be at least as large as
+    the number of different methods used by the featurizers run together.
+
+    Args:
+        maxsize (int): Maximum number of entries. None for no limit.
+    """
+    _nn_cache.set_maxsize(maxsize)
 
 
 def get_nearest_neighbors(method, structure, site_idx):
@@ -24,26 +531,336 @@ def get_all_nearest_neighbors(method, structure):
 
     Args:
         method (NearNeighbor) - Method used to compute nearest neighbors
-        structure (IStructure) - Structure to study
+        structure (Structure) - Structure to study
     Returns:
         Output of `method.get_all_nn_info(structure)`
     """
+    key = (method, get_structure_key(structure))
+    nns = _nn_cache.get(key)
+    if nns is None:
+        nns = method.get_all_nn_info(structure)
+        _nn_cache.put(key, nns)
+    return nns
 
-    # pymatgen does not hash Structure objects, so we need
-    #  to convert from Structure to the immutatble IStructure method
-    if isinstance(structure, Structure):
-        structure = IStructure.from_sites(structure)
-    return _get_all_nearest_neighbors(method, structure)
 
+def get_nn_data(method, structure, site_idx):
+    """Get the neighbor data of a site computed by a CrystalNN-like method
 
-@lru_cache(maxsize=1)
-def _get_all_nearest_neighbors(method, structure):
-    """Get the nearest neighbor list of a structure
+    Results are computed on demand for each site, and stored for all sites of
+    a structure in one entry of the neighbor list cache.
 
     Args:
-        method (NearNeighbor) - Method used to compute nearest neighbors
-        structure (IStructure) - Structure to study
+        method (CrystalNN) - Method used to compute nearest neighbors
+        structure (Structure) - Structure to study
+        site_idx (int) - Index of site to study
     Returns:
-        Output of `method.get_all_nn_info(structure)`
+        Output of `method.get_nn_data(structure, site_idx)`
+    """
+    key = (method, get_structure_key(structure), "get_nn_data")
+    sites = _nn_cache.get(key)
+    if sites is None:
+        sites = {}
+        _nn_cache.put(key, sites)
+    if site_idx not in sites:
+        sites[site_idx] = method.get_nn_data(structure, site_idx)
+    return sites[site_idx]
+
+
+def get_structure_environments(geom_finder, structure, indices, maximum_distance_factor=None, use_symmetry=False):
+    """Get the ChemEnv structure environments of sites in a structure
+
+    The environments of all requested sites not computed before are computed
+    with a single call to `compute_structure_environments`, so the local
+    geometry finder is set up once per structure rather than once per site.
+    Results are stored for all sites of a structure in one entry of the
+    neighbor list cache.
+
+    Args:
+        geom_finder (LocalGeometryFinder) - Finder used to compute the environments
+        structure (Structure) - Structure to study
+        indices ([int]) - Indices of the sites to study
+        maximum_distance_factor (float) - Passed to `compute_structure_environments`
+        use_symmetry (bool) - Whether to compute the environment of only one site of
+            each set of symmetrically-equivalent sites, and use it for all sites in the set
+    Returns:
+        ([(StructureEnvironments, int)]) for each site, the structure environments
+            holding its environment and the index of the site they describe, which is
+            an equivalent site if use_symmetry is True
+    """
+    key = (geom_finder, get_structure_key(structure), "get_structure_environments", maximum_distance_factor)
+    sites = _nn_cache.get(key)
+    if sites is None:
+        sites = {}
+        _nn_cache.put(key, sites)
+
+    targets = [int(i) for i in indices]
+    if use_symmetry:
+        equivalent_atoms = get_equivalent_atoms(structure)
+        targets = [int(equivalent_atoms[i]) for i in targets]
+    missing = sorted(set(targets).difference(sites))
+    if missing:
+        geom_finder.setup_structure(structure=structure)
+        se = geom_finder.compute_structure_environments(
+            only_indices=missing, maximum_distance_factor=maximum_distance_factor
+        )
+        for i in missing:
+            sites[i] = se
+    return [(sites[i], i) for i in targets]
+
+
+def get_all_neighbors(structure, r):
+    """Get the neighbors of all sites in a structure within a cutoff
+
+    Args:
+        structure (Structure) - Structure to study
+        r (float) - Cutoff radius
+    Returns:
+        Output of `structure.get_all_neighbors(r)`
+    """
+    key = ("get_all_neighbors", float(r), get_structure_key(structure))
+    nns = _nn_cache.get(key)
+    if nns is None:
+        nns = structure.get_all_neighbors(r)
+        _nn_cache.put(key, nns)
+    return nns
+
+
+def get_neighbor_list(structure, r):
+    """Get the neighbors of all sites in a structure within a cutoff, as arrays
+
+    Lists the same neighbors as `get_all_neighbors` with one entry per pair of
+    a center site and a neighbor, without creating a `PeriodicNeighbor` for
+    each pair. The neighbor list of a structure is shared by all callers: a
+    list found for a larger cutoff is reused for smaller cutoffs by selecting
+    the pairs within the cutoff. The arrays are read-only.
+
+    Args:
+        structure (Structure) - Structure to study
+        r (float) - Cutoff radius
+    Returns:
+        center_indices (ndarray) - Index of the center site of each pair
+        neighbor_indices (ndarray) - Index of the neighbor of each pair
+        images (ndarray) - Lattice translation of each neighbor, shape (n_pairs, 3)
+        distances (ndarray) - Distance between the center site and its neighbor
+    """
+    r = float(r)
+    key = ("get_neighbor_list", get_structure_key(structure))
+    entry = _nn_cache.get(key)
+    if entry is None or entry[0] < r:
+        arrays = structure.get_neighbor_list(r)
+        for array in arrays:
+            array.setflags(write=False)
+        entry = (r, arrays)
+        _nn_cache.put(key, entry)
+
+    cached_r, arrays = entry
+    if cached_r == r:
+        return arrays
+    within = arrays[3] <= r
+    return tuple(array[within] for array in arrays)
+
+
+# Symmetry analyses shared by all featurizers in this process, keyed by the
+#  contents of the structure and the symmetry tolerances
+_symmetry_cache = LRUCache(maxsize=16)
+
+
+def get_symmetry_cache():
+    """Get the cache of symmetry analyses shared by all featurizers
+
+    Each entry holds the `SpacegroupAnalyzer` of one structure for one set of
+    tolerances, and the results derived from it (e.g., the symmetrized
+    structure). The number of misses of `get_symmetry_cache().cache_info()` is
+    the number of times spglib analyzed a structure, and the number of hits is
+    the number of analyses that were avoided.
+
+    Returns:
+        (LRUCache)
+    """
+    return _symmetry_cache
+
+
+def set_symmetry_cache_size(maxsize):
+    """Set the maximum number of entries in the symmetry analysis cache
+
+    Args:
+        maxsize (int): Maximum number of entries. None for no limit.
+    """
+    _symmetry_cache.set_maxsize(maxsize)
+
+
+def _get_symmetry_entry(structure, symprec, angle_tolerance):
+    """Get the cached symmetry analysis of a structure, creating it if needed
+
+    Args:
+        structure (Structure) - Structure to study
+        symprec (float) - Tolerance for symmetry finding
+        angle_tolerance (float) - Angle tolerance for symmetry finding
+    Returns:
+        (dict) the SpacegroupAnalyzer, as "analyzer", and any derived results
+    """
+    key = (get_structure_key(structure), symprec, float(angle_tolerance))
+    entry = _symmetry_cache.get(key)
+    if entry is None:
+        entry = {"analyzer": SpacegroupAnalyzer(structure, symprec=symprec, angle_tolerance=angle_tolerance)}
+        _symmetry_cache.put(key, entry)
+    return entry
+
+
+def get_spacegroup_analyzer(structure, symprec=0.01, angle_tolerance=5.0):
+    """Get the symmetry analyzer of a structure
+
+    The analyzer is shared by all callers that use the same tolerances on an
+    equivalent structure, and must not be modified.
+
+    Args:
+        structure (Structure) - Structure to study
+        symprec (float) - Tolerance for symmetry finding
+        angle_tolerance (float) - Angle tolerance for symmetry finding
+    Returns:
+        (SpacegroupAnalyzer)
+    """
+    return _get_symmetry_entry(structure, symprec, angle_tolerance)["analyzer"]
+
+
+def get_symmetry_dataset(structure, symprec=0.01, angle_tolerance=5.0):
+    """Get the spglib symmetry dataset of a structure
+
+    Args:
+        structure (Structure) - Structure to study
+        symprec (float) - Tolerance for symmetry finding
+        angle_tolerance (float) - Angle tolerance for symmetry finding
+    Returns:
+        (dict) Output of `SpacegroupAnalyzer.get_symmetry_dataset()`
+    """
+    return get_spacegroup_analyzer(structure, symprec, angle_tolerance).get_symmetry_dataset()
+
+
+def get_symmetrized_structure(structure, symprec=0.01, angle_tolerance=5.0):
+    """Get the symmetrized version of a structure
+
+    Args:
+        structure (Structure) - Structure to study
+        symprec (float) - Tolerance for symmetry finding
+        angle_tolerance (float) - Angle tolerance for symmetry finding
+    Returns:
+        (SymmetrizedStructure) Output of `SpacegroupAnalyzer.get_symmetrized_structure()`
+    """
+    entry = _get_symmetry_entry(structure, symprec, angle_tolerance)
+    if "symmetrized_structure" not in entry:
+        entry["symmetrized_structure"] = entry["analyzer"].get_symmetrized_structure()
+    return entry["symmetrized_structure"]
+
+
+def get_equivalent_atoms(structure, symprec=0.01, angle_tolerance=5.0):
+    """Get the map of each site to its symmetrically-equivalent sites
+
+    Args:
+        structure (Structure) - Structure to study
+        symprec (float) - Tolerance for symmetry finding
+        angle_tolerance (float) - Angle tolerance for symmetry finding
+    Returns:
+        (ndarray) index of a representative site for each site of the
+            structure. Symmetrically-equivalent sites have the same representative
+    """
+    return np.asarray(get_symmetry_dataset(structure, symprec, angle_tolerance)["equivalent_atoms"])
+
+
+def get_primitive_structure(structure, symprec=0.01, angle_tolerance=5.0):
+    """Get the primitive cell of a structure
+
+    Args:
+        structure (Structure) - Structure to study
+        symprec (float) - Tolerance for symmetry finding
+        angle_tolerance (float) - Angle tolerance for symmetry finding
+    Returns:
+        (Structure) Output of `SpacegroupAnalyzer.find_primitive()`
+    """
+    entry = _get_symmetry_entry(structure, symprec, angle_tolerance)
+    if "primitive" not in entry:
+        entry["primitive"] = entry["analyzer"].find_primitive()
+    return entry["primitive"]
+
+
+# Ewald summations shared by all featurizers in this process, keyed by the
+#  contents of the structure (including its charges) and the accuracy
+_ewald_cache = LRUCache(maxsize=4)
+
+# Accuracy used by pymatgen when none is given
+_ewald_default_accuracy = inspect.signature(EwaldSummation).parameters["acc_factor"].default
+
+
+def get_ewald_cache():
+    """Get the cache of Ewald summations shared by all featurizers
+
+    Returns:
+        (LRUCache)
+    """
+    return _ewald_cache
+
+
+def set_ewald_cache_size(maxsize):
+    """Set the maximum number of entries in the Ewald summation cache
+
+    Each entry holds the interaction matrices of all pairs of sites of one
+    structure, so large caches of large structures use much memory.
+
+    Args:
+        maxsize (int): Maximum number of entries. None for no limit.
+    """
+    _ewald_cache.set_maxsize(maxsize)
+
+
+def _get_ewald_entry(structure, accuracy):
+    """Get the cached Ewald summation of a structure, creating it if needed
+
+    Args:
+        structure (Structure) - Structure to study
+        accuracy (int) - Accuracy of the summation, number of decimal places.
+            None for the pymatgen default
+    Returns:
+        (dict) the EwaldSummation, as "ewald", and any derived results
+    """
+    if accuracy is None:
+        accuracy = _ewald_default_accuracy
+    key = (get_structure_key(structure), accuracy)
+    entry = _ewald_cache.get(key)
+    if entry is None:
+        entry = {"ewald": EwaldSummation(structure, acc_factor=accuracy)}
+        _ewald_cache.put(key, entry)
+    return entry
+
+
+def get_ewald_summation(structure, accuracy=None):
+    """Get the Ewald summation of the Coulomb interactions in a structure
+
+    The summation is shared by all callers that use the same accuracy on an
+    equivalent structure, and is computed when first used.
+
+    Args:
+        structure (Structure) - Structure to study, with oxidation states
+        accuracy (int) - Accuracy of the summation, number of decimal places.
+            None for the pymatgen default
+    Returns:
+        (EwaldSummation)
+    """
+    return _get_ewald_entry(structure, accuracy)["ewald"]
+
+
+def get_ewald_site_energies(structure, accuracy=None):
+    """Get the Coulomb energy of each site in a structure
+
+    Args:
+        structure (Structure) - Structure to study, with oxidation states
+        accuracy (int) - Accuracy of the summation, number of decimal places.
+            None for the pymatgen default
+    Returns:
+        (ndarray) energy of each site, as computed by
+            `EwaldSummation.get_site_energy`. Read-only.
     """
-    return method.get_all_nn_info(structure)
+    entry = _get_ewald_entry(structure, accuracy)
+    if "site_energies" not in entry:
+        site_energies = entry["ewald"].total_energy_matrix.sum(axis=0)
+        site_energies.setflags(write=False)
+        entry["site_energies"] = site_energies
+    return entry["site_energies"]
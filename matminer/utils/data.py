@@ -8,22 +8,169 @@ import os
 import json
 import six
 import abc
+import hashlib
+import threading
+import warnings
 import numpy as np
 import pandas as pd
 from glob import glob
 
+import pymatgen
 from pymatgen.core.periodic_table import Element, _pt_data
 
 __author__ = "Kiran Mathew, Jiming Chen, Logan Ward, Anubhav Jain, Alex Dunn"
 
 module_dir = os.path.dirname(os.path.abspath(__file__))
 
+# Version of the format of the cached property tables. Increment to invalidate existing caches
+_TABLE_CACHE_VERSION = 1
 
-class AbstractData(six.with_metaclass(abc.ABCMeta)):
+
+def get_table_cache_dir():
+    """Get the directory where dense elemental property tables are cached
+
+    Defaults to ``~/.cache/matminer``, and can be changed with the
+    ``MATMINER_CACHE_DIR`` environment variable.
+
+    Returns:
+        (str) path to the cache directory
+    """
+    return os.environ.get("MATMINER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "matminer"))
+
+
+def _load_property_table(name, source_files, build_table, extra_key=()):
+    """Load a dense property table, building and caching it if needed
+
+    The table is stored as an ``.npz`` file in the cache directory, keyed by
+    the name, size, and modification time of the files it was built from.
+    Failing to write the cache (e.g., in a read-only home directory) is not
+    an error; the table is then rebuilt by the next process.
+
+    Args:
+        name (str): Name of the data source
+        source_files ([str]): Paths to the files the table is built from
+        build_table (callable): Function that builds the table, and returns
+            an array of shape (n_elements, n_properties) and the property names
+        extra_key ((str)): Other values the table depends on (e.g., package versions)
+    Returns:
+        table (ndarray): Read-only table of property values
+        names ([str]): Name of each column of the table
+    """
+    key = [_TABLE_CACHE_VERSION, name] + list(extra_key)
+    for path in source_files:
+        stat = os.stat(path)
+        key.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()[:16]
+    cache_file = os.path.join(get_table_cache_dir(), "{}-{}.npz".format(name, digest))
+
+    try:
+        with np.load(cache_file) as data:
+            table, names = data["table"], data["names"].tolist()
+    except (OSError, KeyError, ValueError):
+        table, names = build_table()
+        table = np.asarray(table, dtype=np.float64)
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            tmp_file = "{}.{}.tmp.npz".format(cache_file[:-4], os.getpid())
+            np.savez(tmp_file, table=table, names=np.array(names, dtype=str))
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+
+    table.setflags(write=False)
+    return table, names
+
+
+# Functions that create the shared data sources, by name
+_data_source_loaders = dict()
+
+# Data sources that have been loaded in this process, by name
+_data_sources = dict()
+_data_sources_lock = threading.Lock()
+
+
+def register_data_source(name, loader):
+    """Register a data source that can be shared with `get_data_source`
+
+    Args:
+        name (str): Name of the data source
+        loader (callable): Function that takes no arguments and creates the data source
+    """
+    _data_source_loaders[name] = loader
+
+
+def get_data_source(name):
+    """Get the instance of a data source shared by all featurizers in this process
+
+    The data source is created the first time it is requested. Shared data
+    sources that are pickled (e.g., when sending a featurizer to the workers
+    of a multiprocessing pool) are stored by name, and are loaded at most
+    once per process when unpickled.
+
+    Shared data sources must not be modified. Create a new instance of the
+    data source instead.
+
+    Args:
+        name (str): Name of the data source. See `get_data_source_names`
+    Returns:
+        The data source
+    """
+    try:
+        return _data_sources[name]
+    except KeyError:
+        pass
+    if name not in _data_source_loaders:
+        raise ValueError("Unknown data source: {}. Available: {}".format(name, get_data_source_names()))
+    with _data_sources_lock:
+        if name not in _data_sources:
+            source = _data_source_loaders[name]()
+            if isinstance(source, SharedDataMixin):
+                source._shared_name = name
+            _data_sources[name] = source
+    return _data_sources[name]
+
+
+def get_data_source_names():
+    """Get the names of the data sources available from `get_data_source`
+
+    Returns:
+        ([str]) names of the data sources
+    """
+    return sorted(_data_source_loaders)
+
+
+class SharedDataMixin:
+    """Mixin for data sources that can be shared with `get_data_source`
+
+    Instances returned by `get_data_source` are pickled as a reference to
+    the shared instance of the receiving process, instead of as a copy of
+    their data. Other instances are pickled as usual."""
+
+    _shared_name = None
+
+    def __reduce_ex__(self, protocol):
+        if self._shared_name is not None:
+            return get_data_source, (self._shared_name,)
+        return super().__reduce_ex__(protocol)
+
+
+class AbstractData(six.with_metaclass(abc.ABCMeta, SharedDataMixin)):
     """Abstract class for retrieving elemental properties
 
     All classes must implement the `get_elemental_property` operation. These operations
-    should return scalar values (ideally floats) and `nan` if a property does not exist"""
+    should return scalar values (ideally floats) and `nan` if a property does not exist
+
+    Data sources may also provide their numerical properties as a dense table,
+    `property_table`, with one row per element (row `Z` for the element with
+    atomic number `Z`, unless `_get_table_row` is overridden) and one column
+    per property, listed in `property_index`. Properties in the table are
+    retrieved for many elements at once by `get_elemental_properties`."""
+
+    # Read-only array of property values, shape (n_elements, n_properties)
+    property_table = None
+
+    # Map of property name to column of `property_table`
+    property_index = None
 
     @abc.abstractmethod
     def get_elemental_property(self, elem, property_name):
@@ -46,8 +193,34 @@ class AbstractData(six.with_metaclass(abc.ABCMeta)):
         Returns:
             [float], properties of elements
         """
+        if self.property_index is not None and property_name in self.property_index:
+            rows = [self._get_table_row(e) for e in elems]
+            return self.property_table[rows, self.property_index[property_name]].tolist()
         return [self.get_elemental_property(e, property_name) for e in elems]
 
+    def _get_table_row(self, elem):
+        """Get the row of `property_table` that holds the properties of an element
+
+        Args:
+            elem - (Element) element to be assessed
+        Returns:
+            int, row of the table
+        """
+        # Species such as DummySpecies (Z=0) are not in the table
+        if not 0 < elem.Z < len(self.property_table):
+            raise KeyError(elem.symbol)
+        return elem.Z
+
+    def _set_property_table(self, table, names):
+        """Store a dense table of properties
+
+        Args:
+            table - (ndarray) property values, shape (n_elements, n_properties)
+            names - ([str]) name of each column of the table
+        """
+        self.property_table = table
+        self.property_index = {name: i for i, name in enumerate(names)}
+
 
 class OxidationStatesMixin(six.with_metaclass(abc.ABCMeta)):
     """Abstract class interface for retrieving the oxidation states
@@ -159,8 +332,38 @@ class DemlData(OxidationStateDependentData, OxidationStatesMixin):
             "sat_magn",
         ]
 
+        # Tabulate the properties that are a single number per element
+        source = os.path.join(module_dir, "data_files", "deml_elementdata.py")
+        self._set_property_table(*_load_property_table("deml", [source], self._build_property_table))
+
+    def _build_property_table(self):
+        """Build the table of properties that are a single number for each element
+
+        Returns:
+            table (ndarray): property values, nan if not available for an element
+            names ([str]): name of each property
+        """
+        names = [
+            name
+            for name, values in self.all_props.items()
+            if isinstance(values, dict)
+            and all(isinstance(k, str) and isinstance(v, (int, float)) for k, v in values.items())
+        ]
+        table = np.full((len(_pt_data) + 1, len(names)), np.nan)
+        for j, name in enumerate(names):
+            for symbol, value in self.all_props[name].items():
+                table[Element(symbol).Z, j] = value
+        return table, names
+
+    def _get_table_row(self, elem):
+        # Species missing from the data (e.g., DummySpecies) read the unused
+        #  row 0, so their properties are NaN
+        return elem.Z if 0 < elem.Z < len(self.property_table) else 0
+
     def get_elemental_property(self, elem, property_name):
-        if "valence" in property_name:
+        if property_name in self.property_index:
+            return float(self.property_table[self._get_table_row(elem), self.property_index[property_name]])
+        elif "valence" in property_name:
             valence_dict = self.all_props["valence_e"][self.all_props["col_num"][elem.symbol]]
             if property_name[-1] in ["s", "p", "d"]:
                 # Return one of the shells
@@ -197,34 +400,77 @@ class MagpieData(AbstractData, OxidationStatesMixin):
     """
 
     def __init__(self):
-        self.all_elemental_props = dict()
-        available_props = []
         self.data_dir = os.path.join(module_dir, "data_files", "magpie_elementdata")
+        table_files = sorted(glob(os.path.join(self.data_dir, "*.table")))
+
+        # Load the numerical properties as a table, with a row for each atomic number
+        self._set_property_table(
+            *_load_property_table(
+                "magpie",
+                table_files,
+                lambda: self._build_property_table(table_files),
+            )
+        )
+
+        # Oxidation states are lists, and are stored separately
+        self.oxidation_states = dict()
+        with open(os.path.join(self.data_dir, "OxidationStates.table"), "r") as f:
+            lines = f.readlines()
+        for atomic_no in range(1, len(_pt_data) + 1):
+            try:
+                prop_value = [float(i) for i in lines[atomic_no - 1].split()]
+            except (ValueError, IndexError):
+                prop_value = float("NaN")
+            self.oxidation_states[Element.from_Z(atomic_no).symbol] = prop_value
+
+        self._all_elemental_props = None
 
-        # Make a list of available properties
-        for datafile in glob(os.path.join(self.data_dir, "*.table")):
-            available_props.append(os.path.basename(datafile).replace(".table", ""))
+    @staticmethod
+    def _build_property_table(table_files):
+        """Parse the numerical properties from the Magpie data files
 
-        # parse and store elemental properties
-        for descriptor_name in available_props:
-            with open(os.path.join(self.data_dir, "{}.table".format(descriptor_name)), "r") as f:
-                self.all_elemental_props[descriptor_name] = dict()
+        Args:
+            table_files ([str]): paths to the ``.table`` files
+        Returns:
+            table (ndarray): property values, nan if not available for an element
+            names ([str]): name of each property
+        """
+        names = []
+        columns = []
+        for datafile in table_files:
+            descriptor_name = os.path.basename(datafile).replace(".table", "")
+            if descriptor_name in ["OxidationStates"]:
+                continue
+            with open(datafile, "r") as f:
                 lines = f.readlines()
-                for atomic_no in range(1, len(_pt_data) + 1):  # max Z=103
-                    try:
-                        if descriptor_name in ["OxidationStates"]:
-                            prop_value = [float(i) for i in lines[atomic_no - 1].split()]
-                        else:
-                            prop_value = float(lines[atomic_no - 1])
-                    except (ValueError, IndexError):
-                        prop_value = float("NaN")
-                    self.all_elemental_props[descriptor_name][Element.from_Z(atomic_no).symbol] = prop_value
+            column = np.full(len(_pt_data) + 1, np.nan)
+            for atomic_no in range(1, len(_pt_data) + 1):  # max Z=103
+                try:
+                    column[atomic_no] = float(lines[atomic_no - 1])
+                except (ValueError, IndexError):
+                    pass
+            names.append(descriptor_name)
+            columns.append(column)
+        return np.stack(columns, axis=1), names
+
+    @property
+    def all_elemental_props(self):
+        """Elemental properties as a dict of property name to a dict of element symbol to value"""
+        if self._all_elemental_props is None:
+            symbols = [Element.from_Z(z).symbol for z in range(1, len(_pt_data) + 1)]
+            self._all_elemental_props = {
+                name: dict(zip(symbols, self.property_table[1:, i].tolist())) for name, i in self.property_index.items()
+            }
+            self._all_elemental_props["OxidationStates"] = self.oxidation_states
+        return self._all_elemental_props
 
     def get_elemental_property(self, elem, property_name):
-        return self.all_elemental_props[property_name][elem.symbol]
+        if property_name == "OxidationStates":
+            return self.oxidation_states[elem.symbol]
+        return float(self.property_table[self._get_table_row(elem), self.property_index[property_name]])
 
     def get_oxidation_states(self, elem):
-        return self.all_elemental_props["OxidationStates"][elem.symbol]
+        return self.oxidation_states[elem.symbol]
 
 
 class PymatgenData(OxidationStateDependentData, OxidationStatesMixin):
@@ -238,10 +484,66 @@ class PymatgenData(OxidationStateDependentData, OxidationStatesMixin):
     documentation (attributes).
     """
 
+    # Numerical properties that are tabulated when the class is created
+    table_properties = (
+        "X",
+        "row",
+        "group",
+        "block",
+        "atomic_mass",
+        "atomic_radius",
+        "atomic_radius_calculated",
+        "average_ionic_radius",
+        "van_der_waals_radius",
+        "mendeleev_no",
+        "electrical_resistivity",
+        "velocity_of_sound",
+        "thermal_conductivity",
+        "melting_point",
+        "boiling_point",
+        "bulk_modulus",
+        "youngs_modulus",
+        "rigidity_modulus",
+        "poissons_ratio",
+        "density_of_solid",
+        "molar_volume",
+        "coefficient_of_linear_thermal_expansion",
+        "max_oxidation_state",
+        "min_oxidation_state",
+    )
+
     def __init__(self, use_common_oxi_states=True):
         self.use_common_oxi_states = use_common_oxi_states
+        self._set_property_table(
+            *_load_property_table(
+                "pymatgen",
+                [os.path.abspath(__file__)],
+                self._build_property_table,
+                extra_key=(pymatgen.core.__version__,) + self.table_properties,
+            )
+        )
 
-    def get_elemental_property(self, elem, property_name):
+    def _build_property_table(self):
+        """Tabulate `table_properties` for every element
+
+        Returns:
+            table (ndarray): property values, nan if not available for an element
+            names ([str]): name of each property
+        """
+        table = np.full((len(_pt_data) + 1, len(self.table_properties)), np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for z in range(1, len(_pt_data) + 1):
+                elem = Element.from_Z(z)
+                for j, name in enumerate(self.table_properties):
+                    try:
+                        table[z, j] = float(self._get_property_from_element(elem, name))
+                    except (TypeError, ValueError, KeyError, AttributeError):
+                        pass
+        return table, list(self.table_properties)
+
+    @staticmethod
+    def _get_property_from_element(elem, property_name):
         if property_name == "block":
             block_key = {"s": 1.0, "p": 2.0, "d": 3.0, "f": 3.0}
             return block_key[getattr(elem, property_name)]
@@ -249,6 +551,20 @@ class PymatgenData(OxidationStateDependentData, OxidationStatesMixin):
             value = getattr(elem, property_name)
             return np.nan if value is None else value
 
+    def get_elemental_property(self, elem, property_name):
+        # Values missing from the table are looked up from pymatgen, which
+        # raises the appropriate error if the property is not defined
+        if property_name in self.property_index:
+            row = elem.Z
+            if 0 < row < len(self.property_table):
+                value = self.property_table[row, self.property_index[property_name]]
+                if not np.isnan(value):
+                    return float(value)
+        return self._get_property_from_element(elem, property_name)
+
+    def get_elemental_properties(self, elems, property_name):
+        return [self.get_elemental_property(e, property_name) for e in elems]
+
     def get_oxidation_states(self, elem):
         """Get the oxidation states of an element
 
@@ -265,7 +581,7 @@ class PymatgenData(OxidationStateDependentData, OxidationStatesMixin):
         return getattr(element, property_name)[charge]
 
 
-class MixingEnthalpy:
+class MixingEnthalpy(SharedDataMixin):
     """
     Values of :math:`\Delta H^{max}_{AB}` for different pairs of elements.
 
@@ -400,16 +716,46 @@ class MatscholarElementData(AbstractData):
 
     def __init__(self):
         dfile = os.path.join(module_dir, "data_files/matscholar_els.json")
+        self.prop_names = ["embedding {}".format(i) for i in range(1, 201)]
+        self._set_property_table(
+            *_load_property_table("matscholar", [dfile], lambda: self._build_property_table(dfile))
+        )
+        self._symbols = [str(Element.from_Z(z)) for z in range(1, len(self.property_table) + 1)]
+        self._rows = {el: i for i, el in enumerate(self._symbols)}
+        self._all_element_data = None
+
+    @staticmethod
+    def _build_property_table(dfile):
+        """Read the embeddings, ordered by atomic number
+
+        Args:
+            dfile (str): path to the embeddings file
+        Returns:
+            table (ndarray): embedding of each element, shape (n_elements, 200)
+            names ([str]): name of each embedding dimension
+        """
         with open(dfile, "r") as fp:
             embeddings = json.load(fp)
-        self.prop_names = ["embedding {}".format(i) for i in range(1, 201)]
-        all_element_data = {}
-        for el, embedding in embeddings.items():
-            all_element_data[el] = dict(zip(self.prop_names, embedding))
-        self.all_element_data = all_element_data
+        symbols = sorted(embeddings, key=lambda el: Element(el).Z)
+        if [Element(el).Z for el in symbols] != list(range(1, len(symbols) + 1)):
+            raise ValueError("Embeddings must be available for a contiguous range of elements")
+        names = ["embedding {}".format(i) for i in range(1, 201)]
+        return np.array([embeddings[el] for el in symbols]), names
+
+    @property
+    def all_element_data(self):
+        """Embeddings as a dict of element symbol to a dict of property name to value"""
+        if self._all_element_data is None:
+            self._all_element_data = {
+                el: dict(zip(self.prop_names, row)) for el, row in zip(self._symbols, self.property_table.tolist())
+            }
+        return self._all_element_data
+
+    def _get_table_row(self, elem):
+        return self._rows[str(elem)]
 
     def get_elemental_property(self, elem, property_name):
-        return self.all_element_data[str(elem)][property_name]
+        return float(self.property_table[self._get_table_row(elem), self.property_index[property_name]])
 
 
 class MEGNetElementData(AbstractData):
@@ -438,25 +784,46 @@ class MEGNetElementData(AbstractData):
     def __init__(self):
         dfile = os.path.join(module_dir, "data_files/megnet_elemental_embedding.json")
         self._dummy = "Dummy"
+        self.prop_names = ["embedding {}".format(i) for i in range(1, 17)]
+        self._set_property_table(*_load_property_table("megnet", [dfile], lambda: self._build_property_table(dfile)))
+
+        # Row 0 holds the embedding of the dummy atom, which is used for any element without an embedding
+        self._symbols = [self._dummy] + [str(Element.from_Z(i)) for i in range(1, len(self.property_table))]
+        self._rows = {el: i for i, el in enumerate(self._symbols)}
+        self._all_element_data = None
+
+    @staticmethod
+    def _build_property_table(dfile):
+        """Read the embeddings, ordered by atomic number
+
+        Args:
+            dfile (str): path to the embeddings file
+        Returns:
+            table (ndarray): embeddings, shape (95, 16). Row 0 is the dummy atom
+            names ([str]): name of each embedding dimension
+        """
         with open(dfile, "r") as fp:
             embeddings = json.load(fp)
-        self.prop_names = ["embedding {}".format(i) for i in range(1, 17)]
-        self.all_element_data = {}
-        for i in range(95):
-            embedding_dict = dict(zip(self.prop_names, embeddings[i]))
-            if i == 0:
-                self.all_element_data[self._dummy] = embedding_dict
-            else:
-                self.all_element_data[str(Element.from_Z(i))] = embedding_dict
+        names = ["embedding {}".format(i) for i in range(1, 17)]
+        return np.array(embeddings[:95]), names
+
+    @property
+    def all_element_data(self):
+        """Embeddings as a dict of element symbol (or "Dummy") to a dict of property name to value"""
+        if self._all_element_data is None:
+            self._all_element_data = {
+                el: dict(zip(self.prop_names, row)) for el, row in zip(self._symbols, self.property_table.tolist())
+            }
+        return self._all_element_data
+
+    def _get_table_row(self, elem):
+        return self._rows.get(str(elem), 0)
 
     def get_elemental_property(self, elem, property_name):
-        estr = str(elem)
-        if estr not in self.all_element_data.keys():
-            estr = self._dummy
-        return self.all_element_data[estr][property_name]
+        return float(self.property_table[self._get_table_row(elem), self.property_index[property_name]])
 
 
-class IUCrBondValenceData:
+class IUCrBondValenceData(SharedDataMixin):
     """Get empirical bond valence parameters.
 
     Data come from International Union of Crystallography 2016 tables.
@@ -576,3 +943,13 @@ class IUCrBondValenceData:
         ]
         return bond_val_list.iloc[0]  # If multiple values exist, take first one
         # as recommended for reliability.
+
+
+register_data_source("cohesive_energy", CohesiveEnergyData)
+register_data_source("deml", DemlData)
+register_data_source("magpie", MagpieData)
+register_data_source("pymatgen", PymatgenData)
+register_data_source("mixing_enthalpy", MixingEnthalpy)
+register_data_source("matscholar_el", MatscholarElementData)
+register_data_source("megnet_el", MEGNetElementData)
+register_data_source("iucr_bond_valence", IUCrBondValenceData)
@@ -1,9 +1,30 @@
-from matminer.utils.caching import get_nearest_neighbors, _get_all_nearest_neighbors
+import os
+import pickle
+import tempfile
 
-from pymatgen.analysis.local_env import VoronoiNN
+from matminer.utils.caching import (
+    get_nearest_neighbors,
+    get_nn_cache,
+    set_nn_cache_size,
+    FeatureCache,
+    LRUCache,
+    get_input_key,
+    get_structure_key,
+    get_symmetry_cache,
+    get_spacegroup_analyzer,
+    get_symmetrized_structure,
+    get_equivalent_atoms,
+    get_neighbor_list,
+    get_params_token,
+)
+
+from pymatgen.analysis.local_env import CrystalNN, VoronoiNN
 from pymatgen.core.lattice import Lattice
 from pymatgen.util.testing import PymatgenTest
-from pymatgen.core import Structure
+from pymatgen.core import Composition, Structure
+
+from matminer.featurizers.composition import ElementProperty
+from matminer.featurizers.site import CoordinationNumber
 
 
 class TestCaching(PymatgenTest):
@@ -18,7 +39,7 @@ class TestCaching(PymatgenTest):
         )
 
         # Reset the cache
-        _get_all_nearest_neighbors.cache_clear()
+        get_nn_cache().cache_clear()
 
         # Compute the nearest neighbors
         method = VoronoiNN()
@@ -27,26 +48,204 @@ class TestCaching(PymatgenTest):
         # Compute it again and make sure the cache hits
         nn_2 = get_nearest_neighbors(method, x, 0)
         self.assertAlmostEqual(nn_1[0]["weight"], nn_2[0]["weight"])
-        self.assertEqual(1, _get_all_nearest_neighbors.cache_info().misses)
-        self.assertEqual(1, _get_all_nearest_neighbors.cache_info().hits)
+        self.assertEqual(1, get_nn_cache().cache_info().misses)
+        self.assertEqual(1, get_nn_cache().cache_info().hits)
 
         # Reinstantiate the VoronoiNN class, should not cause a miss
         method = VoronoiNN()
         nn_2 = get_nearest_neighbors(method, x, 0)
         self.assertAlmostEqual(nn_1[0]["weight"], nn_2[0]["weight"])
-        self.assertEqual(1, _get_all_nearest_neighbors.cache_info().misses)
-        self.assertEqual(2, _get_all_nearest_neighbors.cache_info().hits)
+        self.assertEqual(1, get_nn_cache().cache_info().misses)
+        self.assertEqual(2, get_nn_cache().cache_info().hits)
 
         # Change the NN method, should induce a miss
         method = VoronoiNN(weight="volume")
         get_nearest_neighbors(method, x, 0)
-        self.assertEqual(2, _get_all_nearest_neighbors.cache_info().misses)
-        self.assertEqual(2, _get_all_nearest_neighbors.cache_info().hits)
+        self.assertEqual(2, get_nn_cache().cache_info().misses)
+        self.assertEqual(2, get_nn_cache().cache_info().hits)
 
         # Perturb the structure, make sure it induces a miss and
         #  a change in the NN weights
         x.perturb(0.1)
         nn_2 = get_nearest_neighbors(method, x, 0)
         self.assertNotAlmostEqual(nn_1[0]["weight"], nn_2[0]["weight"])
-        self.assertEqual(3, _get_all_nearest_neighbors.cache_info().misses)
-        self.assertEqual(2, _get_all_nearest_neighbors.cache_info().hits)
+        self.assertEqual(3, get_nn_cache().cache_info().misses)
+        self.assertEqual(2, get_nn_cache().cache_info().hits)
+
+        # Equivalent structures share entries, and the cache is bounded
+        set_nn_cache_size(2)
+        try:
+            get_nearest_neighbors(method, x.copy(), 1)
+            self.assertEqual(3, get_nn_cache().cache_info().hits)
+            for weight in ["area", "solid_angle"]:
+                get_nearest_neighbors(VoronoiNN(weight=weight), x, 0)
+            self.assertEqual((3, 5, 2, 2, 3), tuple(get_nn_cache().cache_info()))
+        finally:
+            set_nn_cache_size(16)
+
+    def test_neighbor_list(self):
+        get_nn_cache().cache_clear()
+        s = Structure(Lattice.cubic(3.52), ["Cs", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+
+        # Same neighbors as get_all_neighbors
+        centers, neighbors, images, distances = get_neighbor_list(s, 6)
+        all_neighbors = s.get_all_neighbors(6)
+        self.assertEqual(sum(len(nn) for nn in all_neighbors), len(distances))
+        for i, nn in enumerate(all_neighbors):
+            self.assertArrayAlmostEqual(sorted(n.nn_distance for n in nn), sorted(distances[centers == i]))
+        self.assertEqual((len(distances), 3), images.shape)
+        self.assertFalse(distances.flags.writeable)
+
+        # Smaller cutoffs reuse the neighbor list, larger ones replace it
+        small = get_neighbor_list(s.copy(), 4)
+        self.assertTrue((small[3] <= 4).all())
+        self.assertEqual(sum(len(nn) for nn in s.get_all_neighbors(4)), len(small[3]))
+        self.assertEqual((1, 1), get_nn_cache().cache_info()[:2])
+        self.assertEqual(sum(len(nn) for nn in s.get_all_neighbors(8)), len(get_neighbor_list(s, 8)[3]))
+        self.assertEqual(len(distances), len(get_neighbor_list(s, 6)[3]))
+        self.assertEqual(1, len(get_nn_cache()))
+
+    def test_lru_cache(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        cache.put("c", 3)  # Evicts "b", the least recently used
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual((2, 1, 2, 2, 1), tuple(cache.cache_info()))
+
+        cache.set_maxsize(1)
+        self.assertNotIn("a", cache)
+        self.assertIn("c", cache)
+        cache.cache_clear()
+        self.assertEqual((0, 0, 1, 0, 0), tuple(cache.cache_info()))
+
+    def test_keys(self):
+        s = Structure(Lattice.cubic(3.52), ["Al"], [[0, 0, 0]])
+        self.assertEqual(get_structure_key(s), get_structure_key(s.copy()))
+        s2 = s.copy()
+        s2.replace_species({"Al": "Ni"})
+        self.assertNotEqual(get_structure_key(s), get_structure_key(s2))
+        s2 = s.copy()
+        s2.perturb(0.1)
+        self.assertNotEqual(get_structure_key(s), get_structure_key(s2))
+
+        self.assertEqual(get_input_key((Composition("Fe2O3"),)), get_input_key((Composition("O3Fe2"),)))
+        self.assertNotEqual(get_input_key((Composition("Fe2O3"),)), get_input_key((Composition("Fe4O6"),)))
+        self.assertNotEqual(get_input_key((s, 0)), get_input_key((s, 1)))
+        self.assertIsNone(get_input_key((lambda: 0,)))
+
+    def test_feature_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = FeatureCache(maxsize=2, directory=tmpdir, disk_maxsize=3)
+            for i in range(5):
+                cache.put(str(i), [i])
+            self.assertEqual(2, cache.cache_info()["currsize"])
+            self.assertLessEqual(cache.cache_info()["disk_currsize"], 3)
+            self.assertEqual([4], cache.get("4"))
+            self.assertEqual(1, cache.cache_info()["hits"])
+
+            # Entries evicted from memory are still found on disk
+            self.assertEqual([2], cache.get("2"))
+            self.assertEqual(1, cache.cache_info()["disk_hits"])
+            self.assertIsNone(cache.get("0"))
+            self.assertEqual(1, cache.cache_info()["misses"])
+
+            # A new cache using the same directory sees the old entries
+            cache = FeatureCache(directory=tmpdir)
+            self.assertEqual([4], cache.get("4"))
+            cache.cache_clear()
+            self.assertEqual(0, cache.cache_info()["disk_currsize"])
+            self.assertIsNone(cache.get("4"))
+
+    def test_params_token(self):
+        # Parameters without a custom repr are represented by their settings
+        self.assertEqual(get_params_token(VoronoiNN(tol=0.5)), get_params_token(VoronoiNN(tol=0.5)))
+        self.assertNotEqual(get_params_token(VoronoiNN(tol=0)), get_params_token(VoronoiNN(tol=0.5)))
+        self.assertNotEqual(get_params_token(CrystalNN()), get_params_token(CrystalNN(weighted_cn=True)))
+        self.assertEqual(
+            get_params_token(ElementProperty.from_preset("magpie")),
+            get_params_token(ElementProperty.from_preset("magpie")),
+        )
+        self.assertNotEqual(
+            get_params_token(ElementProperty.from_preset("magpie")),
+            get_params_token(ElementProperty.from_preset("deml")),
+        )
+
+        # Featurizers that cannot be represented are not cached
+        self.assertIsNone(get_params_token(CoordinationNumber(lambda: 0)))
+        self.assertIsNone(FeatureCache().make_key(CoordinationNumber(lambda: 0), (Composition("Fe"),)))
+
+        # Differently-configured featurizers do not share features
+        s = Structure(
+            Lattice.cubic(3.905),
+            ["Sr", "Ti", "O", "O", "O"],
+            [[0.5, 0.5, 0.5], [0, 0, 0], [0.5, 0, 0], [0, 0.5, 0], [0, 0, 0.5]],
+        )
+        cache = FeatureCache()
+        results = []
+        for tol in [0, 0.5]:
+            featurizer = CoordinationNumber(VoronoiNN(tol=tol))
+            expected = featurizer.featurize(s, 2)
+            featurizer.set_feature_cache(cache)
+            results.append(featurizer.featurize_many([(s, 2)], pbar=False)[0])
+            self.assertEqual(expected, results[-1])
+        self.assertNotEqual(results[0], results[1])
+
+    def test_feature_cache_processes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = FeatureCache(directory=tmpdir, disk_maxsize=10)
+
+            # Each task of a worker process gets a fresh copy of the cache,
+            # yet the entries on disk stay within the limit
+            for i in range(50):
+                pickle.loads(pickle.dumps(cache)).put(str(i), [i])
+            self.assertLessEqual(len(cache._disk_files()), 11)
+            self.assertEqual(len(cache._disk_files()), cache.cache_info()["disk_currsize"])
+
+            # Entries removed by another process are misses, and are skipped when evicting
+            worker = pickle.loads(pickle.dumps(cache))
+            removed = cache._disk_files()[:5]
+            for path in removed:
+                os.remove(path)
+            for path in removed:
+                self.assertIsNone(worker.get(os.path.basename(path)[:-4]))
+            for i in range(50, 70):
+                worker.put(str(i), [i])
+            self.assertLessEqual(len(cache._disk_files()), 11)
+
+    def test_feature_cache_symmetry(self):
+        s = Structure(Lattice.cubic(3.52), ["Al", "Al"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+        s.make_supercell([1, 1, 2])
+        featurizer = VoronoiNN()
+        featurizer.feature_labels = lambda: ["cn"]
+
+        # Equivalent sites share a key only if symmetry is used
+        cache = FeatureCache()
+        self.assertEqual(4, len({cache.make_key(featurizer, (s, i)) for i in range(4)}))
+        cache = FeatureCache(use_symmetry=True)
+        self.assertEqual(1, len({cache.make_key(featurizer, (s, i)) for i in range(4)}))
+        s.replace(3, "Ni")
+        self.assertEqual(3, len({cache.make_key(featurizer, (s, i)) for i in range(4)}))
+
+    def test_symmetry_cache(self):
+        cache = get_symmetry_cache()
+        cache.cache_clear()
+        s = Structure(Lattice.cubic(3.52), ["Al", "Al"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+
+        # Featurizers that analyze the same structure share one analysis
+        sga = get_spacegroup_analyzer(s)
+        self.assertEqual(229, sga.get_space_group_number())
+        self.assertIs(sga, get_spacegroup_analyzer(s.copy()))
+        sym_s = get_symmetrized_structure(s)
+        self.assertIs(sym_s, get_symmetrized_structure(s))
+        self.assertEqual([[0, 1]], sym_s.equivalent_indices)
+        self.assertArrayEqual([0, 0], get_equivalent_atoms(s))
+        info = cache.cache_info()
+        self.assertEqual(1, info.misses)
+        self.assertEqual(4, info.hits)
+
+        # Different tolerances are analyzed separately
+        self.assertIsNot(sga, get_spacegroup_analyzer(s, symprec=0.1))
+        self.assertEqual(2, cache.cache_info().misses)
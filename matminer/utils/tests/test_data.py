@@ -1,8 +1,15 @@
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
 import unittest
 from unittest import TestCase
+from unittest.mock import patch
 
 from math import isnan
-from pymatgen.core.periodic_table import Specie
+import numpy as np
+from pymatgen.core.periodic_table import DummySpecies, Specie
 
 from matminer.utils.data import (
     DemlData,
@@ -12,6 +19,8 @@ from matminer.utils.data import (
     MatscholarElementData,
     MEGNetElementData,
     IUCrBondValenceData,
+    get_data_source,
+    get_data_source_names,
 )
 from pymatgen.core import Element
 
@@ -122,6 +131,89 @@ class TestMixingEnthalpy(TestCase):
         self.assertTrue(isnan(self.data.get_mixing_enthalpy(Element("He"), Element("H"))))
 
 
+class TestPropertyTables(TestCase):
+    def setUp(self):
+        self.elems = [Element.from_Z(z) for z in range(1, 95)]
+
+    def test_tables(self):
+        for data_source, props in [
+            (DemlData(), ["atom_num", "electronegativity", "FERE correction"]),
+            (MagpieData(), ["Number", "Electronegativity", "GSbandgap"]),
+            (PymatgenData(), ["X", "block", "atomic_mass"]),
+            (MatscholarElementData(), ["embedding 1", "embedding 200"]),
+            (MEGNetElementData(), ["embedding 1", "embedding 16"]),
+        ]:
+            table = data_source.property_table
+            self.assertEqual(np.float64, table.dtype)
+            self.assertFalse(table.flags.writeable)
+            for prop in props:
+                self.assertIn(prop, data_source.property_index)
+                expected = [data_source.get_elemental_property(e, prop) for e in self.elems]
+                np.testing.assert_array_equal(expected, data_source.get_elemental_properties(self.elems, prop))
+
+        # Properties that are not in the tables are still available
+        self.assertEqual([1, 2], DemlData().get_elemental_properties([Element("H"), Element("Be")], "valence_s"))
+        self.assertEqual([{2: 0.92, 3: 0.785}], PymatgenData().get_elemental_properties([Element("Fe")], "ionic_radii"))
+
+        # Species that are not elements have no Deml data, and are rejected by Magpie
+        self.assertTrue(isnan(DemlData().get_elemental_property(DummySpecies("X"), "electronegativity")))
+        self.assertTrue(isnan(DemlData().get_elemental_properties([Element("H"), DummySpecies("X")], "atom_num")[1]))
+        with self.assertRaises(KeyError):
+            MagpieData().get_elemental_property(DummySpecies("X"), "Number")
+        with self.assertRaises(KeyError):
+            MagpieData().get_elemental_properties([Element("H"), DummySpecies("X")], "Number")
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(os.environ, {"MATMINER_CACHE_DIR": tmpdir}):
+            first = MagpieData()
+            self.assertEqual(1, len(os.listdir(tmpdir)))
+
+            # The second instance is loaded from the cache
+            with patch.object(MagpieData, "_build_property_table") as build:
+                second = MagpieData()
+                build.assert_not_called()
+            np.testing.assert_array_equal(first.property_table, second.property_table)
+            self.assertEqual(first.property_index, second.property_index)
+            self.assertEqual(26, second.all_elemental_props["Number"]["Fe"])
+
+
+class TestSharedDataSources(TestCase):
+    def test_get_data_source(self):
+        for name in ["magpie", "deml", "pymatgen", "mixing_enthalpy", "megnet_el"]:
+            self.assertIn(name, get_data_source_names())
+        magpie = get_data_source("magpie")
+        self.assertIsInstance(magpie, MagpieData)
+        self.assertIs(magpie, get_data_source("magpie"))
+        self.assertIsInstance(get_data_source("mixing_enthalpy"), MixingEnthalpy)
+        with self.assertRaises(ValueError):
+            get_data_source("not a data source")
+
+    def test_lazy_loading(self):
+        # Importing the featurizers loads no data source
+        code = (
+            "import matminer.featurizers.composition, matminer.featurizers.site, matminer.featurizers.structure;"
+            "from matminer.utils.data import _data_sources; print(sorted(_data_sources))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual("[]", output.stdout.strip())
+
+    def test_pickle(self):
+        # Shared data sources are pickled by name
+        magpie = get_data_source("magpie")
+        pickled = pickle.dumps(magpie)
+        self.assertLess(len(pickled), 200)
+        self.assertIs(magpie, pickle.loads(pickled))
+
+        # Other instances are copied
+        private = MagpieData()
+        copy = pickle.loads(pickle.dumps(private))
+        self.assertIsNot(private, copy)
+        self.assertIsNot(magpie, copy)
+        self.assertEqual(private.property_index, copy.property_index)
+
+
 class TestIUCrBondValenceData(TestCase):
     def setUp(self):
         self.data = IUCrBondValenceData()